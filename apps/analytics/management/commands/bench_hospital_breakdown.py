@@ -0,0 +1,103 @@
+"""
+Benchmarks superadmin_hospital_breakdown against the query it replaced,
+which joined every hospital membership onto every visit row and relied on
+COUNT(DISTINCT ...) — O(visits × staff).
+
+DEV / STAGING DATABASES ONLY — seeding writes a lot of rows (the same
+"BENCH-" data as bench_visit_queries).
+
+    # seed 500 hospitals / 100k visits, refresh the rollups, print timings
+    python manage.py bench_hospital_breakdown --seed 100000 --hospitals 500
+
+    # re-run against already seeded data
+    python manage.py bench_hospital_breakdown
+"""
+
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count, Q
+
+from apps.hospitals.models import Hospital, HospitalMembership
+from apps.visits.models import Visit
+from apps.visits.management.commands.bench_visit_queries import Command as VisitQueriesBench
+from apps.analytics.services import superadmin_analytics
+from apps.analytics.services.analytics_helpers import date_filter, COMPLETED_STATUSES
+from apps.analytics.services.rollups import refresh_rollups
+
+
+def _legacy_staff_count(role):
+    return Count(
+        "hospital__memberships__user_id",
+        filter=Q(hospital__memberships__role=role, hospital__memberships__is_active=True),
+        distinct=True,
+    )
+
+
+def legacy_hospital_breakdown(date_from=None, date_to=None):
+    """The previous implementation's query: memberships fanned out over visits."""
+    visit_qs = date_filter(Visit.objects.all(), "created_at", date_from, date_to)
+    return (
+        visit_qs.values("hospital__id", "hospital__name", "hospital__status")
+        .annotate(
+            total_visits=Count("id"),
+            completed_visits=Count("id", filter=Q(status__in=COMPLETED_STATUSES)),
+            cancelled_visits=Count("id", filter=Q(status=Visit.Status.CANCELLED)),
+            total_nurses=_legacy_staff_count(HospitalMembership.Role.NURSE),
+            total_hospital_admins=_legacy_staff_count(HospitalMembership.Role.HOSPITAL_ADMIN),
+            total_medical_admins=_legacy_staff_count(HospitalMembership.Role.MEDICAL_ADMIN),
+        )
+        .order_by("-total_visits")
+    )
+
+
+class Command(BaseCommand):
+    help = "Seed hospitals/visits and time superadmin_hospital_breakdown against the old fan-out query."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=0, help="Number of visits to seed first.")
+        parser.add_argument("--hospitals", type=int, default=500)
+        parser.add_argument("--nurses-per-hospital", type=int, default=20)
+        parser.add_argument("--batch-size", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=3, help="Timing runs per query (best is reported).")
+
+    def handle(self, *args, **options):
+        if options["seed"]:
+            VisitQueriesBench(stdout=self.stdout, stderr=self.stderr)._seed(options)
+
+        if not Hospital.objects.filter(registration_number__startswith="BENCH-").exists():
+            raise CommandError("No seeded data found. Run with --seed N first.")
+
+        started = time.perf_counter()
+        result = refresh_rollups()
+        self.stdout.write(
+            f"Rollup refresh: {result['days']} day(s), {result['hospitals']} hospital(s) "
+            f"in {(time.perf_counter() - started) * 1000:.1f} ms"
+        )
+        self.stdout.write(
+            f"{Hospital.objects.count()} hospitals, {Visit.objects.count()} visits, "
+            f"{HospitalMembership.objects.filter(is_active=True).count()} active memberships"
+        )
+
+        breakdown = superadmin_analytics.superadmin_hospital_breakdown.uncached
+        for label, date_from in (("all time", None), ("90d", date.today() - timedelta(days=90))):
+            self._time(f"old: visits × memberships join ({label})",
+                       lambda: list(legacy_hospital_breakdown(date_from)), options["repeat"])
+            self._time(f"new: first page ({label})",
+                       lambda: breakdown(date_from), options["repeat"])
+            self._time(f"new: first page by -total_active_nurses ({label})",
+                       lambda: breakdown(date_from, order_by="-total_active_nurses"), options["repeat"])
+
+        if connection.vendor == "postgresql":
+            self.stdout.write(self.style.MIGRATE_HEADING("\n== old plan (all time) =="))
+            self.stdout.write(legacy_hospital_breakdown().explain(analyze=True))
+
+    def _time(self, label, fn, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - started) * 1000)
+        self.stdout.write(self.style.SUCCESS(f"{label}: best of {repeat}: {min(timings):.1f} ms"))
@@ -0,0 +1,26 @@
+"""
+Brings the analytics daily rollups up to date: recomputes only the days
+touched since the last run (see analytics.services.rollups). Run it from
+cron every few minutes; the first run, or --full, rebuilds every day.
+
+    python manage.py refresh_analytics_rollups
+    python manage.py refresh_analytics_rollups --full
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.analytics.services.rollups import refresh_rollups
+
+
+class Command(BaseCommand):
+    help = "Refresh the daily visit/report rollups used by the analytics endpoints."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Rebuild every day, not just the touched ones.")
+
+    def handle(self, *args, **options):
+        result = refresh_rollups(full=options["full"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Refreshed {result['days']} day(s) across {result['hospitals']} hospital(s) "
+            f"({result['rows']} hospital row(s))."
+        ))
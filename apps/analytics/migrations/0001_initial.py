@@ -0,0 +1,71 @@
+# Generated by Django 6.0.2 on 2026-10-18 16:10
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('hospitals', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'analytics_rollup_watermark',
+            },
+        ),
+        migrations.CreateModel(
+            name='HospitalDailyRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('kind', models.CharField(choices=[('visit', 'Visit'), ('report', 'Report')], max_length=10)),
+                ('day', models.DateField()),
+                ('status', models.CharField(max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('hospital', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='hospitals.hospital')),
+            ],
+            options={
+                'db_table': 'analytics_hospital_daily',
+                'ordering': ['day'],
+                'indexes': [models.Index(fields=['kind', 'day'], name='analytics_hosp_day_idx')],
+                'unique_together': {('hospital', 'kind', 'day', 'status')},
+            },
+        ),
+        migrations.CreateModel(
+            name='NurseDailyRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('kind', models.CharField(choices=[('visit', 'Visit'), ('report', 'Report')], max_length=10)),
+                ('day', models.DateField()),
+                ('status', models.CharField(max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('hospital', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='nurse_daily_rollups', to='hospitals.hospital')),
+                ('nurse', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'analytics_nurse_daily',
+                'ordering': ['day'],
+                'indexes': [models.Index(fields=['hospital', 'kind', 'day'], name='analytics_nurse_hosp_day_idx')],
+                'unique_together': {('nurse', 'kind', 'day', 'hospital', 'status')},
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 6.0.2 on 2026-10-18 16:28
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        ('hospitals', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupTombstone',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('day', models.DateField()),
+                ('hospital', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rollup_tombstones', to='hospitals.hospital')),
+            ],
+            options={
+                'db_table': 'analytics_rollup_tombstone',
+                'indexes': [models.Index(fields=['created_at'], name='analytics_tombstone_idx')],
+            },
+        ),
+    ]
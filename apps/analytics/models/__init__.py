@@ -0,0 +1,3 @@
+from .daily_rollup import HospitalDailyRollup, NurseDailyRollup, RollupWatermark, RollupTombstone
+
+__all__ = ["HospitalDailyRollup", "NurseDailyRollup", "RollupWatermark", "RollupTombstone"]
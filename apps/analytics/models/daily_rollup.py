@@ -0,0 +1,102 @@
+"""
+Daily analytics rollups: visit and report counts per (day, status).
+- HospitalDailyRollup is keyed by (hospital, kind, day, status),
+  NurseDailyRollup by (nurse, hospital, kind, day, status).
+- day is the local date of the row's created_at, the column every analytics
+  date range filters on, so a range of whole days reads the same rows as
+  the raw tables.
+- Visit status is the visit's current status. A nurse's visits are the ones
+  they hold an accepted assignment for. A report's hospital is its visit's.
+- Written only by analytics.services.rollups (refresh_analytics_rollups
+  command); RollupWatermark records how far the refresh has got.
+- RollupTombstone marks the day of a deleted row, which leaves no updated_at
+  behind for the refresh to find.
+"""
+
+from django.db import models
+from django.conf import settings
+from common.models import UUIDModel
+from apps.hospitals.models import Hospital
+
+
+class HospitalDailyRollup(UUIDModel):
+
+    class Kind(models.TextChoices):
+        VISIT  = "visit",  "Visit"
+        REPORT = "report", "Report"
+
+    hospital = models.ForeignKey(Hospital, on_delete=models.CASCADE, related_name="daily_rollups",)
+
+    kind   = models.CharField(max_length=10, choices=Kind.choices)
+    day    = models.DateField()
+    status = models.CharField(max_length=20)
+    count  = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "analytics_hospital_daily"
+        ordering = ["day"]
+        unique_together = [("hospital", "kind", "day", "status")]
+        indexes = [
+            # Platform-wide reads (superadmin) — every hospital, one kind, a day range.
+            models.Index(fields=["kind", "day"], name="analytics_hosp_day_idx"),
+        ]
+
+    def __str__(self):
+        return f"HospitalDailyRollup({self.hospital_id}, {self.kind}, {self.day}, {self.status}={self.count})"
+
+
+class NurseDailyRollup(UUIDModel):
+
+    Kind = HospitalDailyRollup.Kind
+
+    nurse = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="daily_rollups",)
+
+    hospital = models.ForeignKey(Hospital, on_delete=models.CASCADE, related_name="nurse_daily_rollups",)
+
+    kind   = models.CharField(max_length=10, choices=Kind.choices)
+    day    = models.DateField()
+    status = models.CharField(max_length=20)
+    count  = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "analytics_nurse_daily"
+        ordering = ["day"]
+        unique_together = [("nurse", "kind", "day", "hospital", "status")]
+        indexes = [
+            # Refresh: replace one hospital's rows for the touched days.
+            models.Index(fields=["hospital", "kind", "day"], name="analytics_nurse_hosp_day_idx"),
+        ]
+
+    def __str__(self):
+        return f"NurseDailyRollup({self.nurse_id}, {self.kind}, {self.day}, {self.status}={self.count})"
+
+
+class RollupWatermark(UUIDModel):
+    """Start time of the last completed refresh of a rollup family."""
+
+    name  = models.CharField(max_length=50, unique=True)
+    value = models.DateTimeField()
+
+    class Meta:
+        db_table = "analytics_rollup_watermark"
+
+    def __str__(self):
+        return f"RollupWatermark({self.name} @ {self.value})"
+
+
+class RollupTombstone(UUIDModel):
+    """A deleted report's (hospital, created_at day) — recomputed by the next refresh."""
+
+    hospital = models.ForeignKey(Hospital, on_delete=models.CASCADE, related_name="rollup_tombstones",)
+
+    day = models.DateField()
+
+    class Meta:
+        db_table = "analytics_rollup_tombstone"
+        indexes = [
+            # Refresh: tombstones written since the last watermark.
+            models.Index(fields=["created_at"], name="analytics_tombstone_idx"),
+        ]
+
+    def __str__(self):
+        return f"RollupTombstone({self.hospital_id}, {self.day})"
@@ -0,0 +1,202 @@
+"""
+Result cache for the analytics service functions.
+
+    @cached_analytics(hospital_arg="hospital")
+    def hospital_visit_summary(hospital, date_from=None, date_to=None): ...
+
+    @cached_analytics()          # platform-wide / cross-hospital
+    def superadmin_platform_summary(date_from=None, date_to=None): ...
+
+Entries are keyed by function, arguments (model instances by pk) and a data
+version. Hospital-scoped functions use that hospital's version; the rest
+(hospital_arg missing or None) use the global version. Every write that
+changes what analytics report — visit transitions, report
+create/submit/approve/reject, the bulk dispatch paths, a rollup refresh —
+calls invalidate_hospital_analytics(), which bumps the hospital's version
+and the global one, so the next read misses. Nothing is ever deleted: entries
+under an old version age out after ANALYTICS_CACHE_TIMEOUT.
+
+Versions are bumped on commit (see invalidate_hospital_analytics), seeded from
+the clock like the access context versions, so an evicted version key can
+never bring back entries cached under an older one.
+
+Single flight: concurrent misses for the same entry compute it once. Threads
+in one process queue on a per-key lock; across processes the first miss
+takes a short cache lock (cache.add) and the others poll for its result,
+falling back to computing it themselves after ANALYTICS_CACHE_LOCK_TIMEOUT.
+
+On the per-process locmem backend the cache is bypassed: a bump made by
+one worker never reaches the others, which would keep serving stale
+numbers for up to ANALYTICS_CACHE_TIMEOUT. The access context does the same.
+"""
+
+import functools
+import hashlib
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import models, transaction
+
+
+GLOBAL_SCOPE = "all"
+LOCK_POLL_SECONDS = 0.05
+
+_MISSING = object()
+
+_inflight = {}                       # key → [threading.Lock, users]
+_inflight_guard = threading.Lock()
+
+
+def cache_timeout() -> int:
+    return getattr(settings, "ANALYTICS_CACHE_TIMEOUT", 600)
+
+
+def lock_timeout() -> int:
+    return getattr(settings, "ANALYTICS_CACHE_LOCK_TIMEOUT", 30)
+
+
+def _cache_is_shared() -> bool:
+    """Whether every worker reads the same cache, so version bumps are seen everywhere."""
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], LocMemCache)
+
+
+# ---------------------------------------------------------------------------
+# Data versions
+# ---------------------------------------------------------------------------
+
+def _version_key(scope) -> str:
+    return f"analytics:ver:{scope}"
+
+
+def _current_version(scope) -> int:
+    key = _version_key(scope)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key, time.time_ns())
+    return version
+
+
+def _bump_version(scope) -> None:
+    key = _version_key(scope)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def _bump(hospital_ids) -> None:
+    for hospital_id in hospital_ids:
+        _bump_version(hospital_id)
+    _bump_version(GLOBAL_SCOPE)
+
+
+def invalidate_hospital_analytics(*hospitals) -> None:
+    """
+    Invalidates cached analytics of `hospitals` (instances or ids) and every
+    cross-hospital result. Bumped now and again on commit, so a read between
+    the write and the commit cannot pin pre-commit numbers under the new version.
+    """
+    hospital_ids = {getattr(h, "pk", h) for h in hospitals}
+    if not hospital_ids:
+        return
+    _bump(hospital_ids)
+    transaction.on_commit(lambda: _bump(hospital_ids))
+
+
+# ---------------------------------------------------------------------------
+# Decorator
+# ---------------------------------------------------------------------------
+
+def _key_part(value) -> str:
+    if isinstance(value, models.Model):
+        return f"{value._meta.label_lower}:{value.pk}"
+    return repr(value)
+
+
+def _entry_key(func, signature, args, kwargs, hospital_arg) -> str:
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+
+    hospital = bound.arguments.get(hospital_arg) if hospital_arg else None
+    scope = GLOBAL_SCOPE if hospital is None else getattr(hospital, "pk", hospital)
+
+    parts = ",".join(f"{name}={_key_part(value)}" for name, value in bound.arguments.items())
+    digest = hashlib.sha1(parts.encode()).hexdigest()
+    return f"analytics:{func.__module__}.{func.__qualname__}:{_current_version(scope)}:{digest}"
+
+
+@contextmanager
+def _local_lock(key):
+    with _inflight_guard:
+        entry = _inflight.setdefault(key, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _inflight_guard:
+            entry[1] -= 1
+            if not entry[1]:
+                del _inflight[key]
+
+
+def _compute_and_store(key, compute):
+    value = compute()
+    cache.set(key, value, cache_timeout())
+    return value
+
+
+def _get_or_compute(key, compute):
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    with _local_lock(key):
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        lock_key = f"{key}:lock"
+        if cache.add(lock_key, 1, lock_timeout()):
+            try:
+                return _compute_and_store(key, compute)
+            finally:
+                cache.delete(lock_key)
+
+        # Another process is computing this entry — wait for its result.
+        deadline = time.monotonic() + lock_timeout()
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_SECONDS)
+            value = cache.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            if cache.get(lock_key) is None:
+                break
+        return _compute_and_store(key, compute)
+
+
+def cached_analytics(hospital_arg: str | None = None):
+    """
+    Caches the decorated analytics function's result (see module docstring).
+    hospital_arg: name of the argument holding the Hospital (or its id) the
+    result is scoped to; None for cross-hospital functions.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _cache_is_shared():
+                return func(*args, **kwargs)
+            key = _entry_key(func, signature, args, kwargs, hospital_arg)
+            return _get_or_compute(key, lambda: func(*args, **kwargs))
+
+        wrapper.uncached = func
+        return wrapper
+    return decorator
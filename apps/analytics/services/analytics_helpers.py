@@ -1,10 +1,17 @@
 """
 All aggregation queries live here. Views stay thin.
-No new models — everything is computed from visits, reports, assignments.
+Visit / report counts per status and per day read the daily rollups
+(services.rollups, analytics.models); everything else is computed from
+visits, reports, assignments.
+
+Every public function is cached by analytics_cache.cached_analytics, keyed by
+its arguments and the hospital's data version (bumped by the writes).
+
+Per-entity breakdowns (hospital_nurse_summary, ...) are keyset-paginated
+over their grouped query with keyset_page().
 
 TODO (post-production):
-- Add caching (django.core.cache) on all functions, keyed by args, TTL 10min.
-- Add pagination to hospital_nurse_summary and hospital_visits_over_time.
+- Add pagination to hospital_visits_over_time.
 
 TODO (payments integration):
 - Add superadmin_financial_summary() covering:
@@ -19,19 +26,117 @@ TODO : # Default to the last 30 days if no start date is given
             -> date_from = timezone.now() - timedelta(days=30)
 """
 
+import base64
+import json
+from datetime import datetime, time, timedelta
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connection
+from django.db.models import Aggregate, Count, FloatField, Q
 from django.db.models.functions import TruncDate, TruncWeek, TruncMonth
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
 from apps.visits.models import Visit
  
  
+def _start_of_day(d):
+    return timezone.make_aware(datetime.combine(d, time.min))
+
+
 def date_filter(qs, field: str, date_from=None, date_to=None):
-    """Apply optional date range filter to a queryset."""
+    """
+    Apply optional date range filter to a queryset.
+    Compares the raw column against day boundaries (same result as __date)
+    so (…, created_at) indexes can range-scan instead of casting every row.
+    """
     if date_from:
-        qs = qs.filter(**{f"{field}__date__gte": date_from})
+        qs = qs.filter(**{f"{field}__gte": _start_of_day(date_from)})
     if date_to:
-        qs = qs.filter(**{f"{field}__date__lte": date_to})
+        qs = qs.filter(**{f"{field}__lt": _start_of_day(date_to + timedelta(days=1))})
     return qs
  
  
+def count_buckets(qs, field: str, values, count: str = "id", distinct: bool = False, **extra) -> tuple:
+    """
+    Counts rows per value of `field` in one aggregate pass — a conditional
+    COUNT(...) FILTER (WHERE field = value) per bucket — instead of a
+    count() plus a GROUP BY.
+    Returns ({value: count}, {name: value}):
+      - buckets ordered by value, empty ones left out (same shape as a GROUP BY);
+      - extra: further aggregates (**extra) computed in the same pass.
+    """
+    values = sorted(str(value) for value in values)
+    aggregates = {
+        f"n_{value}": Count(count, filter=Q(**{field: value}), distinct=distinct)
+        for value in values
+    }
+    row = qs.aggregate(**aggregates, **extra)
+    buckets = {value: row[f"n_{value}"] for value in values if row[f"n_{value}"]}
+    return buckets, {name: row[name] for name in extra}
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_keyset_cursor(value, key) -> str:
+    return base64.urlsafe_b64encode(json.dumps([value, str(key)]).encode()).decode()
+
+
+def decode_keyset_cursor(cursor: str) -> tuple:
+    """Returns (value, key). Raises ValidationError (400) on a malformed cursor."""
+    try:
+        value, key = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise ValidationError({"cursor": "Invalid cursor."})
+    return value, key
+
+
+def keyset_page(rows, order_by: str, key: str, cursor: str | None = None,
+                page_size: int = DEFAULT_PAGE_SIZE) -> tuple:
+    """
+    One page of a grouped .values() queryset ordered by `order_by` ("-field"
+    for descending) with `key` (unique per row, ascending) as tie-breaker.
+    The cursor is the (order value, key) of the previous page's last row, so
+    the filter lands in HAVING when `order_by` is an aggregate — no OFFSET.
+    Returns (rows, next_cursor).
+    """
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    field = order_by.lstrip("-")
+    descending = order_by.startswith("-")
+
+    if cursor:
+        value, last_key = decode_keyset_cursor(cursor)
+        past = "lt" if descending else "gt"
+        try:
+            rows = rows.filter(
+                Q(**{f"{field}__{past}": value}) |
+                Q(**{field: value, f"{key}__gt": last_key})
+            )
+        except (ValueError, TypeError, DjangoValidationError):
+            raise ValidationError({"cursor": "Invalid cursor."})
+
+    page = list(rows.order_by(order_by, key)[:page_size + 1])
+    next_cursor = None
+    if len(page) > page_size:
+        page = page[:page_size]
+        next_cursor = encode_keyset_cursor(page[-1][field], page[-1][key])
+    return page, next_cursor
+
+
+class PercentileCont(Aggregate):
+    """PostgreSQL percentile_cont(fraction) WITHIN GROUP (ORDER BY expr)."""
+    function = "PERCENTILE_CONT"
+    template = "%(function)s(%(fraction)s) WITHIN GROUP (ORDER BY %(expressions)s)"
+    output_field = FloatField()
+
+    def __init__(self, expression, fraction: float, **extra):
+        super().__init__(expression, fraction=float(fraction), **extra)
+
+
+def supports_percentiles() -> bool:
+    return connection.vendor == "postgresql"
+
+
 TRUNC_MAP = {
     "day": TruncDate,
     "week": TruncWeek,
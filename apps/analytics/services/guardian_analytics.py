@@ -1,92 +1,249 @@
+from datetime import datetime, time, timezone as dt_timezone
+from operator import itemgetter
+
+from django.conf import settings
 from django.db.models import (
-    Count
+    Avg, Count, F, Max, Min, Q, Window
 )
+from django.db.models.functions import RowNumber
 
 from apps.visits.models import Visit
-from apps.reports.models import Report, ReportSection
+from apps.reports.models import HealthObservation
+from apps.reports.services.health_observations import canonical_field_name
+from apps.ai.services.trends import lttb
+
+from apps.analytics.services.analytics_helpers import (
+    count_buckets, date_filter, PercentileCont, supports_percentiles, TRUNC_MAP
+)
+from apps.analytics.services.analytics_cache import cached_analytics
 
-from apps.analytics.services.analytics_helpers import date_filter
+
+# Typed observation columns summarised by dependent_health_stats
+STAT_COLUMNS = {
+    "numeric": "value_numeric",
+    "systolic": "value_systolic",
+    "diastolic": "value_diastolic",
+}
+STAT_PERCENTILES = {"p50": 0.5, "p90": 0.9}
+
+# Per-period aggregates for bucketed trends ("last" is handled separately)
+TREND_AGGREGATES = {"avg": Avg, "min": Min, "max": Max}
+VALID_TREND_AGGS = {*TREND_AGGREGATES, "last"}
 
 
  
+@cached_analytics()
 def dependent_visit_summary(dependent, date_from=None, date_to=None) -> dict:
     """Guardian view: total visits for their dependent, broken down by status."""
     qs = Visit.objects.filter(dependent=dependent)
     qs = date_filter(qs, "created_at", date_from, date_to)
  
-    total = qs.count()
-    by_status = (
-        qs.values("status")
-        .annotate(count=Count("id"))
-        .order_by("status")
-    )
+    by_status, _ = count_buckets(qs, "status", Visit.Status.values)
  
     return {
-        "total": total,
-        "by_status": {row["status"]: row["count"] for row in by_status},
+        "total": sum(by_status.values()),
+        "by_status": by_status,
     }
  
  
-def dependent_health_trends(dependent, field_name: str, date_from=None, date_to=None) -> list:
+@cached_analytics()
+def dependent_health_trends(
+    dependent, field_name: str, date_from=None, date_to=None,
+    group_by=None, agg="avg", max_points=None,
+) -> list:
     """
-    Time-series of a specific report section value for a dependent.
-    Only returns APPROVED reports.
- 
+    Time-series of a specific report field for a dependent, read from
+    HealthObservation (approved reports only) — one range scan of
+    (dependent, field_name, observed_at). Never returns more than
+    max_points points (default HEALTH_TRENDS_DEFAULT_POINTS).
+
+    - group_by None: raw points, each with the text value plus the typed
+      columns (numeric / systolic / diastolic / boolean). Longer series are
+      downsampled with LTTB (apps.ai.services.trends); series longer than
+      HEALTH_TRENDS_LTTB_INPUT_LIMIT are first bucketed by the finest of
+      day/week/month that fits, so the work per request stays bounded.
+    - group_by "day" | "week" | "month": one point per period, bucketed in
+      SQL, with the point count and the typed columns aggregated with `agg`
+      (avg / min / max / last; also used for the automatic bucketing above).
+      "last" also returns the text value.
+
     TODO (AI integration):
-    - Before querying ReportSection directly, run AI extraction on submitted
-      reports to normalize field values. Problems to solve:
+    - Normalize field values before they reach HealthObservation:
         1. Same field different names: "temperature", "temp", "body_temp" —
-           AI should map these to a canonical field name per hospital template.
+           AI should map these to a canonical field name per hospital template
+           (hook: reports.services.health_observations.canonical_field_name).
         2. Different units: Celsius vs Fahrenheit, kg vs lbs —
            AI should detect the unit from the template field's help_text or
            choices, then normalize to a standard unit before storing.
            Suggested approach: add a `unit` field to TemplateField, store
-           a `normalized_value` alongside `value` in ReportSection, AI fills
+           a `normalized_value` alongside `value`, AI fills
            normalized_value on report approval.
         3. Expand min_status to include SUBMITTED once AI can validate
            section values from not-yet-approved reports.
- 
-    TODO (scheduled_at):
-    - Replace "report__visit__created_at" with "report__visit__scheduled_at"
-      once scheduled_at is implemented on the Visit model.
-    - Also replace created_at in the return dict below.
     """
-    qs = ReportSection.objects.filter(
-        report__visit__dependent=dependent,
-        report__status=Report.Status.APPROVED,
-        field__name=field_name,
-    ).select_related("report__visit")
- 
-    # TODO (scheduled_at): replace created_at with scheduled_at below
-    qs = date_filter(qs, "report__visit__created_at", date_from, date_to)
-    qs = qs.order_by("report__visit__created_at")
- 
+    max_points = max_points or getattr(settings, "HEALTH_TRENDS_DEFAULT_POINTS", 500)
+    qs = _observations(dependent, field_name, date_from, date_to)
+
+    if group_by is None:
+        span = qs.aggregate(n=Count("id"), first=Min("observed_at"), last=Max("observed_at"))
+        input_limit = getattr(settings, "HEALTH_TRENDS_LTTB_INPUT_LIMIT", 10000)
+        if span["n"] <= input_limit:
+            points = _raw_points(qs)
+            return downsample(points, max_points)
+        group_by = _finest_period(span["first"], span["last"], input_limit)
+
+    return downsample(_bucketed_points(qs, group_by, agg), max_points)
+
+
+def _raw_points(qs) -> list:
+    rows = qs.order_by("observed_at").values(
+        "observed_at", "visit_id", "value", *HealthObservation.TYPED_VALUE_FIELDS,
+    )
     return [
         {
-            # TODO (scheduled_at): replace created_at with scheduled_at
-            "date": str(section.report.visit.created_at.date()),
-            "value": section.value,
-            "visit_id": str(section.report.visit_id),
+            "date": str(row["observed_at"].date()),
+            "value": row["value"],
+            # Typed values (None unless the field is of that type)
+            "numeric": row["value_numeric"],
+            "systolic": row["value_systolic"],
+            "diastolic": row["value_diastolic"],
+            "boolean": row["value_boolean"],
+            "visit_id": str(row["visit_id"]),
+            "_x": row["observed_at"].timestamp(),
         }
-        for section in qs
+        for row in rows
     ]
- 
- 
+
+
+def _bucketed_points(qs, group_by: str, agg: str) -> list:
+    qs = qs.annotate(period=TRUNC_MAP[group_by]("observed_at"))
+
+    if agg == "last":
+        # Latest observation per period; filtering on the window is done by
+        # Django in an outer query.
+        rows = (
+            qs.annotate(
+                rank=Window(RowNumber(), partition_by=[F("period")], order_by=F("observed_at").desc()),
+                count=Window(Count("id"), partition_by=[F("period")]),
+            )
+            .filter(rank=1)
+            .order_by("period")
+            .values("period", "count", "value", *HealthObservation.TYPED_VALUE_FIELDS)
+        )
+    else:
+        fn = TREND_AGGREGATES[agg]
+        rows = (
+            qs.values("period")
+            .annotate(
+                count=Count("id"),
+                value_numeric=fn("value_numeric"),
+                value_systolic=fn("value_systolic"),
+                value_diastolic=fn("value_diastolic"),
+            )
+            .order_by("period")
+        )
+
+    points = []
+    for row in rows:
+        period = row["period"]
+        if not isinstance(period, datetime):
+            period = datetime.combine(period, time.min, tzinfo=dt_timezone.utc)
+        point = {
+            "date": str(period.date()),
+            "count": row["count"],
+            "numeric": row["value_numeric"],
+            "systolic": row["value_systolic"],
+            "diastolic": row["value_diastolic"],
+            "_x": period.timestamp(),
+        }
+        if agg == "last":
+            point["value"] = row["value"]
+            point["boolean"] = row["value_boolean"]
+        points.append(point)
+    return points
+
+
+def _trend_y(point):
+    return point["numeric"] if point["numeric"] is not None else point["systolic"]
+
+
+def downsample(points: list, max_points: int) -> list:
+    """LTTB over the numeric (or systolic) value; drops the internal x key."""
+    points = lttb(points, max_points, x=itemgetter("_x"), y=_trend_y)
+    for point in points:
+        del point["_x"]
+    return points
+
+
+def _finest_period(first, last, limit: int) -> str:
+    """Finest of day/week/month giving at most `limit` buckets between first and last."""
+    days = (last - first).days + 1
+    for period, period_days in (("day", 1), ("week", 7)):
+        if days / period_days <= limit:
+            return period
+    return "month"
+
+
+@cached_analytics()
+def dependent_health_stats(dependent, field_name: str, date_from=None, date_to=None) -> dict:
+    """
+    Summary statistics of one field for a dependent, computed in SQL over the
+    typed observation columns (approved reports only). One aggregate query.
+
+    {
+        "count": 12,
+        "numeric":   {"avg": 37.1, "min": 36.5, "max": 38.2, "p50": 37.0, "p90": 37.9} | None,
+        "systolic":  {...} | None,     # BLOOD_PRESSURE fields
+        "diastolic": {...} | None,
+        "true_count": 3,               # BOOLEAN fields
+    }
+    Percentiles are only computed on PostgreSQL; elsewhere they are None.
+    """
+    qs = _observations(dependent, field_name, date_from, date_to)
+
+    aggregates = {"count": Count("id"), "true_count": Count("id", filter=Q(value_boolean=True))}
+    for key, column in STAT_COLUMNS.items():
+        aggregates[f"{key}_n"]   = Count(column)
+        aggregates[f"{key}_avg"] = Avg(column)
+        aggregates[f"{key}_min"] = Min(column)
+        aggregates[f"{key}_max"] = Max(column)
+        if supports_percentiles():
+            for name, fraction in STAT_PERCENTILES.items():
+                aggregates[f"{key}_{name}"] = PercentileCont(column, fraction)
+    row = qs.aggregate(**aggregates)
+
+    result = {"count": row["count"], "true_count": row["true_count"]}
+    for key in STAT_COLUMNS:
+        if not row[f"{key}_n"]:
+            result[key] = None
+            continue
+        result[key] = {
+            stat: row.get(f"{key}_{stat}")
+            for stat in ("avg", "min", "max", *STAT_PERCENTILES)
+        }
+    return result
+
+
+def _observations(dependent, field_name: str, date_from=None, date_to=None):
+    qs = HealthObservation.objects.filter(
+        dependent=dependent,
+        field_name=canonical_field_name(field_name),
+    )
+    return date_filter(qs, "observed_at", date_from, date_to)
+
+
+@cached_analytics()
 def dependent_available_trend_fields(dependent) -> list:
     """
-    Returns field names that have approved report data for this dependent.
+    Returns the (canonical) field names that have approved report data for
+    this dependent — a scan of the dependent's slice of the series index.
  
     TODO (AI integration):
-    - Once AI normalizes field names across templates, return canonical
-      field names instead of raw template field names.
     - Also include fields from SUBMITTED reports that AI has processed.
     """
     return list(
-        ReportSection.objects.filter(
-            report__visit__dependent=dependent,
-            report__status=Report.Status.APPROVED,
-        )
-        .values_list("field__name", flat=True)
+        HealthObservation.objects.filter(dependent=dependent)
+        .values_list("field_name", flat=True)
         .distinct()
-        .order_by("field__name")
+        .order_by("field_name")
     )
\ No newline at end of file
@@ -1,50 +1,73 @@
+from datetime import timedelta
 from django.db.models import (
-    Count, Q)
+    Avg, Count, DurationField, ExpressionWrapper, F, Max, Q, Window)
+from django.db.models.functions import Lag
 
-from apps.visits.models import Visit, VisitAssignment
+from apps.visits.models import Visit, VisitAssignment, VisitEvent
 from apps.reports.models import Report
 
-from apps.analytics.services.analytics_helpers import date_filter, TRUNC_MAP, COMPLETED_STATUSES
+from apps.analytics.models import HospitalDailyRollup
+from apps.analytics.services.analytics_helpers import (
+    date_filter, keyset_page, _start_of_day, COMPLETED_STATUSES, DEFAULT_PAGE_SIZE,
+)
+from apps.analytics.services.analytics_cache import cached_analytics
+from apps.analytics.services.rollups import counts_over_time, status_counts
 
 
+@cached_analytics(hospital_arg="hospital")
 def hospital_visit_summary(hospital, date_from=None, date_to=None) -> dict:
     """Total visits broken down by status."""
-    qs = Visit.objects.filter(hospital=hospital)
-    qs = date_filter(qs, "created_at", date_from, date_to)
- 
-    total = qs.count()
-    by_status = (
-        qs.values("status")
-        .annotate(count=Count("id"))
-        .order_by("status")
+    by_status = status_counts(
+        HospitalDailyRollup.objects.filter(hospital=hospital, kind=HospitalDailyRollup.Kind.VISIT),
+        Visit.objects.filter(hospital=hospital),
+        date_from, date_to,
     )
  
     return {
-        "total": total,
-        "by_status": {row["status"]: row["count"] for row in by_status},
+        "total": sum(by_status.values()),
+        "by_status": by_status,
     }
  
 
+@cached_analytics(hospital_arg="hospital")
 def hospital_report_summary(hospital, date_from=None, date_to=None) -> dict:
     """Report approval/rejection rates for the hospital."""
-    qs = Report.objects.filter(visit__hospital=hospital)
-    qs = date_filter(qs, "created_at", date_from, date_to)
- 
-    total = qs.count()
-    by_status = (
-        qs.values("status")
-        .annotate(count=Count("id"))
-        .order_by("status")
+    by_status = status_counts(
+        HospitalDailyRollup.objects.filter(hospital=hospital, kind=HospitalDailyRollup.Kind.REPORT),
+        Report.objects.filter(visit__hospital=hospital),
+        date_from, date_to,
     )
  
     return {
-        "total": total,
-        "by_status": {row["status"]: row["count"] for row in by_status},
+        "total": sum(by_status.values()),
+        "by_status": by_status,
     }
  
 
  
-def hospital_nurse_summary(hospital, date_from=None, date_to=None) -> list:
+# Visit statuses reached only after the nurse started the visit
+STARTED_STATUSES = [
+    Visit.Status.STARTED,
+    Visit.Status.COMPLETED,
+    Visit.Status.REPORT_SUBMITTED,
+    Visit.Status.APPROVED,
+]
+
+NURSE_SUMMARY_METRICS = [
+    "total_visits_assigned",
+    "total_accepted",
+    "total_started",
+    "total_completed",
+    "total_rejected",
+    "total_reassigned",
+]
+
+
+@cached_analytics(hospital_arg="hospital")
+def hospital_nurse_summary(
+    hospital, date_from=None, date_to=None,
+    order_by="-total_visits_assigned", cursor=None, page_size=DEFAULT_PAGE_SIZE,
+) -> tuple:
     """
     Per-nurse breakdown of visit activity within a hospital.
  
@@ -58,111 +81,123 @@ def hospital_nurse_summary(hospital, date_from=None, date_to=None) -> list:
     - total_rejected:         assignments nurse rejected (may be < visits if reassigned)
     - total_reassigned:       visits where nurse was replaced (assignment cancelled by admin)
  
+    One grouped statement over the hospital's assignments in the date range
+    (joined to their visit for started/completed): every metric is a filtered
+    aggregate of the same pass. order_by is any metric ("-" for descending),
+    ties broken by nurse id; pages are keyset-paginated on (metric, nurse id).
+    Returns (rows, next_cursor).
     """
     AS = VisitAssignment.AssignmentStatus
+    accepted = Q(status=AS.ACCEPTED)
  
-    # Base: all assignments for this hospital in date range
     qs = VisitAssignment.objects.filter(visit__hospital=hospital)
     qs = date_filter(qs, "created_at", date_from, date_to)
  
     rows = (
-        qs.values("nurse__id", "nurse__first_name", "nurse__last_name", "nurse__email")
+        qs.values("nurse_id", "nurse__first_name", "nurse__last_name", "nurse__email")
         .annotate(
             # count distinct visit IDs not assignment rows —
             total_visits_assigned=Count("visit_id", distinct=True),
- 
-            # How many assignments did the nurse accept
-            total_accepted=Count(
+            total_accepted=Count("visit_id", filter=accepted, distinct=True),
+            total_started=Count(
                 "visit_id",
-                filter=Q(status=AS.ACCEPTED),
+                filter=accepted & Q(visit__status__in=STARTED_STATUSES),
                 distinct=True,
             ),
-            # How many assignments did the nurse reject
-            total_rejected=Count(
-                "id",
-                filter=Q(status=AS.REJECTED),
+            total_completed=Count(
+                "visit_id",
+                filter=accepted & Q(visit__status__in=COMPLETED_STATUSES),
+                distinct=True,
             ),
+            # How many assignments did the nurse reject
+            total_rejected=Count("id", filter=Q(status=AS.REJECTED)),
             # How many assignments were cancelled (admin reassigned to someone else)
-            total_reassigned=Count(
-                "id",
-                filter=Q(status=AS.CANCELLED),
-            ),
+            total_reassigned=Count("id", filter=Q(status=AS.CANCELLED)),
         )
-        .order_by("-total_visits_assigned")
     )
+    page, next_cursor = keyset_page(rows, order_by, "nurse_id", cursor, page_size)
  
-    # For started/completed we query Visit directly scoped to accepted assignments
-    nurse_ids = [row["nurse__id"] for row in rows]
-    visit_status_map = {}
- 
-    if nurse_ids:
-        visit_rows = (
-            Visit.objects.filter(
-                hospital=hospital,
-                assignments__nurse_id__in=nurse_ids,
-                assignments__status=AS.ACCEPTED,
-            )
-            .values("assignments__nurse_id")
-            .annotate(
-                total_started=Count(
-                    "id",
-                    filter=Q(status__in=[
-                        Visit.Status.STARTED,
-                        Visit.Status.COMPLETED,
-                        Visit.Status.REPORT_SUBMITTED,
-                        Visit.Status.APPROVED,
-                    ]),
-                    distinct=True,
-                ),
-                total_completed=Count(
-                    "id",
-                    filter=Q(status__in=COMPLETED_STATUSES),
-                    distinct=True,
-                ),
-            )
-        )
-        visit_status_map = {
-            str(r["assignments__nurse_id"]): r
-            for r in visit_rows
-        }
- 
-    result = []
-    for row in rows:
-        nid = str(row["nurse__id"])
-        vstats = visit_status_map.get(nid, {})
-        result.append({
-            "nurse_id": nid,
+    return [
+        {
+            "nurse_id": str(row["nurse_id"]),
             "nurse_name": f"{row['nurse__first_name']} {row['nurse__last_name']}".strip(),
             "nurse_email": row["nurse__email"],
-            "total_visits_assigned": row["total_visits_assigned"],
-            "total_accepted": row["total_accepted"],
-            "total_started": vstats.get("total_started", 0),
-            "total_completed": vstats.get("total_completed", 0),
-            "total_rejected": row["total_rejected"],
-            "total_reassigned": row["total_reassigned"],
-        })
- 
-    return result
+            **{metric: row[metric] for metric in NURSE_SUMMARY_METRICS},
+        }
+        for row in page
+    ], next_cursor
  
 
-  
+@cached_analytics(hospital_arg="hospital")
 def hospital_visits_over_time(hospital, date_from=None, date_to=None, group_by="day") -> list:
     """
     Visit counts grouped by day/week/month.
      """
-    trunc_fn = TRUNC_MAP[group_by]
- 
-    qs = Visit.objects.filter(hospital=hospital)
-    qs = date_filter(qs, "created_at", date_from, date_to)
- 
-    rows = (
-        qs.annotate(period=trunc_fn("created_at"))
-        .values("period")
-        .annotate(count=Count("id"))
-        .order_by("period")
+    return counts_over_time(
+        HospitalDailyRollup.objects.filter(hospital=hospital, kind=HospitalDailyRollup.Kind.VISIT),
+        Visit.objects.filter(hospital=hospital),
+        date_from, date_to, group_by,
     )
- 
-    return [
-        {"period": str(row["period"]), "count": row["count"]}
-        for row in rows
-    ]
\ No newline at end of file
+
+
+# name → (from_status, to_statuses) — one consecutive VisitEvent pair each
+LIFECYCLE_DURATIONS = {
+    "request_to_schedule": (Visit.Status.REQUESTED,        [Visit.Status.SCHEDULED]),
+    "schedule_to_assign":  (Visit.Status.SCHEDULED,        [Visit.Status.ASSIGNED]),
+    "assign_to_accept":    (Visit.Status.ASSIGNED,         [Visit.Status.ACCEPTED]),
+    "accept_to_start":     (Visit.Status.ACCEPTED,         [Visit.Status.STARTED]),
+    "start_to_complete":   (Visit.Status.STARTED,          [Visit.Status.COMPLETED]),
+    "complete_to_report":  (Visit.Status.COMPLETED,        [Visit.Status.REPORT_SUBMITTED]),
+    "report_to_review":    (Visit.Status.REPORT_SUBMITTED, [Visit.Status.APPROVED, Visit.Status.REJECTED]),
+}
+
+
+@cached_analytics(hospital_arg="hospital")
+def hospital_visit_durations(hospital, date_from=None, date_to=None) -> dict:
+    """
+    Average / max time spent in each lifecycle step, from the VisitEvent log.
+    One query: LAG() over each visit's events gives the time since the
+    previous transition, then every step is a filtered aggregate over that.
+    A step counts when its closing transition falls in the date range; the
+    window still sees the visit's earlier events so the step's start is known.
+    """
+    in_range = date_filter(
+        VisitEvent.objects.filter(hospital=hospital), "occurred_at", date_from, date_to,
+    )
+
+    events = (
+        VisitEvent.objects.filter(hospital=hospital, visit_id__in=in_range.values("visit_id"))
+        .annotate(previous_at=Window(
+            Lag("occurred_at"),
+            partition_by=[F("visit_id")],
+            order_by=F("occurred_at").asc(),
+        ))
+        .annotate(step=ExpressionWrapper(F("occurred_at") - F("previous_at"), output_field=DurationField()))
+    )
+
+    window = Q()
+    if date_from:
+        window &= Q(occurred_at__gte=_start_of_day(date_from))
+    if date_to:
+        window &= Q(occurred_at__lt=_start_of_day(date_to + timedelta(days=1)))
+
+    aggregates = {}
+    for name, (from_status, to_statuses) in LIFECYCLE_DURATIONS.items():
+        match = window & Q(from_status=from_status, to_status__in=to_statuses)
+        aggregates[f"{name}__count"] = Count("step", filter=match)   # visits with no earlier event have no step
+        aggregates[f"{name}__avg"]   = Avg("step", filter=match)
+        aggregates[f"{name}__max"]   = Max("step", filter=match)
+
+    row = events.aggregate(**aggregates)
+
+    def seconds(value):
+        return round(value.total_seconds(), 1) if value is not None else None
+
+    return {
+        name: {
+            "count": row[f"{name}__count"],
+            "avg_seconds": seconds(row[f"{name}__avg"]),
+            "max_seconds": seconds(row[f"{name}__max"]),
+        }
+        for name in LIFECYCLE_DURATIONS
+    }
@@ -5,9 +5,16 @@ from django.db.models import (
 
 from apps.reports.models import Report,  ReportVersion
 
-from apps.analytics.services.analytics_helpers import date_filter
+from apps.analytics.models import HospitalDailyRollup
+from apps.analytics.services.analytics_cache import cached_analytics
+from apps.analytics.services.analytics_helpers import count_buckets, date_filter
+from apps.analytics.services.rollups import status_counts
 
 
+REVIEW_STATUSES = [Report.Status.SUBMITTED, Report.Status.APPROVED, Report.Status.REJECTED]
+
+
+@cached_analytics(hospital_arg="hospital")
 def medical_admin_review_summary(hospital, reviewed_by=None, date_from=None, date_to=None) -> dict:
     """
     Report review stats: pending, approved, rejected counts + avg review time.
@@ -15,14 +22,20 @@ def medical_admin_review_summary(hospital, reviewed_by=None, date_from=None, dat
     time — not Report.updated_at which changes on every save.
     """
     qs = Report.objects.filter(visit__hospital=hospital)
-    qs = date_filter(qs, "created_at", date_from, date_to)
  
     if reviewed_by:
-        qs = qs.filter(reviewed_by=reviewed_by)
+        # Rollups are not split by reviewer — count this one from the raw table.
+        qs = date_filter(qs.filter(reviewed_by=reviewed_by), "created_at", date_from, date_to)
+        by_status, _ = count_buckets(qs, "status", REVIEW_STATUSES)
+    else:
+        by_status = status_counts(
+            HospitalDailyRollup.objects.filter(hospital=hospital, kind=HospitalDailyRollup.Kind.REPORT),
+            qs, date_from, date_to,
+        )
  
-    pending = qs.filter(status=Report.Status.SUBMITTED).count()
-    approved = qs.filter(status=Report.Status.APPROVED).count()
-    rejected_count = qs.filter(status=Report.Status.REJECTED).count()
+    pending = by_status.get(Report.Status.SUBMITTED, 0)
+    approved = by_status.get(Report.Status.APPROVED, 0)
+    rejected_count = by_status.get(Report.Status.REJECTED, 0)
  
     reviewed_versions = ReportVersion.objects.filter(
         report__visit__hospital=hospital,
@@ -31,10 +44,7 @@ def medical_admin_review_summary(hospital, reviewed_by=None, date_from=None, dat
     )
     if reviewed_by:
         reviewed_versions = reviewed_versions.filter(report__reviewed_by=reviewed_by)
-    if date_from:
-        reviewed_versions = reviewed_versions.filter(created_at__date__gte=date_from)
-    if date_to:
-        reviewed_versions = reviewed_versions.filter(created_at__date__lte=date_to)
+    reviewed_versions = date_filter(reviewed_versions, "created_at", date_from, date_to)
  
     avg_review_time = reviewed_versions.annotate(
         review_duration=ExpressionWrapper(
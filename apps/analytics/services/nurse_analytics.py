@@ -1,16 +1,16 @@
-from django.db.models import (
-    Count
-)
-
 from apps.visits.models import Visit, VisitAssignment
 from apps.reports.models import Report
 from apps.hospitals.models import HospitalMembership
 
-from apps.analytics.services.analytics_helpers import date_filter, TRUNC_MAP, COMPLETED_STATUSES
+from apps.analytics.models import NurseDailyRollup
+from apps.analytics.services.analytics_cache import cached_analytics
+from apps.analytics.services.analytics_helpers import COMPLETED_STATUSES
+from apps.analytics.services.rollups import counts_over_time, status_counts
 
 
 
 
+@cached_analytics(hospital_arg="hospital")
 def nurse_visit_summary(nurse, hospital=None, date_from=None, date_to=None) -> dict:
     """
     Nurse's own performance: visits by status, completion rate.
@@ -20,9 +20,11 @@ def nurse_visit_summary(nurse, hospital=None, date_from=None, date_to=None) -> d
         assignments__nurse=nurse,
         assignments__status=VisitAssignment.AssignmentStatus.ACCEPTED,
     )
+    rollups = NurseDailyRollup.objects.filter(nurse=nurse, kind=NurseDailyRollup.Kind.VISIT)
  
     if hospital:
         qs = qs.filter(hospital=hospital)
+        rollups = rollups.filter(hospital=hospital)
     else:
         active_hospital_ids = HospitalMembership.objects.filter(
             user=nurse,
@@ -30,16 +32,10 @@ def nurse_visit_summary(nurse, hospital=None, date_from=None, date_to=None) -> d
             is_active=True,
         ).values_list("hospital_id", flat=True)
         qs = qs.filter(hospital_id__in=active_hospital_ids)
+        rollups = rollups.filter(hospital_id__in=active_hospital_ids)
  
-    qs = date_filter(qs, "created_at", date_from, date_to)
- 
-    total = qs.count()
-    by_status = (
-        qs.values("status")
-        .annotate(count=Count("id"))
-        .order_by("status")
-    )
-    status_map = {row["status"]: row["count"] for row in by_status}
+    status_map = status_counts(rollups, qs, date_from, date_to)
+    total = sum(status_map.values())
  
     completed = sum(status_map.get(s, 0) for s in COMPLETED_STATUSES)
     completion_rate = round((completed / total * 100), 1) if total > 0 else 0
@@ -52,39 +48,31 @@ def nurse_visit_summary(nurse, hospital=None, date_from=None, date_to=None) -> d
     }
  
  
+@cached_analytics()
 def nurse_visits_over_time(nurse, date_from=None, date_to=None, group_by="week") -> list:
     """Nurse's visit counts grouped by week/month."""
-    trunc_fn = TRUNC_MAP[group_by]
- 
     qs = Visit.objects.filter(
         assignments__nurse=nurse,
         assignments__status=VisitAssignment.AssignmentStatus.ACCEPTED,
     )
-    qs = date_filter(qs, "created_at", date_from, date_to)
  
-    rows = (
-        qs.annotate(period=trunc_fn("created_at"))
-        .values("period")
-        .annotate(count=Count("id"))
-        .order_by("period")
+    return counts_over_time(
+        NurseDailyRollup.objects.filter(nurse=nurse, kind=NurseDailyRollup.Kind.VISIT),
+        qs, date_from, date_to, group_by,
     )
  
-    return [{"period": str(row["period"]), "count": row["count"]} for row in rows]
- 
  
+@cached_analytics()
 def nurse_report_summary(nurse, date_from=None, date_to=None) -> dict:
     """Nurse's report stats: drafts, submitted, approved, rejected."""
-    qs = Report.objects.filter(nurse=nurse)
-    qs = date_filter(qs, "created_at", date_from, date_to)
- 
-    by_status = (
-        qs.values("status")
-        .annotate(count=Count("id"))
-        .order_by("status")
+    by_status = status_counts(
+        NurseDailyRollup.objects.filter(nurse=nurse, kind=NurseDailyRollup.Kind.REPORT),
+        Report.objects.filter(nurse=nurse),
+        date_from, date_to,
     )
  
     return {
-        "total": qs.count(),
-        "by_status": {row["status"]: row["count"] for row in by_status},
+        "total": sum(by_status.values()),
+        "by_status": by_status,
     }
  
\ No newline at end of file
@@ -0,0 +1,339 @@
+"""
+Daily rollups behind the analytics counts (models: analytics.models.daily_rollup).
+
+Refreshing — refresh_rollups() (refresh_analytics_rollups command, run from
+cron) finds the (hospital, day) pairs touched since the last watermark —
+visits and reports whose updated_at moved, grouped by the day they were
+created, plus the tombstones record_deletion() left for deleted reports —
+and recomputes every rollup row of those days from the raw tables.
+Untouched days are never re-read, so a refresh costs O(rows changed).
+Each pass starts ANALYTICS_ROLLUP_OVERLAP_MINUTES before the watermark to
+pick up transactions that were still open when the last one ran; recomputing
+a day is idempotent, so the overlap only costs a little repeated work.
+Without a watermark (first run, or --full) every day is rebuilt.
+
+Reading — status_counts() / daily_counts() split a date range at the
+watermark's day: whole days before it come from the rollups, the rest
+(today, and anything created since the last refresh) from the raw tables.
+Status changes to older visits show up after the next refresh. Before the
+first refresh everything is read live.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from apps.analytics.models import HospitalDailyRollup, NurseDailyRollup, RollupWatermark, RollupTombstone
+from apps.analytics.services.analytics_cache import invalidate_hospital_analytics
+from apps.analytics.services.analytics_helpers import count_buckets, date_filter, _start_of_day
+from apps.reports.models import Report
+from apps.visits.models import Visit, VisitAssignment
+
+
+WATERMARK = "daily_rollups"
+
+Kind = HospitalDailyRollup.Kind
+
+
+def overlap() -> timedelta:
+    return timedelta(minutes=getattr(settings, "ANALYTICS_ROLLUP_OVERLAP_MINUTES", 5))
+
+
+# ---------------------------------------------------------------------------
+# Refresh
+# ---------------------------------------------------------------------------
+
+def record_deletion(hospital_id, created_at) -> None:
+    """
+    Marks the rollup day of a deleted row (reports.signals on Report delete):
+    the row is gone, so the refresh can no longer find it by updated_at.
+    """
+    RollupTombstone.objects.create(hospital_id=hospital_id, day=timezone.localdate(created_at))
+
+
+def _touched_days(since=None) -> dict:
+    """
+    {hospital_id: {day, ...}} of visits and reports changed, and reports
+    deleted, at/after `since` (all if None).
+    """
+    visits     = Visit.objects.all()
+    reports    = Report.objects.all()
+    tombstones = RollupTombstone.objects.all()
+    if since is not None:
+        visits     = visits.filter(updated_at__gte=since)
+        reports    = reports.filter(updated_at__gte=since)
+        tombstones = tombstones.filter(created_at__gte=since)
+
+    touched = {}
+    for qs, hospital in ((visits, "hospital_id"), (reports, "visit__hospital_id")):
+        pairs = qs.annotate(day=TruncDate("created_at")).values_list(hospital, "day").distinct()
+        for hospital_id, day in pairs:
+            touched.setdefault(hospital_id, set()).add(day)
+    for hospital_id, day in tombstones.values_list("hospital_id", "day").distinct():
+        touched.setdefault(hospital_id, set()).add(day)
+    return touched
+
+
+def _days_q(field: str, days) -> Q:
+    """
+    created_at-style range filter covering `days`, one range per run of
+    consecutive days. days=None matches everything.
+    """
+    q = Q()
+    if days is None:
+        return q
+    days = sorted(days)
+    start = end = days[0]
+    for day in days[1:] + [None]:
+        if day is not None and day == end + timedelta(days=1):
+            end = day
+            continue
+        q |= Q(**{
+            f"{field}__gte": _start_of_day(start),
+            f"{field}__lt": _start_of_day(end + timedelta(days=1)),
+        })
+        if day is not None:
+            start = end = day
+    return q
+
+
+def _hospital_rows(hospital_id, days) -> list:
+    rows = []
+    sources = (
+        (Kind.VISIT,  Visit.objects.filter(hospital_id=hospital_id)),
+        (Kind.REPORT, Report.objects.filter(visit__hospital_id=hospital_id)),
+    )
+    for kind, qs in sources:
+        counts = (
+            qs.filter(_days_q("created_at", days))
+            .annotate(day=TruncDate("created_at"))
+            .values("day", "status")
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        rows.extend(
+            HospitalDailyRollup(hospital_id=hospital_id, kind=kind, **row)
+            for row in counts
+        )
+    return rows
+
+
+def _nurse_rows(hospital_id, days) -> list:
+    visit_counts = (
+        VisitAssignment.objects.filter(
+            visit__hospital_id=hospital_id,
+            status=VisitAssignment.AssignmentStatus.ACCEPTED,
+        )
+        .filter(_days_q("visit__created_at", days))
+        .annotate(day=TruncDate("visit__created_at"), visit_status=F("visit__status"))
+        .values("nurse_id", "day", "visit_status")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    report_counts = (
+        Report.objects.filter(visit__hospital_id=hospital_id)
+        .filter(_days_q("created_at", days))
+        .annotate(day=TruncDate("created_at"))
+        .values("nurse_id", "day", "status")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    rows = [
+        NurseDailyRollup(
+            hospital_id=hospital_id, kind=Kind.VISIT, nurse_id=row["nurse_id"],
+            day=row["day"], status=row["visit_status"], count=row["count"],
+        )
+        for row in visit_counts
+    ]
+    rows.extend(
+        NurseDailyRollup(hospital_id=hospital_id, kind=Kind.REPORT, **row)
+        for row in report_counts
+    )
+    return rows
+
+
+@transaction.atomic
+def _replace_days(hospital_id, days, full: bool) -> int:
+    """Recomputes one hospital's rollups for `days` (every day when `full`)."""
+    hospital_rows = HospitalDailyRollup.objects.filter(hospital_id=hospital_id)
+    nurse_rows    = NurseDailyRollup.objects.filter(hospital_id=hospital_id)
+    if not full:
+        hospital_rows = hospital_rows.filter(day__in=days)
+        nurse_rows    = nurse_rows.filter(day__in=days)
+    hospital_rows.delete()
+    nurse_rows.delete()
+
+    source_days = None if full else days
+    rows = _hospital_rows(hospital_id, source_days)
+    HospitalDailyRollup.objects.bulk_create(rows)
+    NurseDailyRollup.objects.bulk_create(_nurse_rows(hospital_id, source_days))
+    return len(rows)
+
+
+def refresh_rollups(full: bool = False) -> dict:
+    """
+    Brings the rollups up to date and advances the watermark.
+    Returns {"hospitals": n, "days": n, "rows": n} — what was recomputed.
+    """
+    started_at = timezone.now()
+    watermark = RollupWatermark.objects.filter(name=WATERMARK).first()
+    full = full or watermark is None
+    since = None if full else watermark.value - overlap()
+
+    touched = _touched_days(since)
+    if full:
+        # Hospitals with no visits left still need their old rows cleared.
+        HospitalDailyRollup.objects.exclude(hospital_id__in=touched.keys()).delete()
+        NurseDailyRollup.objects.exclude(hospital_id__in=touched.keys()).delete()
+
+    rows = 0
+    for hospital_id, days in touched.items():
+        rows += _replace_days(hospital_id, days, full)
+
+    RollupWatermark.objects.update_or_create(name=WATERMARK, defaults={"value": started_at})
+    # Every tombstone before the next pass's overlap window has been applied.
+    RollupTombstone.objects.filter(created_at__lt=started_at - overlap()).delete()
+    # Moving the watermark moves the rollup/live split of every read.
+    invalidate_hospital_analytics(*touched)
+    return {
+        "hospitals": len(touched),
+        "days": sum(len(days) for days in touched.values()),
+        "rows": rows,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+def rollup_cutoff():
+    """First day not fully covered by the rollups, or None before the first refresh."""
+    value = RollupWatermark.objects.filter(name=WATERMARK).values_list("value", flat=True).first()
+    return timezone.localdate(value) if value is not None else None
+
+
+def split_range(date_from=None, date_to=None) -> tuple:
+    """
+    ((from, to) read from rollups or None, (from, to) read live or None).
+    Either bound may be None (open ended), as in date_filter.
+    """
+    cutoff = rollup_cutoff()
+    if cutoff is None:
+        return None, (date_from, date_to)
+
+    last_rolled_up = cutoff - timedelta(days=1)
+    rolled = live = None
+    if date_from is None or date_from <= last_rolled_up:
+        rolled = (date_from, last_rolled_up if date_to is None else min(date_to, last_rolled_up))
+    if date_to is None or date_to >= cutoff:
+        live = (cutoff if date_from is None else max(date_from, cutoff), date_to)
+    return rolled, live
+
+
+def _rollup_range(rollups, date_from, date_to):
+    if date_from:
+        rollups = rollups.filter(day__gte=date_from)
+    if date_to:
+        rollups = rollups.filter(day__lte=date_to)
+    return rollups
+
+
+def status_counts(rollups, live_qs, date_from=None, date_to=None) -> dict:
+    """
+    {status: count} over rows created in the date range, ordered by status.
+    rollups: HospitalDailyRollup / NurseDailyRollup queryset (kind and owner filtered).
+    live_qs: the equivalent raw queryset (created_at, status), for the days not rolled up —
+    counted in one conditional-aggregate pass over Model.Status.
+    """
+    rolled, live = split_range(date_from, date_to)
+    counts = {}
+    if rolled is not None:
+        rows = _rollup_range(rollups, *rolled).values("status").annotate(n=Sum("count")).order_by()
+        for row in rows:
+            counts[row["status"]] = counts.get(row["status"], 0) + row["n"]
+    if live is not None:
+        live_counts, _ = count_buckets(
+            date_filter(live_qs, "created_at", *live), "status", live_qs.model.Status.values,
+        )
+        for status, n in live_counts.items():
+            counts[status] = counts.get(status, 0) + n
+    return dict(sorted(counts.items()))
+
+
+def daily_counts(rollups, live_qs, date_from=None, date_to=None) -> dict:
+    """{day: count} over rows created in the date range — same sources as status_counts()."""
+    rolled, live = split_range(date_from, date_to)
+    counts = {}
+    if rolled is not None:
+        rows = _rollup_range(rollups, *rolled).values("day").annotate(n=Sum("count")).order_by()
+        for row in rows:
+            counts[row["day"]] = counts.get(row["day"], 0) + row["n"]
+    if live is not None:
+        rows = (
+            date_filter(live_qs, "created_at", *live)
+            .annotate(day=TruncDate("created_at"))
+            .values("day")
+            .annotate(n=Count("id"))
+            .order_by()
+        )
+        for row in rows:
+            counts[row["day"]] = counts.get(row["day"], 0) + row["n"]
+    return counts
+
+
+def _per_hospital(qs, aggregate):
+    """Scalar subquery: `aggregate` over qs rows of the outer Hospital (0 if none)."""
+    return Coalesce(
+        Subquery(qs.values("hospital").annotate(n=aggregate).values("n"), output_field=IntegerField()),
+        0,
+    )
+
+
+def hospital_visit_counts(metrics: dict, date_from=None, date_to=None) -> dict:
+    """
+    {name: expression} annotating a Hospital queryset with its visit counts
+    for the date range, one per metrics entry (name → statuses, or None for
+    every status). Each is a correlated subquery over the hospital's rollup
+    rows, plus one over its live visits for the days not rolled up.
+    """
+    rolled, live = split_range(date_from, date_to)
+    expressions = {}
+    for name, statuses in metrics.items():
+        parts = []
+        if rolled is not None:
+            rollups = HospitalDailyRollup.objects.filter(hospital=OuterRef("pk"), kind=Kind.VISIT)
+            if statuses is not None:
+                rollups = rollups.filter(status__in=statuses)
+            parts.append(_per_hospital(_rollup_range(rollups, *rolled), Sum("count")))
+        if live is not None:
+            visits = date_filter(Visit.objects.filter(hospital=OuterRef("pk")), "created_at", *live)
+            if statuses is not None:
+                visits = visits.filter(status__in=statuses)
+            parts.append(_per_hospital(visits, Count("id")))
+        expressions[name] = parts[0] if len(parts) == 1 else parts[0] + parts[1]
+    return expressions
+
+
+def _period(day, group_by: str):
+    """The value TRUNC_MAP[group_by]("created_at") gives for rows created on `day`."""
+    if group_by == "week":
+        return _start_of_day(day - timedelta(days=day.weekday()))
+    if group_by == "month":
+        return _start_of_day(day.replace(day=1))
+    return day
+
+
+def counts_over_time(rollups, live_qs, date_from=None, date_to=None, group_by="day") -> list:
+    """[{"period": str, "count": n}, ...] ordered by period, as the *_over_time functions return."""
+    periods = {}
+    for day, count in daily_counts(rollups, live_qs, date_from, date_to).items():
+        period = _period(day, group_by)
+        periods[period] = periods.get(period, 0) + count
+    return [
+        {"period": str(period), "count": count}
+        for period, count in sorted(periods.items())
+    ]
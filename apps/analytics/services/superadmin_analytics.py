@@ -1,155 +1,147 @@
 from django.db.models import (
-    Count, Q
+    Count, F, IntegerField, OuterRef, Subquery
 )
+from django.db.models.functions import Coalesce
 
 from apps.visits.models import Visit
 from apps.reports.models import Report
 from apps.hospitals.models import Hospital, HospitalMembership
 
-from apps.analytics.services.analytics_helpers import date_filter, TRUNC_MAP, COMPLETED_STATUSES
+from apps.analytics.models import HospitalDailyRollup
+from apps.analytics.services.analytics_cache import cached_analytics
+from apps.analytics.services.analytics_helpers import (
+    count_buckets, keyset_page, COMPLETED_STATUSES, DEFAULT_PAGE_SIZE,
+)
+from apps.analytics.services.rollups import counts_over_time, hospital_visit_counts, status_counts
 
 
+@cached_analytics()
 def superadmin_platform_summary(date_from=None, date_to=None) -> dict:
     """
     Platform-wide overview for superadmin.
     Shows health of the entire platform across all hospitals.
     """
     # Hospital counts by status
-    hospital_qs = Hospital.objects.all()
-    hospitals_by_status = (
-        hospital_qs.values("status")
-        .annotate(count=Count("id"))
-        .order_by("status")
-    )
- 
-    # User counts by role across all memberships
-    membership_qs = HospitalMembership.objects.filter(is_active=True)
-    users_by_role = (
-        membership_qs.values("role")
-        .annotate(count=Count("user_id", distinct=True))
-        .order_by("role")
-    )
+    hospitals_by_status, _ = count_buckets(Hospital.objects.all(), "status", Hospital.Status.values)
  
-    # Total unique users (any role)
-    total_users = (
-        HospitalMembership.objects.filter(is_active=True)
-        .values("user_id")
-        .distinct()
-        .count()
+    # User counts by role, and unique users across roles, in one pass over active memberships
+    users_by_role, users = count_buckets(
+        HospitalMembership.objects.filter(is_active=True),
+        "role", HospitalMembership.Role.values,
+        count="user_id", distinct=True,
+        total_unique=Count("user_id", distinct=True),
     )
  
     # Visit counts
-    visit_qs = Visit.objects.all()
-    visit_qs = date_filter(visit_qs, "created_at", date_from, date_to)
-    visits_by_status = (
-        visit_qs.values("status")
-        .annotate(count=Count("id"))
-        .order_by("status")
+    visits_by_status = status_counts(
+        HospitalDailyRollup.objects.filter(kind=HospitalDailyRollup.Kind.VISIT),
+        Visit.objects.all(),
+        date_from, date_to,
     )
  
     # Report counts
-    report_qs = Report.objects.all()
-    report_qs = date_filter(report_qs, "created_at", date_from, date_to)
-    reports_by_status = (
-        report_qs.values("status")
-        .annotate(count=Count("id"))
-        .order_by("status")
+    reports_by_status = status_counts(
+        HospitalDailyRollup.objects.filter(kind=HospitalDailyRollup.Kind.REPORT),
+        Report.objects.all(),
+        date_from, date_to,
     )
  
     return {
         "hospitals": {
-            "total": hospital_qs.count(),
-            "by_status": {row["status"]: row["count"] for row in hospitals_by_status},
+            "total": sum(hospitals_by_status.values()),
+            "by_status": hospitals_by_status,
         },
         "users": {
-            "total_unique": total_users,
-            "by_role": {row["role"]: row["count"] for row in users_by_role},
+            "total_unique": users["total_unique"],
+            "by_role": users_by_role,
         },
         "visits": {
-            "total": visit_qs.count(),
-            "by_status": {row["status"]: row["count"] for row in visits_by_status},
+            "total": sum(visits_by_status.values()),
+            "by_status": visits_by_status,
         },
         "reports": {
-            "total": report_qs.count(),
-            "by_status": {row["status"]: row["count"] for row in reports_by_status},
+            "total": sum(reports_by_status.values()),
+            "by_status": reports_by_status,
         },
     }    
 
 
-def superadmin_hospital_breakdown(date_from=None, date_to=None) -> list:
+# Per-hospital breakdown columns: name → visit statuses counted (None = all)
+BREAKDOWN_VISIT_METRICS = {
+    "total_visits":     None,
+    "completed_visits": COMPLETED_STATUSES,
+    "cancelled_visits": [Visit.Status.CANCELLED],
+}
+# name → membership role counted (active members only)
+BREAKDOWN_STAFF_METRICS = {
+    "total_active_nurses":          HospitalMembership.Role.NURSE,
+    "total_active_hospital_admins": HospitalMembership.Role.HOSPITAL_ADMIN,
+    "total_active_medical_admins":  HospitalMembership.Role.MEDICAL_ADMIN,
+}
+BREAKDOWN_ORDERINGS = ["hospital_name", *BREAKDOWN_VISIT_METRICS, *BREAKDOWN_STAFF_METRICS]
+
+
+def _active_staff(role):
+    """Active members of the outer Hospital with `role` — grouped over memberships only."""
+    members = (
+        HospitalMembership.objects.filter(hospital=OuterRef("pk"), role=role, is_active=True)
+        .values("hospital")
+        .annotate(n=Count("user_id", distinct=True))
+        .values("n")
+    )
+    return Coalesce(Subquery(members, output_field=IntegerField()), 0)
+
+
+@cached_analytics()
+def superadmin_hospital_breakdown(
+    date_from=None, date_to=None,
+    order_by="-total_visits", cursor=None, page_size=DEFAULT_PAGE_SIZE,
+) -> tuple:
     """
     Per-hospital activity breakdown for superadmin.
     Shows which hospitals are active, growing, or stagnant.
-    Ordered by total visits descending.
+    Hospitals with visits in the date range, ordered by total visits
+    descending unless order_by names another column ("-" for descending).
+
+    One row per hospital: visit counts come from the daily rollups (plus the
+    live tail, see rollups.hospital_visit_counts) and staff counts from
+    memberships, each as its own per-hospital subquery — staff rows are never
+    joined onto visit rows. Keyset-paginated on (order column, hospital id).
+    Returns (rows, next_cursor).
     """
-    visit_qs = Visit.objects.all()
-    visit_qs = date_filter(visit_qs, "created_at", date_from, date_to)
- 
     rows = (
-        visit_qs.values("hospital__id", "hospital__name", "hospital__status")
-        .annotate(
-            total_visits=Count("id"),
-            completed_visits=Count("id", filter=Q(status__in=COMPLETED_STATUSES)),
-            cancelled_visits=Count("id", filter=Q(status=Visit.Status.CANCELLED)),
-            total_nurses=Count(
-                "hospital__memberships__user_id",
-                filter=Q(
-                    hospital__memberships__role=HospitalMembership.Role.NURSE,
-                    hospital__memberships__is_active=True,
-                ),
-                distinct=True,
-            ),
-            total_hospital_admins=Count(
-                "hospital__memberships__user_id",
-                filter=Q(
-                    hospital__memberships__role=HospitalMembership.Role.HOSPITAL_ADMIN,
-                    hospital__memberships__is_active=True,
-                ),
-                distinct=True,
-            ),
-            total_medical_admins=Count(
-                "hospital__memberships__user_id",
-                filter=Q(
-                    hospital__memberships__role=HospitalMembership.Role.MEDICAL_ADMIN,
-                    hospital__memberships__is_active=True,
-                ),
-                distinct=True,
-            ),
+        Hospital.objects.annotate(
+            hospital_name=F("name"),
+            hospital_status=F("status"),
+            **hospital_visit_counts(BREAKDOWN_VISIT_METRICS, date_from, date_to),
+            **{name: _active_staff(role) for name, role in BREAKDOWN_STAFF_METRICS.items()},
         )
-        .order_by("-total_visits")
+        .filter(total_visits__gt=0)
+        .values("id", "hospital_name", "hospital_status", *BREAKDOWN_VISIT_METRICS, *BREAKDOWN_STAFF_METRICS)
     )
+    page, next_cursor = keyset_page(rows, order_by, "id", cursor, page_size)
  
     return [
         {
-            "hospital_id": str(row["hospital__id"]),
-            "hospital_name": row["hospital__name"],
-            "hospital_status": row["hospital__status"],
-            "total_visits": row["total_visits"],
-            "completed_visits": row["completed_visits"],
-            "cancelled_visits": row["cancelled_visits"],
-            "total_active_nurses": row["total_nurses"],
-            "total_active_hospital_admins": row["total_hospital_admins"],
-            "total_active_medical_admins": row["total_medical_admins"],
+            "hospital_id": str(row["id"]),
+            "hospital_name": row["hospital_name"],
+            "hospital_status": row["hospital_status"],
+            **{name: row[name] for name in BREAKDOWN_VISIT_METRICS},
+            **{name: row[name] for name in BREAKDOWN_STAFF_METRICS},
         }
-        for row in rows
-    ]    
+        for row in page
+    ], next_cursor
 
 
+@cached_analytics()
 def superadmin_visits_over_time(date_from=None, date_to=None, group_by="day") -> list:
     """
     Platform-wide visit counts over time.
     Tells superadmin if the platform is growing.
     """
-    trunc_fn = TRUNC_MAP[group_by]
-    qs = Visit.objects.all()
-    qs = date_filter(qs, "created_at", date_from, date_to)
- 
-    rows = (
-        qs.annotate(period=trunc_fn("created_at"))
-        .values("period")
-        .annotate(count=Count("id"))
-        .order_by("period")
+    return counts_over_time(
+        HospitalDailyRollup.objects.filter(kind=HospitalDailyRollup.Kind.VISIT),
+        Visit.objects.all(),
+        date_from, date_to, group_by,
     )
- 
-    return [{"period": str(row["period"]), "count": row["count"]} for row in rows]
  
\ No newline at end of file
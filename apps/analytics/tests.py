@@ -0,0 +1,789 @@
+import inspect
+import re
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count, Q
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.analytics.management.commands.bench_hospital_breakdown import legacy_hospital_breakdown
+from apps.analytics.models import HospitalDailyRollup, NurseDailyRollup, RollupTombstone
+from apps.analytics.services import (
+    guardian_analytics, hospitaladmin_analytics, medicaladmin_analytics,
+    nurse_analytics, superadmin_analytics,
+)
+from apps.analytics.services import analytics_cache
+from apps.analytics.services.analytics_cache import cached_analytics, invalidate_hospital_analytics
+from apps.analytics.services.analytics_helpers import COMPLETED_STATUSES, date_filter
+from apps.analytics.services.rollups import refresh_rollups
+from apps.dependents.models import Dependent, Guardianship
+from apps.hospitals.models import Hospital, HospitalMembership
+from apps.reports.models import HealthObservation, Report, TemplateField
+from apps.reports.services import report_service
+from apps.visits.models import Visit, VisitType, VisitAssignment, VisitEvent
+from apps.visits.state_machine import transition
+
+
+class AnalyticsFixtureMixin:
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.hospital = Hospital.objects.create(
+            name="General", registration_number="AN-1", email="general@example.com",
+            status=Hospital.Status.ACTIVE,
+        )
+        cls.visit_type = VisitType.objects.create(hospital=cls.hospital, name="Checkup")
+        cls.dependent  = Dependent.objects.create(first_name="Dep", last_name="One")
+        cls.guardian = cls._user("guardian")
+        cls.admin    = cls._user("admin")
+        cls.nurse    = cls._user("nurse")
+        cls.medical  = cls._user("medical")
+        for user, role in (
+            (cls.admin,   HospitalMembership.Role.HOSPITAL_ADMIN),
+            (cls.nurse,   HospitalMembership.Role.NURSE),
+            (cls.medical, HospitalMembership.Role.MEDICAL_ADMIN),
+        ):
+            HospitalMembership.objects.create(user=user, hospital=cls.hospital, role=role)
+
+    @classmethod
+    def _user(cls, name):
+        return User.objects.create_user(
+            email=f"{name}@example.com", password="pw", first_name=name, last_name="Test",
+        )
+
+    @contextmanager
+    def assertQueriesPerTable(self, expected):
+        """Asserts the number of queries run against each table (by the table in FROM)."""
+        with CaptureQueriesContext(connection) as ctx:
+            yield
+        tables = Counter(
+            re.search(r'FROM "(\w+)"', query["sql"]).group(1) for query in ctx.captured_queries
+        )
+        self.assertEqual(dict(tables), expected)
+
+    def _visit(self, status=Visit.Status.COMPLETED, days_ago=0, report_status=None):
+        """A visit (and optionally its report) created `days_ago` days ago, accepted by the nurse."""
+        created_at = timezone.now() - timedelta(days=days_ago)
+        visit = Visit.objects.create(
+            hospital=self.hospital, dependent=self.dependent, visit_type=self.visit_type,
+            requested_by=self.guardian, address="1 Main St", status=status,
+        )
+        VisitAssignment.objects.create(
+            visit=visit, nurse=self.nurse, assigned_by=self.admin,
+            status=VisitAssignment.AssignmentStatus.ACCEPTED,
+        )
+        Visit.objects.filter(pk=visit.pk).update(created_at=created_at, updated_at=created_at)
+        report = None
+        if report_status:
+            report = Report.objects.create(
+                visit=visit, nurse=self.nurse, status=report_status,
+                submitted_at=None if report_status == Report.Status.DRAFT else created_at,
+            )
+            Report.objects.filter(pk=report.pk).update(created_at=created_at, updated_at=created_at)
+            report.refresh_from_db()
+        return visit, report
+
+
+class RollupDeletionTests(AnalyticsFixtureMixin, TestCase):
+
+    def _report_rollups(self, day):
+        return {
+            model.__name__: dict(
+                model.objects.filter(kind=HospitalDailyRollup.Kind.REPORT, day=day)
+                .values_list("status", "count")
+            )
+            for model in (HospitalDailyRollup, NurseDailyRollup)
+        }
+
+    def test_incremental_refresh_recounts_deleted_draft_day(self):
+        _, kept    = self._visit(days_ago=5, report_status=Report.Status.DRAFT)
+        _, deleted = self._visit(days_ago=5, report_status=Report.Status.DRAFT)
+        day = timezone.localdate(kept.created_at)
+
+        refresh_rollups(full=True)
+        self.assertEqual(self._report_rollups(day)["HospitalDailyRollup"], {Report.Status.DRAFT: 2})
+
+        report_service.delete_report(deleted)
+        self.assertEqual(RollupTombstone.objects.count(), 1)
+
+        result = refresh_rollups()
+        self.assertEqual(result["days"], 1)
+        self.assertEqual(self._report_rollups(day), {
+            "HospitalDailyRollup": {Report.Status.DRAFT: 1},
+            "NurseDailyRollup":    {Report.Status.DRAFT: 1},
+        })
+
+    def test_applied_tombstones_are_purged(self):
+        _, report = self._visit(days_ago=2, report_status=Report.Status.DRAFT)
+        refresh_rollups(full=True)
+        report_service.delete_report(report)
+
+        refresh_rollups()
+        RollupTombstone.objects.update(created_at=timezone.now() - timedelta(days=1))
+        refresh_rollups()
+        self.assertFalse(RollupTombstone.objects.exists())
+
+
+class SummaryQueryCountTests(AnalyticsFixtureMixin, TestCase):
+    """
+    Every summary reads each table once: one conditional-aggregate pass for
+    the live rows, one SUM over the rollups for the days they cover, plus
+    the watermark lookup that splits the range. Called .uncached so the
+    result cache does not hide the queries.
+    """
+
+    def setUp(self):
+        for days_ago, status, report_status in (
+            (10, Visit.Status.APPROVED,  Report.Status.APPROVED),
+            (10, Visit.Status.REPORT_SUBMITTED, Report.Status.SUBMITTED),
+            (3,  Visit.Status.COMPLETED, Report.Status.DRAFT),
+            (3,  Visit.Status.CANCELLED, None),
+            (0,  Visit.Status.REQUESTED, None),
+        ):
+            _, report = self._visit(status=status, days_ago=days_ago, report_status=report_status)
+            if report_status in (Report.Status.SUBMITTED, Report.Status.APPROVED):
+                Report.objects.filter(pk=report.pk).update(reviewed_by=self.medical)
+
+    def _summaries(self):
+        """name → (function, args, rollup table, live table)"""
+        return {
+            "hospital_visit_summary": (
+                hospitaladmin_analytics.hospital_visit_summary, (self.hospital,),
+                "analytics_hospital_daily", "visits_visit",
+            ),
+            "hospital_report_summary": (
+                hospitaladmin_analytics.hospital_report_summary, (self.hospital,),
+                "analytics_hospital_daily", "reports_report",
+            ),
+            "nurse_visit_summary": (
+                nurse_analytics.nurse_visit_summary, (self.nurse,),
+                "analytics_nurse_daily", "visits_visit",
+            ),
+            "nurse_report_summary": (
+                nurse_analytics.nurse_report_summary, (self.nurse,),
+                "analytics_nurse_daily", "reports_report",
+            ),
+            "medical_admin_review_summary": (
+                medicaladmin_analytics.medical_admin_review_summary, (self.hospital,),
+                "analytics_hospital_daily", "reports_report",
+            ),
+        }
+
+    def _expected_tables(self, name, *tables):
+        expected = dict.fromkeys(("analytics_rollup_watermark", *tables), 1)
+        if name == "medical_admin_review_summary":
+            expected["reports_version"] = 1   # average review time
+        return expected
+
+    def test_summaries_before_first_refresh(self):
+        for name, (summary, args, _, live_table) in self._summaries().items():
+            with self.subTest(summary=name):
+                with self.assertQueriesPerTable(self._expected_tables(name, live_table)):
+                    summary.uncached(*args)
+
+    def test_summaries_read_rollups_and_live_tail(self):
+        refresh_rollups(full=True)
+        for name, (summary, args, rollup_table, live_table) in self._summaries().items():
+            with self.subTest(summary=name):
+                with self.assertQueriesPerTable(self._expected_tables(name, rollup_table, live_table)):
+                    summary.uncached(*args)
+
+    def test_summaries_within_rolled_up_days_skip_live_tables(self):
+        refresh_rollups(full=True)
+        last_week = timezone.localdate() - timedelta(days=7)
+        with self.assertQueriesPerTable({
+            "analytics_rollup_watermark": 1, "analytics_hospital_daily": 1,
+        }):
+            hospitaladmin_analytics.hospital_visit_summary.uncached(self.hospital, None, last_week)
+
+    def test_reviewer_summary(self):
+        with self.assertQueriesPerTable({"reports_report": 1, "reports_version": 1}):
+            result = medicaladmin_analytics.medical_admin_review_summary.uncached(
+                self.hospital, self.medical,
+            )
+        self.assertEqual((result["pending"], result["approved"], result["rejected"]), (1, 1, 0))
+
+    def test_dependent_visit_summary(self):
+        with self.assertQueriesPerTable({"visits_visit": 1}):
+            result = guardian_analytics.dependent_visit_summary.uncached(self.dependent)
+        self.assertEqual(result["total"], 5)
+
+    def test_platform_summary(self):
+        refresh_rollups(full=True)
+        with self.assertQueriesPerTable({
+            "hospitals_hospital": 1,
+            "hospitals_membership": 1,
+            "analytics_rollup_watermark": 2,
+            "analytics_hospital_daily": 2,
+            "visits_visit": 1,
+            "reports_report": 1,
+        }):
+            result = superadmin_analytics.superadmin_platform_summary.uncached()
+        self.assertEqual(result["visits"]["total"], 5)
+        self.assertEqual(result["reports"]["total"], 3)
+        self.assertEqual(result["users"], {
+            "total_unique": 3,
+            "by_role": {
+                HospitalMembership.Role.HOSPITAL_ADMIN: 1,
+                HospitalMembership.Role.MEDICAL_ADMIN: 1,
+                HospitalMembership.Role.NURSE: 1,
+            },
+        })
+
+    def test_summary_totals_derived_from_buckets(self):
+        result = hospitaladmin_analytics.hospital_visit_summary.uncached(self.hospital)
+        self.assertEqual(result["total"], sum(result["by_status"].values()))
+        self.assertEqual(result["by_status"][Visit.Status.CANCELLED], 1)
+
+
+class VisitDurationTests(AnalyticsFixtureMixin, TestCase):
+    """hospital_visit_durations reads step times from the VisitEvent log in one query."""
+
+    def _timeline(self, *steps, hospital=None):
+        """steps: (to_status, hours_ago) in order; the first one is the "requested" event."""
+        visit, _ = self._visit(status=steps[-1][0])
+        hospital = hospital or self.hospital
+        now = timezone.now()
+        previous = ""
+        for to_status, hours_ago in steps:
+            VisitEvent.objects.create(
+                visit=visit, hospital=hospital, from_status=previous, to_status=to_status,
+                occurred_at=now - timedelta(hours=hours_ago),
+            )
+            previous = to_status
+        return visit
+
+    def test_step_averages_and_maxima(self):
+        self._timeline((Visit.Status.REQUESTED, 10), (Visit.Status.SCHEDULED, 9), (Visit.Status.ASSIGNED, 6))
+        self._timeline((Visit.Status.REQUESTED, 10), (Visit.Status.SCHEDULED, 7))
+
+        with self.assertNumQueries(1):
+            result = hospitaladmin_analytics.hospital_visit_durations.uncached(self.hospital)
+
+        self.assertEqual(result["request_to_schedule"], {"count": 2, "avg_seconds": 7200.0, "max_seconds": 10800.0})
+        self.assertEqual(result["schedule_to_assign"],  {"count": 1, "avg_seconds": 10800.0, "max_seconds": 10800.0})
+        self.assertEqual(result["assign_to_accept"],    {"count": 0, "avg_seconds": None, "max_seconds": None})
+
+    def test_step_counts_by_its_closing_event(self):
+        # Requested 10 days ago, scheduled yesterday: inside a 3-day range,
+        # with its start read from before the range.
+        self._timeline((Visit.Status.REQUESTED, 240), (Visit.Status.SCHEDULED, 24))
+        # Closed before the range
+        self._timeline((Visit.Status.REQUESTED, 240), (Visit.Status.SCHEDULED, 200))
+
+        today = timezone.localdate()
+        result = hospitaladmin_analytics.hospital_visit_durations.uncached(
+            self.hospital, today - timedelta(days=3), today,
+        )
+        self.assertEqual(result["request_to_schedule"]["count"], 1)
+        self.assertEqual(result["request_to_schedule"]["avg_seconds"], 216 * 3600.0)
+
+    def test_other_hospitals_are_excluded(self):
+        other = Hospital.objects.create(name="Other", registration_number="AN-2", email="other@example.com")
+        self._timeline((Visit.Status.REQUESTED, 5), (Visit.Status.SCHEDULED, 1), hospital=other)
+
+        result = hospitaladmin_analytics.hospital_visit_durations.uncached(self.hospital)
+        self.assertEqual(result["request_to_schedule"]["count"], 0)
+
+
+class HealthSeriesMixin(AnalyticsFixtureMixin):
+
+    def _series(self, values, field_name="temperature", dependent=None):
+        """One approved visit per value, a day apart and ending today; returns the observations."""
+        observations = []
+        for days_ago, value in zip(range(len(values) - 1, -1, -1), values):
+            visit, report = self._visit(days_ago=days_ago, report_status=Report.Status.APPROVED)
+            if dependent:
+                Visit.objects.filter(pk=visit.pk).update(dependent=dependent)
+            observations.append(HealthObservation(
+                dependent=dependent or self.dependent, field_name=field_name,
+                field_type=TemplateField.FieldType.NUMBER, observed_at=report.created_at,
+                report=report, visit=visit, value=str(value), value_numeric=value,
+            ))
+        return HealthObservation.objects.bulk_create(observations)
+
+
+class HealthTrendReadTests(HealthSeriesMixin, TestCase):
+    """Trend reads come from HealthObservation alone, already in time order."""
+
+    def setUp(self):
+        self.observations = self._series([36.5, 38.0, 37.0])
+        self._series([120.0], field_name="weight")
+        self._series([39.0], dependent=Dependent.objects.create(first_name="Dep", last_name="Two"))
+
+    def test_raw_series(self):
+        with self.assertQueriesPerTable({"reports_health_observation": 2}):   # span, then the points
+            points = guardian_analytics.dependent_health_trends.uncached(self.dependent, " Temperature")
+
+        self.assertEqual([p["numeric"] for p in points], [36.5, 38.0, 37.0])
+        self.assertEqual(
+            [p["visit_id"] for p in points], [str(o.visit_id) for o in self.observations],
+        )
+        self.assertEqual(points[0]["date"], str(self.observations[0].observed_at.date()))
+        self.assertEqual((points[0]["value"], points[0]["systolic"], points[0]["boolean"]), ("36.5", None, None))
+
+    def test_date_range(self):
+        today = timezone.localdate()
+        points = guardian_analytics.dependent_health_trends.uncached(
+            self.dependent, "temperature", today - timedelta(days=1), today,
+        )
+        self.assertEqual([p["numeric"] for p in points], [38.0, 37.0])
+
+    def test_stats(self):
+        with self.assertQueriesPerTable({"reports_health_observation": 1}):
+            stats = guardian_analytics.dependent_health_stats.uncached(self.dependent, "temperature")
+        self.assertEqual(stats["count"], 3)
+        self.assertAlmostEqual(stats["numeric"]["avg"], 37.1666, places=3)
+        self.assertEqual((stats["numeric"]["min"], stats["numeric"]["max"]), (36.5, 38.0))
+        self.assertIsNone(stats["systolic"])
+
+    def test_available_fields(self):
+        self.assertEqual(
+            guardian_analytics.dependent_available_trend_fields.uncached(self.dependent),
+            ["temperature", "weight"],
+        )
+
+
+class HealthTrendDownsamplingTests(HealthSeriesMixin, TestCase):
+    """Trend responses never exceed max_points, however long the series."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Guardianship.objects.create(user=cls.guardian, dependent=cls.dependent)
+
+    def setUp(self):
+        # A sine-like series with one spike, so LTTB has a peak to keep
+        self.values = [36.0 + (i % 7) / 10 for i in range(60)]
+        self.values[31] = 40.0
+        self._series(self.values)
+
+    def _trends(self, **kwargs):
+        return guardian_analytics.dependent_health_trends.uncached(self.dependent, "temperature", **kwargs)
+
+    def test_short_series_is_returned_whole(self):
+        points = self._trends(max_points=100)
+        self.assertEqual([p["numeric"] for p in points], self.values)
+        self.assertNotIn("_x", points[0])
+
+    def test_lttb_bounds_the_output(self):
+        points = self._trends(max_points=10)
+        self.assertEqual(len(points), 10)
+        numeric = [p["numeric"] for p in points]
+        self.assertEqual((numeric[0], numeric[-1]), (self.values[0], self.values[-1]))
+        self.assertIn(40.0, numeric)
+        self.assertEqual([p["date"] for p in points], sorted(p["date"] for p in points))
+
+    def test_group_by_buckets_in_sql(self):
+        points = self._trends(group_by="week", agg="max")
+        self.assertEqual(sum(p["count"] for p in points), len(self.values))
+        self.assertIn(40.0, [p["numeric"] for p in points])
+
+        last = self._trends(group_by="day", agg="last")
+        self.assertEqual(len(last), len(self.values))
+        self.assertEqual((last[-1]["value"], last[-1]["count"]), (str(self.values[-1]), 1))
+
+    @override_settings(HEALTH_TRENDS_LTTB_INPUT_LIMIT=20)
+    def test_long_series_is_bucketed_before_lttb(self):
+        points = self._trends(max_points=100)
+        # 60 days do not fit 20 daily buckets, so weekly ones are used
+        self.assertLessEqual(len(points), 10)
+        self.assertEqual(sum(p["count"] for p in points), len(self.values))
+
+    def test_endpoint_bounds_max_points(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.get(pk=self.guardian.pk))
+        url = reverse("dependent-health-trends", args=[self.dependent.id])
+
+        response = client.get(url, {"field": "temperature", "max_points": 5})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 5)
+
+        for bad in (2, 2001, "many"):
+            with self.subTest(max_points=bad):
+                response = client.get(url, {"field": "temperature", "max_points": bad})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("max_points", response.json())
+
+    def test_endpoint_is_guardian_only(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.get(pk=self.nurse.pk))
+        response = client.get(
+            reverse("dependent-health-trends", args=[self.dependent.id]), {"field": "temperature"},
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class AnalyticsCacheLocMemTests(AnalyticsFixtureMixin, TestCase):
+    """A per-process cache would miss other workers' invalidations, so it is not used."""
+
+    def test_every_call_is_computed(self):
+        self._visit()
+        hospitaladmin_analytics.hospital_visit_summary(self.hospital)
+        Visit.objects.update(status=Visit.Status.CANCELLED)   # e.g. by another worker
+
+        with CaptureQueriesContext(connection) as ctx:
+            result = hospitaladmin_analytics.hospital_visit_summary(self.hospital)
+        self.assertTrue(ctx.captured_queries)
+        self.assertEqual(result["by_status"][Visit.Status.CANCELLED], 1)
+
+
+class AnalyticsCacheSharedTests(AnalyticsFixtureMixin, TestCase):
+    """Versioned entries on a backend every worker shares."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cache_dir = tempfile.mkdtemp()
+        cls.enterClassContext(override_settings(
+            CACHES={"default": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": cls.cache_dir,
+            }},
+            ANALYTICS_CACHE_LOCK_TIMEOUT=1,
+        ))
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(cls.cache_dir, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+
+    def _visit_summary(self):
+        return hospitaladmin_analytics.hospital_visit_summary(self.hospital)["by_status"]
+
+    def _report_summary(self):
+        return hospitaladmin_analytics.hospital_report_summary(self.hospital)["by_status"]
+
+    def test_repeated_read_is_served_from_the_cache(self):
+        self._visit()
+        first = self._visit_summary()
+        with self.assertNumQueries(0):
+            self.assertEqual(self._visit_summary(), first)
+
+    def test_transition_bumps_hospital_and_global_versions(self):
+        visit, _ = self._visit(status=Visit.Status.REQUESTED)
+        self.assertEqual(self._visit_summary()[Visit.Status.REQUESTED], 1)
+        platform = superadmin_analytics.superadmin_platform_summary()["visits"]["by_status"]
+        self.assertEqual(platform[Visit.Status.REQUESTED], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            transition(visit, Visit.Status.SCHEDULED, User.objects.get(pk=self.admin.pk))
+
+        self.assertEqual(self._visit_summary()[Visit.Status.SCHEDULED], 1)
+        platform = superadmin_analytics.superadmin_platform_summary()["visits"]["by_status"]
+        self.assertEqual((platform.get(Visit.Status.REQUESTED, 0), platform[Visit.Status.SCHEDULED]), (0, 1))
+
+    def test_approve_and_reject_bump_the_version(self):
+        _, approved = self._visit(status=Visit.Status.REPORT_SUBMITTED, report_status=Report.Status.SUBMITTED)
+        _, rejected = self._visit(status=Visit.Status.REPORT_SUBMITTED, report_status=Report.Status.SUBMITTED)
+        self.assertEqual(self._report_summary()[Report.Status.SUBMITTED], 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            report_service.approve_report(approved, self.medical)
+        summary = self._report_summary()
+        self.assertEqual((summary[Report.Status.SUBMITTED], summary[Report.Status.APPROVED]), (1, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            report_service.reject_report(rejected, self.medical, "Incomplete")
+        summary = self._report_summary()
+        self.assertEqual((summary.get(Report.Status.SUBMITTED, 0), summary[Report.Status.DRAFT]), (0, 1))
+
+    def test_other_hospitals_keep_their_entries(self):
+        self._visit()
+        self._visit_summary()
+        other = Hospital.objects.create(name="Other", registration_number="AN-3", email="other@example.com")
+
+        invalidate_hospital_analytics(other)
+        with self.assertNumQueries(0):
+            self._visit_summary()
+
+    def test_concurrent_misses_compute_once(self):
+        calls = []
+
+        @cached_analytics()
+        def slow(n):
+            calls.append(n)
+            time.sleep(0.2)
+            return n * 2
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: slow(21), range(8)))
+
+        self.assertEqual(results, [42] * 8)
+        self.assertEqual(calls, [21])
+
+    def test_waits_for_another_process_holding_the_lock(self):
+        calls = []
+
+        @cached_analytics()
+        def report(n):
+            calls.append(n)
+            return "mine"
+
+        key = analytics_cache._entry_key(report.__wrapped__, inspect.signature(report), (1,), {}, None)
+        cache.add(f"{key}:lock", 1)
+        threading.Timer(0.2, lambda: cache.set(key, "theirs")).start()
+
+        self.assertEqual(report(1), "theirs")
+        self.assertEqual(calls, [])
+
+    def test_stale_lock_falls_back_to_computing(self):
+        @cached_analytics()
+        def report(n):
+            return "mine"
+
+        key = analytics_cache._entry_key(report.__wrapped__, inspect.signature(report), (1,), {}, None)
+        cache.add(f"{key}:lock", 1)   # holder died without releasing it
+
+        self.assertEqual(report(1), "mine")   # after ANALYTICS_CACHE_LOCK_TIMEOUT
+
+
+def legacy_nurse_summary(hospital) -> dict:
+    """The former two-query hospital_nurse_summary (no date range), keyed by nurse id."""
+    AS = VisitAssignment.AssignmentStatus
+    rows = (
+        VisitAssignment.objects.filter(visit__hospital=hospital)
+        .values("nurse__id", "nurse__first_name", "nurse__last_name", "nurse__email")
+        .annotate(
+            total_visits_assigned=Count("visit_id", distinct=True),
+            total_accepted=Count("visit_id", filter=Q(status=AS.ACCEPTED), distinct=True),
+            total_rejected=Count("id", filter=Q(status=AS.REJECTED)),
+            total_reassigned=Count("id", filter=Q(status=AS.CANCELLED)),
+        )
+    )
+    visit_rows = (
+        Visit.objects.filter(hospital=hospital, assignments__status=AS.ACCEPTED)
+        .values("assignments__nurse_id")
+        .annotate(
+            total_started=Count("id", filter=Q(status__in=hospitaladmin_analytics.STARTED_STATUSES), distinct=True),
+            total_completed=Count("id", filter=Q(status__in=COMPLETED_STATUSES), distinct=True),
+        )
+    )
+    visit_stats = {str(r["assignments__nurse_id"]): r for r in visit_rows}
+    return {
+        str(row["nurse__id"]): {
+            "nurse_id": str(row["nurse__id"]),
+            "nurse_name": f"{row['nurse__first_name']} {row['nurse__last_name']}".strip(),
+            "nurse_email": row["nurse__email"],
+            "total_visits_assigned": row["total_visits_assigned"],
+            "total_accepted": row["total_accepted"],
+            "total_started": visit_stats.get(str(row["nurse__id"]), {}).get("total_started", 0),
+            "total_completed": visit_stats.get(str(row["nurse__id"]), {}).get("total_completed", 0),
+            "total_rejected": row["total_rejected"],
+            "total_reassigned": row["total_reassigned"],
+        }
+        for row in rows
+    }
+
+
+class NurseSummaryTests(AnalyticsFixtureMixin, TestCase):
+    """hospital_nurse_summary: one grouped query, same numbers as the two-query version."""
+
+    def setUp(self):
+        AS = VisitAssignment.AssignmentStatus
+        self.nurses = [self.nurse] + [self._user(f"nurse{i}") for i in range(6)]
+        for nurse in self.nurses[1:]:
+            HospitalMembership.objects.create(user=nurse, hospital=self.hospital, role=HospitalMembership.Role.NURSE)
+
+        # (visit status, [(nurse index, assignment status), ...])
+        histories = [
+            (Visit.Status.APPROVED,  [(0, AS.ACCEPTED)]),
+            (Visit.Status.STARTED,   [(0, AS.ACCEPTED)]),
+            (Visit.Status.COMPLETED, [(1, AS.REJECTED), (2, AS.ACCEPTED)]),
+            (Visit.Status.ASSIGNED,  [(1, AS.CANCELLED), (3, AS.PENDING)]),
+            (Visit.Status.ACCEPTED,  [(3, AS.REJECTED), (3, AS.CANCELLED), (4, AS.ACCEPTED)]),
+            (Visit.Status.CANCELLED, [(5, AS.CANCELLED)]),
+            (Visit.Status.REPORT_SUBMITTED, [(4, AS.ACCEPTED)]),
+            (Visit.Status.ASSIGNED,  [(6, AS.PENDING)]),
+            (Visit.Status.ASSIGNED,  [(2, AS.PENDING)]),
+        ]
+        for status, assignments in histories:
+            visit = Visit.objects.create(
+                hospital=self.hospital, dependent=self.dependent, visit_type=self.visit_type,
+                requested_by=self.guardian, address="1 Main St", status=status,
+            )
+            for index, assignment_status in assignments:
+                VisitAssignment.objects.create(
+                    visit=visit, nurse=self.nurses[index], assigned_by=self.admin, status=assignment_status,
+                )
+
+    def _all_pages(self, order_by, page_size):
+        rows, cursor, pages = [], None, 0
+        while True:
+            page, cursor = hospitaladmin_analytics.hospital_nurse_summary.uncached(
+                self.hospital, order_by=order_by, cursor=cursor, page_size=page_size,
+            )
+            rows.extend(page)
+            pages += 1
+            if not cursor:
+                return rows, pages
+
+    def test_matches_the_two_query_version(self):
+        with self.assertNumQueries(1):
+            rows, cursor = hospitaladmin_analytics.hospital_nurse_summary.uncached(self.hospital)
+        self.assertIsNone(cursor)
+        self.assertEqual({row["nurse_id"]: row for row in rows}, legacy_nurse_summary(self.hospital))
+
+    def test_pages_stitch_into_the_full_ordering(self):
+        for order_by in ("-total_visits_assigned", "total_accepted", "-total_reassigned", "total_rejected"):
+            with self.subTest(order_by=order_by):
+                rows, pages = self._all_pages(order_by, page_size=2)
+                self.assertEqual(pages, 4)
+
+                field = order_by.lstrip("-")
+                sign = -1 if order_by.startswith("-") else 1
+                expected = sorted(
+                    legacy_nurse_summary(self.hospital).values(),
+                    key=lambda row: (sign * row[field], row["nurse_id"]),
+                )
+                self.assertEqual(rows, expected)
+
+    def test_started_and_completed_respect_the_date_range(self):
+        # The nurse's accepted (started, approved) visits are old; one new pending assignment is in range
+        VisitAssignment.objects.filter(nurse=self.nurse).update(created_at=timezone.now() - timedelta(days=30))
+        self._visit()
+        VisitAssignment.objects.filter(nurse=self.nurse, visit__status=Visit.Status.COMPLETED).update(
+            status=VisitAssignment.AssignmentStatus.PENDING,
+        )
+
+        today = timezone.localdate()
+        rows, _ = hospitaladmin_analytics.hospital_nurse_summary.uncached(
+            self.hospital, today - timedelta(days=7), today,
+        )
+        row = next(row for row in rows if row["nurse_id"] == str(self.nurse.id))
+        self.assertEqual(
+            (row["total_visits_assigned"], row["total_started"], row["total_completed"]), (1, 0, 0),
+        )
+
+
+class HospitalBreakdownTests(AnalyticsFixtureMixin, TestCase):
+    """superadmin_hospital_breakdown against the former visits × memberships query."""
+
+    LEGACY_NAMES = {
+        "total_active_nurses":          "total_nurses",
+        "total_active_hospital_admins": "total_hospital_admins",
+        "total_active_medical_admins":  "total_medical_admins",
+    }
+
+    def setUp(self):
+        S = Visit.Status
+        self.hospitals = [self.hospital]
+        for i in range(1, 4):
+            hospital = Hospital.objects.create(
+                name=f"Hospital {i}", registration_number=f"HB-{i}", email=f"h{i}@example.com",
+                status=Hospital.Status.ACTIVE,
+            )
+            self.hospitals.append(hospital)
+            for n in range(i):
+                HospitalMembership.objects.create(
+                    user=self._user(f"h{i}nurse{n}"), hospital=hospital, role=HospitalMembership.Role.NURSE,
+                    is_active=n != 1,
+                )
+        # A hospital without visits is left out
+        Hospital.objects.create(name="Quiet", registration_number="HB-Q", email="quiet@example.com")
+
+        for hospital, visits in zip(self.hospitals, [
+            [(S.APPROVED, 20), (S.CANCELLED, 3), (S.REQUESTED, 0)],
+            [(S.COMPLETED, 12), (S.COMPLETED, 1)],
+            [(S.CANCELLED, 40), (S.SCHEDULED, 2), (S.REPORT_SUBMITTED, 2), (S.REQUESTED, 0)],
+            [(S.REQUESTED, 5), (S.REQUESTED, 0), (S.CANCELLED, 0)],
+        ]):
+            visit_type, _ = VisitType.objects.get_or_create(hospital=hospital, name="Checkup")
+            for status, days_ago in visits:
+                visit = Visit.objects.create(
+                    hospital=hospital, dependent=self.dependent, visit_type=visit_type,
+                    requested_by=self.guardian, address="1 Main St", status=status,
+                )
+                created_at = timezone.now() - timedelta(days=days_ago)
+                Visit.objects.filter(pk=visit.pk).update(created_at=created_at, updated_at=created_at)
+
+    def _expected(self, date_from=None):
+        """
+        Hospitals and staff counts from the legacy query. Its visit counts are
+        multiplied by the joined memberships, so those come from the same
+        aggregates over visits alone.
+        """
+        visits = date_filter(Visit.objects.all(), "created_at", date_from, None)
+        visit_counts = {
+            row.pop("hospital_id"): row
+            for row in visits.values("hospital_id").annotate(
+                total_visits=Count("id"),
+                completed_visits=Count("id", filter=Q(status__in=COMPLETED_STATUSES)),
+                cancelled_visits=Count("id", filter=Q(status=Visit.Status.CANCELLED)),
+            )
+        }
+        return {
+            str(row["hospital__id"]): {
+                "hospital_id": str(row["hospital__id"]),
+                "hospital_name": row["hospital__name"],
+                "hospital_status": row["hospital__status"],
+                **visit_counts[row["hospital__id"]],
+                **{name: row[legacy] for name, legacy in self.LEGACY_NAMES.items()},
+            }
+            for row in legacy_hospital_breakdown(date_from)
+        }
+
+    def _all_pages(self, date_from=None, order_by="-total_visits", page_size=1):
+        rows, cursor = [], None
+        while True:
+            page, cursor = superadmin_analytics.superadmin_hospital_breakdown.uncached(
+                date_from, order_by=order_by, cursor=cursor, page_size=page_size,
+            )
+            rows.extend(page)
+            if not cursor:
+                return rows
+
+    def test_matches_the_legacy_query(self):
+        last_week = timezone.localdate() - timedelta(days=7)
+        for refreshed in (False, True):
+            if refreshed:
+                refresh_rollups(full=True)
+            for date_from in (None, last_week):
+                with self.subTest(rollups=refreshed, date_from=date_from):
+                    with self.assertNumQueries(2):   # watermark, then one statement
+                        rows, cursor = superadmin_analytics.superadmin_hospital_breakdown.uncached(date_from)
+                    self.assertIsNone(cursor)
+                    self.assertEqual({row["hospital_id"]: row for row in rows}, self._expected(date_from))
+
+    def test_legacy_visit_counts_were_multiplied_by_staff(self):
+        legacy = {row["hospital__name"]: row["total_visits"] for row in legacy_hospital_breakdown()}
+        rows, _ = superadmin_analytics.superadmin_hospital_breakdown.uncached()
+        # General: 3 visits, 3 members
+        self.assertEqual((legacy["General"], {r["hospital_name"]: r for r in rows}["General"]["total_visits"]), (9, 3))
+
+    def test_staff_counts_only_active_members(self):
+        rows, _ = superadmin_analytics.superadmin_hospital_breakdown.uncached()
+        nurses = {row["hospital_name"]: row["total_active_nurses"] for row in rows}
+        self.assertEqual(nurses, {"General": 1, "Hospital 1": 1, "Hospital 2": 1, "Hospital 3": 2})
+
+    def test_orderings_and_pages(self):
+        refresh_rollups(full=True)
+        expected_rows = list(self._expected().values())
+        for order_by in ("-total_visits", "hospital_name", "-total_active_nurses", "cancelled_visits"):
+            with self.subTest(order_by=order_by):
+                field = order_by.lstrip("-")
+                descending = order_by.startswith("-")
+                # Stable sorts: id ascending, then the order column
+                expected = sorted(expected_rows, key=lambda row: row["hospital_id"])
+                expected.sort(key=lambda row: row[field], reverse=descending)
+
+                first, _ = superadmin_analytics.superadmin_hospital_breakdown.uncached(order_by=order_by)
+                self.assertEqual(first, expected)
+                self.assertEqual(self._all_pages(order_by=order_by), expected)
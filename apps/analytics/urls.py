@@ -9,6 +9,7 @@ from apps.analytics.views.hospital import (
     HospitalVisitsOverTimeView,
     HospitalReportSummaryView,
     HospitalNurseSummaryView,
+    HospitalVisitDurationsView,
 )
 from apps.analytics.views.medical_admin import MedicalAdminReviewSummaryView
 from apps.analytics.views.nurse import (
@@ -19,6 +20,7 @@ from apps.analytics.views.nurse import (
 from apps.analytics.views.guardian import (
     DependentVisitSummaryView,
     DependentHealthTrendsView,
+    DependentHealthStatsView,
     DependentAvailableFieldsView,
 )
 
@@ -33,6 +35,7 @@ urlpatterns = [
     path("hospitals/<uuid:hospital_id>/visits/over-time/", HospitalVisitsOverTimeView.as_view(), name="hospital-visits-over-time"),
     path("hospitals/<uuid:hospital_id>/reports/summary/", HospitalReportSummaryView.as_view(), name="hospital-report-summary"),
     path("hospitals/<uuid:hospital_id>/nurses/summary/", HospitalNurseSummaryView.as_view(), name="hospital-nurse-summary"),
+    path("hospitals/<uuid:hospital_id>/visits/durations/", HospitalVisitDurationsView.as_view(), name="hospital-visit-durations"),
 
     # Medical admin
     path("hospitals/<uuid:hospital_id>/reviews/summary/", MedicalAdminReviewSummaryView.as_view(), name="medical-review-summary"),
@@ -45,5 +48,6 @@ urlpatterns = [
     # Guardian / dependent health
     path("dependents/<uuid:dependent_id>/visits/summary/", DependentVisitSummaryView.as_view(), name="dependent-visit-summary"),
     path("dependents/<uuid:dependent_id>/health/trends/", DependentHealthTrendsView.as_view(), name="dependent-health-trends"),
+    path("dependents/<uuid:dependent_id>/health/stats/", DependentHealthStatsView.as_view(), name="dependent-health-stats"),
     path("dependents/<uuid:dependent_id>/health/fields/", DependentAvailableFieldsView.as_view(), name="dependent-health-fields"),
 ]
\ No newline at end of file
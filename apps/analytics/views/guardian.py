@@ -6,28 +6,26 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes
 
-from apps.dependents.models import Dependent, Guardianship
+from apps.dependents.models import Dependent
+from common.permissions.access_context import get_access_context
 from apps.analytics.services import guardian_analytics
-from .utils import parse_date_params
+from .utils import parse_date_params, parse_trend_params
 
 
 def get_dependent_for_guardian(user, dependent_id):
     """
     Returns the dependent if the user is an active guardian, else None.
     """
+    if not get_access_context(user).is_guardian_of(dependent_id):
+        return None
+
     try:
-        dependent = Dependent.objects.get(id=dependent_id)
+        return Dependent.objects.get(id=dependent_id)
     except Dependent.DoesNotExist:
         return None
 
-    is_guardian = Guardianship.objects.filter(
-        user=user, dependent=dependent, is_active=True,
-    ).exists()
-
-    return dependent if is_guardian else None
-
 
 class DependentVisitSummaryView(APIView):
     permission_classes = [IsAuthenticated]
@@ -46,7 +44,28 @@ class DependentVisitSummaryView(APIView):
 class DependentHealthTrendsView(APIView):
     permission_classes = [IsAuthenticated]
 
-    @extend_schema(summary="Dependent health trends (guardian)", tags=["Analytics-Guardian"])
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name="field", required=True, type=OpenApiTypes.STR),
+            OpenApiParameter(
+                name="group_by",
+                description="day | week | month — one point per period, aggregated in SQL",
+                type=OpenApiTypes.STR,
+            ),
+            OpenApiParameter(
+                name="agg",
+                description="Per-period aggregate when points are bucketed: avg (default) | min | max | last",
+                type=OpenApiTypes.STR,
+            ),
+            OpenApiParameter(
+                name="max_points",
+                description="Upper bound on returned points (default 500); longer series are downsampled",
+                type=OpenApiTypes.INT,
+            ),
+        ],
+        summary="Dependent health trends (guardian)",
+        tags=["Analytics-Guardian"],
+    )
     def get(self, request, dependent_id):
         dependent = get_dependent_for_guardian(request.user, dependent_id)
         if not dependent:
@@ -60,9 +79,35 @@ class DependentHealthTrendsView(APIView):
             )
 
         date_from, date_to = parse_date_params(request)
+        group_by, agg, max_points = parse_trend_params(request)
         data = guardian_analytics.dependent_health_trends(
             dependent, field_name=field_name,
             date_from=date_from, date_to=date_to,
+            group_by=group_by, agg=agg, max_points=max_points,
+        )
+        return Response(data)
+
+
+class DependentHealthStatsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(summary="Dependent health field statistics (guardian)", tags=["Analytics-Guardian"])
+    def get(self, request, dependent_id):
+        dependent = get_dependent_for_guardian(request.user, dependent_id)
+        if not dependent:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        field_name = request.query_params.get("field")
+        if not field_name:
+            return Response(
+                {"detail": "field query param is required. Use /health/fields/ to see available fields."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        date_from, date_to = parse_date_params(request)
+        data = guardian_analytics.dependent_health_stats(
+            dependent, field_name=field_name,
+            date_from=date_from, date_to=date_to,
         )
         return Response(data)
 
@@ -5,11 +5,14 @@ Hospital admin analytics endpoints.
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes
 
 from apps.hospitals.models import HospitalMembership
 from apps.analytics.services import hospitaladmin_analytics
-from .utils import parse_date_params, parse_group_by, require_hospital_role
+from apps.analytics.services.analytics_helpers import MAX_PAGE_SIZE
+from .utils import (
+    next_page_url, parse_date_params, parse_group_by, parse_page_params, require_hospital_role,
+)
 
 
 class HospitalVisitSummaryView(APIView):
@@ -70,7 +73,33 @@ class HospitalReportSummaryView(APIView):
 class HospitalNurseSummaryView(APIView):
     permission_classes = [IsAuthenticated]
 
-    @extend_schema(summary="Per-nurse breakdown (hospital admin)", tags=["Analytics-Hospitaladmin"])
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="order_by",
+                description=(
+                    f"One of {', '.join(hospitaladmin_analytics.NURSE_SUMMARY_METRICS)}; "
+                    "prefix '-' for descending. Default: -total_visits_assigned."
+                ),
+                required=False,
+                type=OpenApiTypes.STR,
+            ),
+            OpenApiParameter(
+                name="cursor",
+                description="Opaque cursor from the previous page's `next`.",
+                required=False,
+                type=OpenApiTypes.STR,
+            ),
+            OpenApiParameter(
+                name="page_size",
+                description=f"Nurses per page (max {MAX_PAGE_SIZE}).",
+                required=False,
+                type=OpenApiTypes.INT,
+            ),
+        ],
+        summary="Per-nurse breakdown (hospital admin)",
+        tags=["Analytics-Hospitaladmin"],
+    )
     def get(self, request, hospital_id):
         hospital, error = require_hospital_role(
             request.user, hospital_id,
@@ -80,5 +109,28 @@ class HospitalNurseSummaryView(APIView):
             return error
 
         date_from, date_to = parse_date_params(request)
-        data = hospitaladmin_analytics.hospital_nurse_summary(hospital, date_from, date_to)
-        return Response(data)
\ No newline at end of file
+        order_by, cursor, page_size = parse_page_params(
+            request, hospitaladmin_analytics.NURSE_SUMMARY_METRICS, "-total_visits_assigned",
+        )
+        rows, next_cursor = hospitaladmin_analytics.hospital_nurse_summary(
+            hospital, date_from, date_to,
+            order_by=order_by, cursor=cursor, page_size=page_size,
+        )
+        return Response({"next": next_page_url(request, next_cursor), "results": rows})
+
+
+class HospitalVisitDurationsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(summary="Time spent in each visit lifecycle step (hospital admin)", tags=["Analytics-Hospitaladmin"])
+    def get(self, request, hospital_id):
+        hospital, error = require_hospital_role(
+            request.user, hospital_id,
+            roles=[HospitalMembership.Role.HOSPITAL_ADMIN],
+        )
+        if error:
+            return error
+
+        date_from, date_to = parse_date_params(request)
+        data = hospitaladmin_analytics.hospital_visit_durations(hospital, date_from, date_to)
+        return Response(data)
@@ -7,7 +7,8 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from drf_spectacular.utils import extend_schema
 
-from apps.hospitals.models import HospitalMembership
+from apps.hospitals.models import Hospital, HospitalMembership
+from common.permissions.access_context import get_access_context
 from apps.analytics.services import nurse_analytics
 from .utils import parse_date_params, parse_group_by
 
@@ -23,14 +24,8 @@ class NurseVisitSummaryView(APIView):
         hospital = None
         if hospital_id:
             # Verify the nurse actually belongs to this hospital
-            membership = HospitalMembership.objects.filter(
-                user=request.user,
-                hospital_id=hospital_id,
-                role=HospitalMembership.Role.NURSE,
-                is_active=True,
-            ).select_related("hospital").first()
-            if membership:
-                hospital = membership.hospital
+            if get_access_context(request.user).has_role(hospital_id, HospitalMembership.Role.NURSE):
+                hospital = Hospital.objects.filter(id=hospital_id).first()
 
         data = nurse_analytics.nurse_visit_summary(
             request.user, hospital=hospital,
@@ -9,10 +9,11 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes
 
 from apps.analytics.services import superadmin_analytics
-from .utils import parse_date_params, parse_group_by
+from apps.analytics.services.analytics_helpers import MAX_PAGE_SIZE
+from .utils import next_page_url, parse_date_params, parse_group_by, parse_page_params
 
 
 class SuperadminPlatformSummaryView(APIView):
@@ -32,13 +33,42 @@ class SuperadminHospitalBreakdownView(APIView):
     permission_classes = [IsAuthenticated, IsAdminUser]
 
     @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="order_by",
+                description=(
+                    f"One of {', '.join(superadmin_analytics.BREAKDOWN_ORDERINGS)}; "
+                    "prefix '-' for descending. Default: -total_visits."
+                ),
+                required=False,
+                type=OpenApiTypes.STR,
+            ),
+            OpenApiParameter(
+                name="cursor",
+                description="Opaque cursor from the previous page's `next`.",
+                required=False,
+                type=OpenApiTypes.STR,
+            ),
+            OpenApiParameter(
+                name="page_size",
+                description=f"Hospitals per page (max {MAX_PAGE_SIZE}).",
+                required=False,
+                type=OpenApiTypes.INT,
+            ),
+        ],
         summary="Per-hospital activity breakdown (superadmin)",
         tags=["Analytics - Superadmin"],
     )
     def get(self, request):
         date_from, date_to = parse_date_params(request)
-        data = superadmin_analytics.superadmin_hospital_breakdown(date_from, date_to)
-        return Response(data)
+        order_by, cursor, page_size = parse_page_params(
+            request, superadmin_analytics.BREAKDOWN_ORDERINGS, "-total_visits",
+        )
+        rows, next_cursor = superadmin_analytics.superadmin_hospital_breakdown(
+            date_from, date_to,
+            order_by=order_by, cursor=cursor, page_size=page_size,
+        )
+        return Response({"next": next_page_url(request, next_cursor), "results": rows})
 
 
 class SuperadminVisitsOverTimeView(APIView):
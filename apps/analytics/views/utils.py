@@ -3,10 +3,14 @@ Shared helpers used across all analytics views.
 """
 
 from datetime import date
+from django.conf import settings
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from apps.hospitals.models import Hospital, HospitalMembership
+from apps.hospitals.models import Hospital
+from common.permissions.access_context import get_access_context
+from apps.analytics.services.guardian_analytics import VALID_TREND_AGGS
+from apps.analytics.services.analytics_helpers import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 VALID_GROUP_BY = {"day", "week", "month"}
 
@@ -41,9 +45,12 @@ def parse_date_params(request):
 def parse_group_by(request, default="day") -> str:
     """
     Parses and validates the group_by query param.
+    With default=None the param is optional and None means "not grouped".
     Raises ValidationError (400) if the value is not day/week/month.
     """
     value = request.query_params.get("group_by", default)
+    if value is None:
+        return None
     if value not in VALID_GROUP_BY:
         raise ValidationError(
             {"group_by": f"Invalid value '{value}'. Must be one of: {', '.join(sorted(VALID_GROUP_BY))}."}
@@ -51,6 +58,71 @@ def parse_group_by(request, default="day") -> str:
     return value
 
 
+def parse_trend_params(request) -> tuple:
+    """
+    Parses group_by, agg and max_points for health trends.
+    Returns (group_by | None, agg, max_points).
+
+    Raises ValidationError (400) if:
+    - group_by is not day/week/month
+    - agg is not avg/min/max/last
+    - max_points is not an integer between 3 and HEALTH_TRENDS_MAX_POINTS
+    """
+    group_by = parse_group_by(request, default=None)
+
+    agg = request.query_params.get("agg", "avg")
+    if agg not in VALID_TREND_AGGS:
+        raise ValidationError(
+            {"agg": f"Invalid value '{agg}'. Must be one of: {', '.join(sorted(VALID_TREND_AGGS))}."}
+        )
+
+    upper = getattr(settings, "HEALTH_TRENDS_MAX_POINTS", 2000)
+    max_points = request.query_params.get("max_points")
+    if max_points is not None:
+        try:
+            max_points = int(max_points)
+        except ValueError:
+            max_points = 0
+        if not 3 <= max_points <= upper:
+            raise ValidationError({"max_points": f"Must be an integer between 3 and {upper}."})
+
+    return group_by, agg, max_points
+
+
+def parse_page_params(request, orderings, default_ordering: str) -> tuple:
+    """
+    Parses order_by, cursor and page_size for paginated breakdowns.
+    Returns (order_by, cursor | None, page_size).
+
+    Raises ValidationError (400) if:
+    - order_by is not one of `orderings`, optionally prefixed with "-"
+    - page_size is not an integer between 1 and MAX_PAGE_SIZE
+    """
+    order_by = request.query_params.get("order_by", default_ordering)
+    if order_by.lstrip("-") not in orderings:
+        raise ValidationError(
+            {"order_by": f"Invalid value '{order_by}'. Must be one of: {', '.join(orderings)} (prefix '-' for descending)."}
+        )
+
+    try:
+        page_size = int(request.query_params.get("page_size", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        page_size = 0
+    if not 1 <= page_size <= MAX_PAGE_SIZE:
+        raise ValidationError({"page_size": f"Must be an integer between 1 and {MAX_PAGE_SIZE}."})
+
+    return order_by, request.query_params.get("cursor") or None, page_size
+
+
+def next_page_url(request, next_cursor: str | None) -> str | None:
+    """This request's URL with `cursor` set to next_cursor (None on the last page)."""
+    if not next_cursor:
+        return None
+    params = request.query_params.copy()
+    params["cursor"] = next_cursor
+    return request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+
+
 def require_hospital_role(user, hospital_id, roles: list):
     """
     Checks the user is an active member of the hospital with one of the given roles.
@@ -62,12 +134,7 @@ def require_hospital_role(user, hospital_id, roles: list):
     except Hospital.DoesNotExist:
         return None, Response({"detail": "Hospital not found."}, status=status.HTTP_404_NOT_FOUND)
 
-    has_role = HospitalMembership.objects.filter(
-        user=user,
-        hospital=hospital,
-        role__in=roles,
-        is_active=True,
-    ).exists()
+    has_role = get_access_context(user).has_role(hospital.id, *roles)
 
     if not has_role:
         return None, Response(
@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 class DependentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.dependents'
\ No newline at end of file
+    name = 'apps.dependents'
+
+    def ready(self):
+        from apps.dependents import signals  # noqa: F401
@@ -1,5 +1,5 @@
 from rest_framework.permissions import BasePermission
-from apps.dependents.models import Guardianship
+from common.permissions.access_context import get_access_context
 
 
 class IsGuardian(BasePermission):
@@ -7,8 +7,4 @@ class IsGuardian(BasePermission):
 
     def has_object_permission(self, request, view, obj):
         # obj here is a Dependent instance
-        return Guardianship.objects.filter(
-            user=request.user,
-            dependent=obj,
-            is_active=True,
-        ).exists()
\ No newline at end of file
+        return get_access_context(request.user).is_guardian_of(obj.pk)
\ No newline at end of file
@@ -2,6 +2,7 @@ from django.contrib.auth import get_user_model
 from rest_framework.exceptions import ValidationError
 
 from apps.dependents.models import Dependent, Guardianship
+from common.permissions.access_context import clear_access_context
 
 User = get_user_model()
 
@@ -17,6 +18,7 @@ def create_dependent(validated_data: dict, guardian) -> Dependent:
         dependent=dependent,
         added_by=guardian,
     )
+    clear_access_context(guardian)
 
     return dependent
 
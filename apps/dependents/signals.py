@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.dependents.models import Guardianship
+from common.permissions.access_context import invalidate_access_context
+
+
+@receiver(post_save, sender=Guardianship)
+@receiver(post_delete, sender=Guardianship)
+def invalidate_user_access_context(sender, instance, **kwargs):
+    """Any change to a guardianship can change what the user is allowed to do."""
+    invalidate_access_context(instance.user_id)
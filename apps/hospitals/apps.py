@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 class HospitalsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.hospitals'
\ No newline at end of file
+    name = 'apps.hospitals'
+
+    def ready(self):
+        from apps.hospitals import signals  # noqa: F401
@@ -5,18 +5,17 @@ How DRF permissions work:
 - Return True = allow, False = 403 Forbidden
 
 The hospital is identified from the URL kwargs (hospital_id).
+Roles come from the per-request access context — one load per request,
+however many permission classes run.
 """
 
 from rest_framework.permissions import BasePermission
 from apps.hospitals.models import HospitalMembership
+from common.permissions.access_context import get_access_context
 
 
-def get_user_membership(user, hospital_id):
-    return HospitalMembership.objects.filter(
-        user=user,
-        hospital_id=hospital_id,
-        is_active=True,
-    ).first()
+def get_user_role(user, hospital_id) -> str | None:
+    return get_access_context(user).role_in(hospital_id)
 
 
 class IsHospitalAdmin(BasePermission):
@@ -26,8 +25,7 @@ class IsHospitalAdmin(BasePermission):
         hospital_id = view.kwargs.get("hospital_id")
         if not hospital_id:
             return False
-        membership = get_user_membership(request.user, hospital_id)
-        return membership is not None and membership.role == HospitalMembership.Role.HOSPITAL_ADMIN
+        return get_user_role(request.user, hospital_id) == HospitalMembership.Role.HOSPITAL_ADMIN
 
 
 class IsMedicalAdmin(BasePermission):
@@ -37,8 +35,7 @@ class IsMedicalAdmin(BasePermission):
         hospital_id = view.kwargs.get("hospital_id")
         if not hospital_id:
             return False
-        membership = get_user_membership(request.user, hospital_id)
-        return membership is not None and membership.role == HospitalMembership.Role.MEDICAL_ADMIN
+        return get_user_role(request.user, hospital_id) == HospitalMembership.Role.MEDICAL_ADMIN
 
 
 class IsHospitalAdminOrMedicalAdmin(BasePermission):
@@ -48,8 +45,7 @@ class IsHospitalAdminOrMedicalAdmin(BasePermission):
         hospital_id = view.kwargs.get("hospital_id")
         if not hospital_id:
             return False
-        membership = get_user_membership(request.user, hospital_id)
-        return membership is not None and membership.role in [
+        return get_user_role(request.user, hospital_id) in [
             HospitalMembership.Role.HOSPITAL_ADMIN,
             HospitalMembership.Role.MEDICAL_ADMIN,
         ]
@@ -62,5 +58,4 @@ class IsHospitalMember(BasePermission):
         hospital_id = view.kwargs.get("hospital_id")
         if not hospital_id:
             return False
-        membership = get_user_membership(request.user, hospital_id)
-        return membership is not None
\ No newline at end of file
+        return get_user_role(request.user, hospital_id) is not None
\ No newline at end of file
@@ -2,6 +2,7 @@ from django.contrib.auth import get_user_model
 from rest_framework.exceptions import ValidationError, PermissionDenied
 
 from apps.hospitals.models import Hospital, HospitalMembership
+from common.permissions.access_context import clear_access_context
 
 User = get_user_model()
 
@@ -19,6 +20,7 @@ def create_hospital(validated_data: dict, created_by) -> Hospital:
         role=HospitalMembership.Role.HOSPITAL_ADMIN,
         invited_by=created_by,
     )
+    clear_access_context(created_by)
 
     return hospital
 
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.hospitals.models import Hospital, HospitalMembership
+from common.permissions.access_context import invalidate_access_context
+from apps.analytics.services.analytics_cache import invalidate_hospital_analytics
+
+
+@receiver(post_save, sender=HospitalMembership)
+@receiver(post_delete, sender=HospitalMembership)
+def invalidate_user_access_context(sender, instance, **kwargs):
+    """Any change to a hospitalmembership can change what the user is allowed to do."""
+    invalidate_access_context(instance.user_id)
+
+
+@receiver(post_save, sender=Hospital)
+@receiver(post_delete, sender=Hospital)
+@receiver(post_save, sender=HospitalMembership)
+@receiver(post_delete, sender=HospitalMembership)
+def invalidate_staff_analytics(sender, instance, **kwargs):
+    """Hospital status and staff counts are part of the superadmin analytics."""
+    invalidate_hospital_analytics(getattr(instance, "hospital_id", instance.pk))
@@ -0,0 +1,124 @@
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from apps.accounts.models import User
+from apps.dependents.models import Dependent, Guardianship
+from apps.hospitals.models import Hospital, HospitalMembership
+from common.permissions.access_context import get_access_context
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class AccessContextLocMemTests(TestCase):
+    """A per-process cache cannot carry invalidations between workers."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.hospital = Hospital.objects.create(
+            name="General", registration_number="AC-1", email="general@example.com",
+        )
+        cls.nurse = User.objects.create_user(
+            email="nurse@example.com", password="pw", first_name="N", last_name="One",
+        )
+        cls.membership = HospitalMembership.objects.create(
+            user=cls.nurse, hospital=cls.hospital, role=HospitalMembership.Role.NURSE,
+        )
+
+    def _fresh_context(self):
+        # A new user instance, as DRF authenticates on every request
+        return get_access_context(User.objects.get(pk=self.nurse.pk))
+
+    def test_revocation_seen_by_next_request(self):
+        self.assertEqual(self._fresh_context().role_in(self.hospital.pk), HospitalMembership.Role.NURSE)
+
+        # Revoked by another worker: no version bump reaches this process
+        HospitalMembership.objects.filter(pk=self.membership.pk).update(is_active=False)
+
+        self.assertIsNone(self._fresh_context().role_in(self.hospital.pk))
+
+    def test_context_reused_within_a_request(self):
+        user = User.objects.get(pk=self.nurse.pk)
+        with self.assertNumQueries(2):
+            get_access_context(user)
+        with self.assertNumQueries(0):
+            get_access_context(user).has_role(self.hospital.pk, HospitalMembership.Role.NURSE)
+
+
+class AccessContextSharedCacheTests(TestCase):
+    """The cross-request layer, on a backend every worker shares."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cache_dir = tempfile.mkdtemp()
+        cls.enterClassContext(override_settings(CACHES={"default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": cls.cache_dir,
+        }}))
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(cls.cache_dir, ignore_errors=True)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.hospital = Hospital.objects.create(
+            name="General", registration_number="AC-2", email="general@example.com",
+        )
+        cls.dependent = Dependent.objects.create(first_name="Dep", last_name="One")
+        cls.user = User.objects.create_user(
+            email="staff@example.com", password="pw", first_name="S", last_name="One",
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def _request_user(self):
+        # A new user instance, as DRF authenticates on every request
+        return User.objects.get(pk=self.user.pk)
+
+    def test_second_request_reads_the_cache(self):
+        HospitalMembership.objects.create(
+            user=self.user, hospital=self.hospital, role=HospitalMembership.Role.NURSE,
+        )
+        get_access_context(self._request_user())
+
+        user = self._request_user()
+        with self.assertNumQueries(0):
+            ctx = get_access_context(user)
+        self.assertEqual(ctx.role_in(self.hospital.pk), HospitalMembership.Role.NURSE)
+
+    def test_membership_save_and_delete_invalidate(self):
+        membership = HospitalMembership.objects.create(
+            user=self.user, hospital=self.hospital, role=HospitalMembership.Role.NURSE,
+        )
+        self.assertEqual(get_access_context(self._request_user()).role_in(self.hospital.pk), "nurse")
+
+        membership.role = HospitalMembership.Role.HOSPITAL_ADMIN
+        membership.save()
+        self.assertEqual(
+            get_access_context(self._request_user()).role_in(self.hospital.pk),
+            HospitalMembership.Role.HOSPITAL_ADMIN,
+        )
+
+        membership.delete()
+        self.assertIsNone(get_access_context(self._request_user()).role_in(self.hospital.pk))
+
+    def test_guardianship_save_and_delete_invalidate(self):
+        self.assertFalse(get_access_context(self._request_user()).is_guardian_of(self.dependent.pk))
+
+        guardianship = Guardianship.objects.create(user=self.user, dependent=self.dependent)
+        self.assertTrue(get_access_context(self._request_user()).is_guardian_of(self.dependent.pk))
+
+        guardianship.is_active = False
+        guardianship.save()
+        self.assertFalse(get_access_context(self._request_user()).is_guardian_of(self.dependent.pk))
+
+        guardianship.is_active = True
+        guardianship.save()
+        self.assertTrue(get_access_context(self._request_user()).is_guardian_of(self.dependent.pk))
+        guardianship.delete()
+        self.assertFalse(get_access_context(self._request_user()).is_guardian_of(self.dependent.pk))
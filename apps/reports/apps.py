@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 class ReportsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.reports'
\ No newline at end of file
+    name = 'apps.reports'
+
+    def ready(self):
+        from apps.reports import signals  # noqa: F401
@@ -0,0 +1,43 @@
+"""
+Fills HealthObservation from reports approved before the table existed.
+New approvals append their own observations in report_service; this only
+needs to run once after migrating, and is safe to re-run.
+
+    python manage.py backfill_health_observations
+    python manage.py backfill_health_observations --batch-size 200
+"""
+
+from django.core.management.base import BaseCommand
+from django.db.models import Prefetch
+
+from apps.reports.models import HealthObservation, Report, ReportSection
+from apps.reports.services.health_observations import build_observations
+
+
+class Command(BaseCommand):
+    help = "Populate health observations from already approved reports."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Reports per batch.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        qs = Report.objects.filter(status=Report.Status.APPROVED).select_related("visit").prefetch_related(
+            Prefetch("sections", queryset=ReportSection.objects.select_related("field"))
+        ).order_by("id")
+
+        written, last_id = 0, None
+        while True:
+            page = qs if last_id is None else qs.filter(id__gt=last_id)
+            reports = list(page[:batch_size])
+            if not reports:
+                break
+            last_id = reports[-1].id
+
+            observations = []
+            for report in reports:
+                observations.extend(build_observations(report, report.sections.all()))
+            HealthObservation.objects.bulk_create(observations, ignore_conflicts=True)
+            written += len(observations)
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {written} observation(s)."))
@@ -0,0 +1,60 @@
+"""
+Fills the typed ReportSection columns (value_numeric, value_systolic,
+value_diastolic, value_boolean) for sections written before they existed.
+New writes populate them in report_service; this only needs to run once
+after migrating, and is safe to re-run.
+
+    python manage.py backfill_section_values
+    python manage.py backfill_section_values --batch-size 5000
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.reports.models import ReportSection, TemplateField
+from apps.reports.services.template_compiler import typed_columns
+
+
+TYPED_FIELD_TYPES = [
+    TemplateField.FieldType.NUMBER,
+    TemplateField.FieldType.BLOOD_PRESSURE,
+    TemplateField.FieldType.BOOLEAN,
+]
+
+
+class Command(BaseCommand):
+    help = "Populate typed value columns on existing report sections."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        qs = ReportSection.objects.filter(
+            field__field_type__in=TYPED_FIELD_TYPES,
+            value_numeric__isnull=True,
+            value_systolic__isnull=True,
+            value_boolean__isnull=True,
+        ).exclude(value="").select_related("field").order_by("id")
+
+        updated, last_id = 0, None
+        while True:
+            page = qs if last_id is None else qs.filter(id__gt=last_id)
+            batch = list(page[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            changed = []
+            for section in batch:
+                columns = typed_columns(section.field.field_type, section.value)
+                if any(v is not None for v in columns.values()):
+                    for name, value in columns.items():
+                        setattr(section, name, value)
+                    changed.append(section)
+
+            with transaction.atomic():
+                ReportSection.objects.bulk_update(changed, ReportSection.TYPED_VALUE_FIELDS)
+            updated += len(changed)
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled {updated} section(s)."))
@@ -0,0 +1,105 @@
+"""
+Micro-benchmark for report section validation (no database access).
+
+Builds in-memory templates of increasing size, a full valid submission for
+each, and times CompiledTemplate.validate_sections(). Per-field cost should
+stay flat as templates grow — that is the linear-scaling check.
+
+    python manage.py bench_report_validation
+    python manage.py bench_report_validation --sizes 100 1000 5000 --compare
+
+--compare also times the previous ingestion check (list-based duplicate
+detection over stringified ids), which grows quadratically.
+"""
+
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+
+from apps.reports.models import TemplateField
+from apps.reports.services.template_compiler import compile_template
+
+
+FIELD_TYPE_CYCLE = [
+    (TemplateField.FieldType.NUMBER,         "37.5"),
+    (TemplateField.FieldType.BLOOD_PRESSURE, "120/80"),
+    (TemplateField.FieldType.BOOLEAN,        "true"),
+    (TemplateField.FieldType.CHOICE,         "stable"),
+    (TemplateField.FieldType.ATTACHMENT,     "https://files.example/scan.png"),
+    (TemplateField.FieldType.TEXT,           "no remarks"),
+]
+
+
+def _build(size: int) -> tuple:
+    fields, sections = [], []
+    for i in range(size):
+        field_type, value = FIELD_TYPE_CYCLE[i % len(FIELD_TYPE_CYCLE)]
+        field = TemplateField(
+            id=uuid.uuid4(),
+            name=f"field_{i}",
+            label=f"Field {i}",
+            field_type=field_type,
+            choices=["healing", "infected", "stable"],
+            order=i,
+        )
+        fields.append(field)
+        sections.append({"field_id": field.id, "value": value})
+    return fields, sections
+
+
+def _legacy_check(template_fields: dict, sections: list) -> None:
+    """The pre-compiled ingestion check: O(n²) duplicate scan, string keys."""
+    seen_field_ids = []
+    duplicates = []
+    for s in sections:
+        fid = str(s["field_id"])
+        if fid in seen_field_ids:
+            duplicates.append(fid)
+        seen_field_ids.append(fid)
+    input_map = {str(s["field_id"]): s["value"] for s in sections}
+    [fid for fid in input_map if fid not in template_fields]
+    for field_id in template_fields:
+        input_map.get(field_id, "").strip()
+
+
+def _best_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+class Command(BaseCommand):
+    help = "Time report section validation for templates of increasing size."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 1000, 2500, 5000])
+        parser.add_argument("--repeat", type=int, default=5, help="Timing runs per size (best is reported).")
+        parser.add_argument("--compare", action="store_true",
+                            help="Also time the previous list-based ingestion check.")
+
+    def handle(self, *args, **options):
+        header = f"{'fields':>7}  {'validate ms':>11}  {'µs/field':>8}"
+        if options["compare"]:
+            header += f"  {'legacy ms':>10}  {'µs/field':>8}"
+        self.stdout.write(header)
+
+        for size in options["sizes"]:
+            fields, sections = _build(size)
+            compiled = compile_template(uuid.uuid4(), 0, fields)
+
+            values, errors = compiled.validate_sections(sections)
+            assert not errors and len(values) == size, errors
+
+            ms = _best_ms(lambda: compiled.validate_sections(sections), options["repeat"])
+            line = f"{size:>7}  {ms:>11.2f}  {ms * 1000 / size:>8.2f}"
+
+            if options["compare"]:
+                by_str_id = {str(f.id): f for f in fields}
+                legacy = _best_ms(lambda: _legacy_check(by_str_id, sections), options["repeat"])
+                line += f"  {legacy:>10.2f}  {legacy * 1000 / size:>8.2f}"
+
+            self.stdout.write(line)
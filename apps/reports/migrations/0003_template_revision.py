@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-18 15:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reporttemplate',
+            name='revision',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 6.0.2 on 2026-10-18 15:53
+
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def sync_report_version(apps, schema_editor):
+    """Report.version now means "latest allocated ReportVersion number"."""
+    Report = apps.get_model("reports", "Report")
+    ReportVersion = apps.get_model("reports", "ReportVersion")
+    latest = (
+        ReportVersion.objects.filter(report=OuterRef("pk"))
+        .values("report")
+        .annotate(n=Max("version_number"))
+        .values("n")
+    )
+    Report.objects.update(version=Coalesce(Subquery(latest), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0003_template_revision'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportversion',
+            name='is_keyframe',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name='reportversion',
+            name='sections_delta',
+            field=models.JSONField(blank=True, help_text='Changes against the previous version (non-keyframes only).', null=True),
+        ),
+        migrations.AlterField(
+            model_name='report',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='reportversion',
+            name='sections_snapshot',
+            field=models.JSONField(default=list, help_text='Snapshot of all report sections at time of this action (keyframes only).'),
+        ),
+        migrations.RunPython(sync_report_version, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 6.0.2 on 2026-10-18 15:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0004_report_version_deltas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportsection',
+            name='value_boolean',
+            field=models.BooleanField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='reportsection',
+            name='value_diastolic',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='reportsection',
+            name='value_numeric',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='reportsection',
+            name='value_systolic',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='reportsection',
+            index=models.Index(condition=models.Q(('value_numeric__isnull', False)), fields=['field', 'value_numeric'], name='reports_section_numeric_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reportsection',
+            index=models.Index(condition=models.Q(('value_systolic__isnull', False)), fields=['field', 'value_systolic', 'value_diastolic'], name='reports_section_bp_idx'),
+        ),
+    ]
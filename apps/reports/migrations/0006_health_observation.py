@@ -0,0 +1,42 @@
+# Generated by Django 6.0.2 on 2026-10-18 15:58
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dependents', '0001_initial'),
+        ('reports', '0005_section_typed_values'),
+        ('visits', '0004_visit_event'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HealthObservation',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('field_name', models.CharField(max_length=100)),
+                ('field_type', models.CharField(choices=[('text', 'Text'), ('number', 'Number'), ('blood_pressure', 'Blood Pressure'), ('choice', 'Choice'), ('boolean', 'Boolean'), ('attachment', 'Attachment')], max_length=20)),
+                ('observed_at', models.DateTimeField()),
+                ('value', models.TextField(blank=True, default='')),
+                ('value_numeric', models.FloatField(blank=True, null=True)),
+                ('value_systolic', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('value_diastolic', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('value_boolean', models.BooleanField(blank=True, null=True)),
+                ('dependent', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='health_observations', to='dependents.dependent')),
+                ('report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='observations', to='reports.report')),
+                ('visit', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='health_observations', to='visits.visit')),
+            ],
+            options={
+                'db_table': 'reports_health_observation',
+                'ordering': ['observed_at'],
+                'indexes': [models.Index(fields=['dependent', 'field_name', 'observed_at'], include=('value_numeric', 'value_systolic', 'value_diastolic'), name='reports_obs_series_idx')],
+                'unique_together': {('report', 'field_name')},
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 6.0.2 on 2026-10-18 16:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0007_report_review_claim'),
+        ('visits', '0005_visit_updated_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='report',
+            index=models.Index(fields=['updated_at'], name='reports_updated_idx'),
+        ),
+    ]
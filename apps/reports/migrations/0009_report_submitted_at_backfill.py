@@ -0,0 +1,45 @@
+# Generated by Django 6.0.2 on 2026-10-18 16:27
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_submitted_at(apps, schema_editor):
+    """
+    submitted_at was never written before the review queue. Take it from the
+    report's latest SUBMITTED version (what submit_report sets on every
+    submission); reports still awaiting review without one fall back to
+    updated_at, so the queue never sees a NULL.
+    """
+    Report = apps.get_model("reports", "Report")
+    ReportVersion = apps.get_model("reports", "ReportVersion")
+    last_submitted = (
+        ReportVersion.objects.filter(report=OuterRef("pk"), action="submitted")
+        .values("report")
+        .annotate(at=Max("created_at"))
+        .values("at")
+    )
+    pending = Report.objects.filter(submitted_at__isnull=True)
+    pending.filter(status="submitted").update(
+        submitted_at=Coalesce(Subquery(last_submitted), F("updated_at")),
+    )
+    pending.filter(status__in=["approved", "rejected"]).update(submitted_at=Subquery(last_submitted))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0008_report_updated_index'),
+        ('visits', '0005_visit_updated_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_submitted_at, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='report',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('status', 'submitted'), _negated=True), ('submitted_at__isnull', False), _connector='OR'), name='reports_submitted_has_submitted_at'),
+        ),
+    ]
@@ -2,5 +2,6 @@ from .report import Report
 from .report_version import ReportVersion
 from .report_template import ReportTemplate, TemplateField
 from .report_section import ReportSection
+from .health_observation import HealthObservation
 
-__all__ = ["Report", "ReportVersion", "ReportTemplate", "TemplateField", "ReportSection"]
\ No newline at end of file
+__all__ = ["Report", "ReportVersion", "ReportTemplate", "TemplateField", "ReportSection", "HealthObservation"]
\ No newline at end of file
@@ -0,0 +1,57 @@
+"""
+Fact table of approved report values, one row per (report, field).
+- Appended when a report is approved (reports.services.health_observations);
+  history is filled by the backfill_health_observations command.
+- Keyed for trend reads: (dependent, field_name, observed_at) — a dependent's
+  series for one field is a single index range scan, already in time order,
+  and can be bucketed by day/week/month in SQL.
+- field_name is the canonical field key (see canonical_field_name), so series
+  survive template changes that keep the same name.
+- Values are copied from ReportSection, including the typed columns, so trend
+  reads never join sections, reports or visits.
+"""
+
+from django.db import models
+from common.models import UUIDModel
+from apps.dependents.models import Dependent
+from apps.visits.models import Visit
+from apps.reports.models.report import Report
+from apps.reports.models.report_template import TemplateField
+
+
+class HealthObservation(UUIDModel):
+
+    dependent = models.ForeignKey(Dependent, on_delete=models.CASCADE, related_name="health_observations",)
+
+    field_name = models.CharField(max_length=100)
+    field_type = models.CharField(max_length=20, choices=TemplateField.FieldType.choices)
+
+    observed_at = models.DateTimeField()
+
+    report = models.ForeignKey(Report, on_delete=models.CASCADE, related_name="observations",)
+    visit  = models.ForeignKey(Visit, on_delete=models.CASCADE, related_name="health_observations",)
+
+    value = models.TextField(blank=True, default="")
+
+    value_numeric   = models.FloatField(null=True, blank=True)
+    value_systolic  = models.PositiveSmallIntegerField(null=True, blank=True)
+    value_diastolic = models.PositiveSmallIntegerField(null=True, blank=True)
+    value_boolean   = models.BooleanField(null=True, blank=True)
+
+    TYPED_VALUE_FIELDS = ["value_numeric", "value_systolic", "value_diastolic", "value_boolean"]
+
+    class Meta:
+        db_table = "reports_health_observation"
+        ordering = ["observed_at"]
+        unique_together = [("report", "field_name")]
+        indexes = [
+            # Trend reads; covering on PostgreSQL so numeric series are index-only scans.
+            models.Index(
+                fields=["dependent", "field_name", "observed_at"],
+                name="reports_obs_series_idx",
+                include=["value_numeric", "value_systolic", "value_diastolic"],
+            ),
+        ]
+
+    def __str__(self):
+        return f"HealthObservation({self.dependent_id}: {self.field_name} @ {self.observed_at})"
@@ -7,6 +7,39 @@ from django.db import models
 from django.conf import settings
 from common.models import UUIDModel
 from apps.visits.models import Visit
+from apps.hospitals.models import HospitalMembership
+from apps.dependents.models import Guardianship
+
+
+class ReportQuerySet(models.QuerySet):
+
+    def accessible_to(self, user):
+        """
+        Reports the user may read, filtered in SQL — one correlated EXISTS per
+        scope, no joins fanning out over memberships, no DISTINCT:
+        - the report's nurse
+        - hospital admin / medical admin of the visit's hospital
+        - active guardian of the visit's dependent
+        """
+        admin_of_hospital = HospitalMembership.objects.filter(
+            user=user,
+            is_active=True,
+            role__in=[
+                HospitalMembership.Role.HOSPITAL_ADMIN,
+                HospitalMembership.Role.MEDICAL_ADMIN,
+            ],
+            hospital_id=models.OuterRef("visit__hospital_id"),
+        )
+        guardian_of_dependent = Guardianship.objects.filter(
+            user=user,
+            is_active=True,
+            dependent_id=models.OuterRef("visit__dependent_id"),
+        )
+        return self.filter(
+            models.Q(nurse=user)
+            | models.Exists(admin_of_hospital)
+            | models.Exists(guardian_of_dependent)
+        )
 
 
 class Report(UUIDModel):
@@ -45,11 +78,41 @@ class Report(UUIDModel):
     )
     reviewed_at = models.DateTimeField(null=True, blank=True)
     review_notes = models.TextField(blank=True, default="")
-    version = models.PositiveIntegerField(default=1)
+    # Latest allocated ReportVersion number (0 = no snapshot yet).
+    version = models.PositiveIntegerField(default=0)
+
+    # Review queue lease (reports.services.review_queue). A claim is only
+    # binding until lease_expires_at; expired claims can be taken over.
+    claimed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True, blank=True,
+        related_name="claimed_reports",
+    )
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+
+    objects = ReportQuerySet.as_manager()
 
     class Meta:
         db_table = "reports_report"
         ordering = ["-created_at"]
+        indexes = [
+            # Review queue: only reports awaiting review, oldest submission first.
+            models.Index(
+                fields=["submitted_at", "id"],
+                name="reports_review_queue_idx",
+                condition=models.Q(status="submitted"),
+            ),
+            # Analytics rollup refresh: reports changed since the last watermark.
+            models.Index(fields=["updated_at"], name="reports_updated_idx"),
+        ]
+        constraints = [
+            # The review queue orders and pages on submitted_at.
+            models.CheckConstraint(
+                condition=~models.Q(status="submitted") | models.Q(submitted_at__isnull=False),
+                name="reports_submitted_has_submitted_at",
+            ),
+        ]
 
     def __str__(self):
         return f"Report(Visit={self.visit_id}, v{self.version}, {self.status})"
@@ -1,6 +1,14 @@
 """
 One filled-in field per report. Value always stored as text,
 interpreted by field.field_type.
+
+Typed shadow columns are filled from the same value at write time
+(reports.services.template_compiler.typed_columns) so vitals can be
+aggregated in SQL:
+- NUMBER          → value_numeric
+- BLOOD_PRESSURE  → value_systolic / value_diastolic
+- BOOLEAN         → value_boolean
+All are NULL for other field types and for blank values.
 """
 
 from django.db import models
@@ -19,6 +27,13 @@ class ReportSection(UUIDModel):
     )
     value = models.TextField(blank=True, default="")
 
+    value_numeric   = models.FloatField(null=True, blank=True)
+    value_systolic  = models.PositiveSmallIntegerField(null=True, blank=True)
+    value_diastolic = models.PositiveSmallIntegerField(null=True, blank=True)
+    value_boolean   = models.BooleanField(null=True, blank=True)
+
+    TYPED_VALUE_FIELDS = ["value_numeric", "value_systolic", "value_diastolic", "value_boolean"]
+
     class Meta:
         db_table = "reports_section"
         unique_together = [("report", "field")]
@@ -26,6 +41,16 @@ class ReportSection(UUIDModel):
             models.Index(fields=["field"]),
             # Analytics will query sections by field to aggregate values
             # e.g. "all temperature readings for this patient"
+            models.Index(
+                fields=["field", "value_numeric"],
+                name="reports_section_numeric_idx",
+                condition=models.Q(value_numeric__isnull=False),
+            ),
+            models.Index(
+                fields=["field", "value_systolic", "value_diastolic"],
+                name="reports_section_bp_idx",
+                condition=models.Q(value_systolic__isnull=False),
+            ),
         ]
 
     def __str__(self):
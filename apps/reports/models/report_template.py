@@ -14,6 +14,8 @@ class ReportTemplate(UUIDModel):
         default="",
         help_text="Instructions for the nurse filling this report.",
     )
+    # Bumped on every field change — part of the compiled-template cache key.
+    revision = models.PositiveIntegerField(default=0)
 
     class Meta:
         db_table = "reports_template"
@@ -21,6 +23,9 @@ class ReportTemplate(UUIDModel):
     def __str__(self):
         return f"Template for {self.visit_type.name}"
 
+    def bump_revision(self):
+        ReportTemplate.objects.filter(pk=self.pk).update(revision=models.F("revision") + 1)
+
 
 class TemplateField(UUIDModel):
 
@@ -1,6 +1,9 @@
 """
 Immutable snapshot of a report at each key action.
 Sections stored as JSON so history is self-contained.
+Keyframes hold the full sections list; the versions between keyframes hold
+only a delta against the previous version (see reports.services.report_versions,
+which is also the reader that reconstructs any version).
 """
 
 from django.db import models
@@ -19,9 +22,15 @@ class ReportVersion(UUIDModel):
     report = models.ForeignKey(Report, on_delete=models.PROTECT, related_name="versions")
     version_number = models.PositiveIntegerField()
 
+    is_keyframe = models.BooleanField(default=True)
     sections_snapshot = models.JSONField(
         default=list,
-        help_text="Snapshot of all report sections at time of this action.",
+        help_text="Snapshot of all report sections at time of this action (keyframes only).",
+    )
+    sections_delta = models.JSONField(
+        null=True,
+        blank=True,
+        help_text="Changes against the previous version (non-keyframes only).",
     )
 
     action = models.CharField(max_length=20, choices=Action.choices)
@@ -10,7 +10,7 @@ Rules:
 
 from rest_framework.permissions import BasePermission
 from apps.hospitals.models import HospitalMembership
-from apps.visits.models import VisitAssignment
+from common.permissions.access_context import get_access_context
 
 
 class IsReportNurse(BasePermission):
@@ -33,9 +33,6 @@ class IsMedicalAdminOfHospital(BasePermission):
     message = "Only a medical admin of this hospital can review reports."
 
     def has_object_permission(self, request, view, obj):
-        return HospitalMembership.objects.filter(
-            user=request.user,
-            hospital=obj.visit.hospital,
-            role=HospitalMembership.Role.MEDICAL_ADMIN,
-            is_active=True,
-        ).exists()
\ No newline at end of file
+        return get_access_context(request.user).has_role(
+            obj.visit.hospital_id, HospitalMembership.Role.MEDICAL_ADMIN,
+        )
\ No newline at end of file
@@ -1,5 +1,8 @@
 from rest_framework import serializers
+from drf_spectacular.utils import extend_schema_field
+from common.mixins.sparse_fieldsets import SparseFieldsetsMixin
 from apps.reports.models import Report, ReportVersion, ReportTemplate, TemplateField, ReportSection
+from apps.reports.services import report_versions, review_queue
 
 
 class TemplateFieldSerializer(serializers.ModelSerializer):
@@ -61,31 +64,68 @@ class ReportSectionInputSerializer(serializers.Serializer):
     value = serializers.CharField(allow_blank=True)
  
  
+class ReportVersionListSerializer(serializers.ListSerializer):
+    """
+    Used automatically for ReportVersionSerializer(many=True).
+    Reconstructs every version's full sections from keyframes + deltas in one pass.
+    """
+
+    def to_representation(self, data):
+        versions = report_versions.attach_sections(data.all() if hasattr(data, "all") else data)
+        return super().to_representation(versions)
+
+
 class ReportVersionSerializer(serializers.ModelSerializer):
     triggered_by_email = serializers.EmailField(source="triggered_by.email", read_only=True)
+    sections_snapshot = serializers.SerializerMethodField()
  
     class Meta:
         model = ReportVersion
+        list_serializer_class = ReportVersionListSerializer
         fields = [
             "id", "version_number", "sections_snapshot",
             "action", "triggered_by", "triggered_by_email",
             "notes", "created_at",
         ]
         read_only_fields = fields
+
+    def get_sections_snapshot(self, obj) -> list:
+        if not hasattr(obj, "sections"):
+            return report_versions.get_version_sections(obj.report_id, obj.version_number)
+        return obj.sections
  
  
-class ReportSerializer(serializers.ModelSerializer):
+class ReportListSerializer(serializers.ListSerializer):
+    """
+    Used automatically for ReportSerializer(many=True).
+    Reconstructs the embedded versions of every report in the list together,
+    so completing chains that start before a keyframe costs one query in total.
+    """
+
+    def to_representation(self, data):
+        reports = list(data.all() if hasattr(data, "all") else data)
+        selected = self.context.get("sparse_fields")
+        if selected is None or "versions" in selected:
+            report_versions.attach_sections(
+                version for report in reports for version in report_versions.recent_versions(report)
+            )
+        return super().to_representation(reports)
+
+
+class ReportSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     nurse_email = serializers.EmailField(source="nurse.email", read_only=True)
     nurse_name = serializers.CharField(source="nurse.full_name", read_only=True)
     reviewed_by_email = serializers.EmailField(
         source="reviewed_by.email", read_only=True, default=None,
     )
     sections = ReportSectionSerializer(many=True, read_only=True)
-    versions = ReportVersionSerializer(many=True, read_only=True)
+    # Latest REPORT_VERSIONS_PREFETCH_LIMIT versions; full history is paged at /versions/
+    versions = serializers.SerializerMethodField()
     is_locked = serializers.BooleanField(read_only=True)
  
     class Meta:
         model = Report
+        list_serializer_class = ReportListSerializer
         fields = [
             "id", "visit",
             "nurse", "nurse_email", "nurse_name",
@@ -95,15 +135,24 @@ class ReportSerializer(serializers.ModelSerializer):
             "reviewed_by", "reviewed_by_email",
             "reviewed_at", "review_notes",
             "version", "versions",
+            "claimed_by", "lease_expires_at",
             "created_at", "updated_at",
         ]
+        # Left out of list responses unless requested with ?expand= / ?fields=
+        expandable_fields = ["sections", "versions"]
         read_only_fields = [
             "id", "nurse", "status", "is_locked", "submitted_at",
             "reviewed_by", "reviewed_at", "review_notes",
-            "version", "versions", "created_at", "updated_at",
+            "version", "versions", "claimed_by", "lease_expires_at",
+            "created_at", "updated_at",
         ]
  
  
+    @extend_schema_field(ReportVersionSerializer(many=True))
+    def get_versions(self, obj) -> list:
+        return ReportVersionSerializer(report_versions.recent_versions(obj), many=True).data
+ 
+ 
 class CreateReportSerializer(serializers.Serializer):
     visit = serializers.UUIDField()
     sections = ReportSectionInputSerializer(many=True)
@@ -122,4 +171,8 @@ class ReviewReportSerializer(serializers.Serializer):
             raise serializers.ValidationError(
                 {"review_notes": "Review notes are required when rejecting a report."}
             )
-        return attrs        
\ No newline at end of file
+        return attrs
+
+
+class ClaimReportsSerializer(serializers.Serializer):
+    count = serializers.IntegerField(min_value=1, max_value=review_queue.MAX_CLAIM_COUNT, default=1)
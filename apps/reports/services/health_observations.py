@@ -0,0 +1,44 @@
+"""
+HealthObservation writes.
+
+record_observations() appends one observation per non-empty section of an
+approved report; it is idempotent (unique on report + field_name), so the
+backfill command and a repeated approval never duplicate rows.
+"""
+
+from apps.reports.models import HealthObservation, Report, ReportSection
+
+
+def canonical_field_name(name: str) -> str:
+    """
+    Key observations are stored and looked up under.
+    TODO (AI integration): map synonyms ("temp", "body_temp" → "temperature").
+    """
+    return name.strip().lower()
+
+
+def build_observations(report: Report, sections) -> list:
+    """Unsaved HealthObservations for `sections` (with `field` loaded) of an approved report."""
+    visit = report.visit
+    return [
+        HealthObservation(
+            dependent_id=visit.dependent_id,
+            field_name=canonical_field_name(section.field.name),
+            field_type=section.field.field_type,
+            # TODO (scheduled_at): observe at scheduled_at, as the trend reads do
+            observed_at=visit.created_at,
+            report_id=report.id,
+            visit_id=visit.id,
+            value=section.value,
+            **{name: getattr(section, name) for name in ReportSection.TYPED_VALUE_FIELDS},
+        )
+        for section in sections
+        if section.value.strip()
+    ]
+
+
+def record_observations(report: Report) -> int:
+    sections = report.sections.select_related("field")
+    observations = build_observations(report, sections)
+    HealthObservation.objects.bulk_create(observations, ignore_conflicts=True)
+    return len(observations)
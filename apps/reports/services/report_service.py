@@ -1,87 +1,29 @@
-import re
+from django.db import transaction
 from django.utils import timezone
 from rest_framework.exceptions import ValidationError, PermissionDenied
 
-from apps.reports.models import Report, ReportSection, ReportTemplate, ReportVersion, TemplateField
-from apps.visits.models import Visit, VisitAssignment
+from apps.reports.models import Report, ReportSection, ReportTemplate, ReportVersion
+from apps.visits.models import Visit
 from apps.visits.services.visit_service import mark_report_submitted
-
-
-def _build_sections_snapshot(report: Report) -> list:
-    return [
-        {
-            "field_id": str(section.field_id),
-            "field_name": section.field.name,
-            "label": section.field.label,
-            "field_type": section.field.field_type,
-            "value": section.value,
-            # "required" : ...
-        }
-        for section in report.sections.select_related("field").all()
-    ]
+from apps.reports.services.template_compiler import get_compiled_template, typed_columns
+from apps.reports.services import report_versions, review_queue
+from apps.reports.services.health_observations import record_observations
+from apps.analytics.services.analytics_cache import invalidate_hospital_analytics
 
 
 def _snapshot_version(report: Report, action: str, triggered_by, notes: str = "") -> ReportVersion:
-    latest = (
-        ReportVersion.objects
-        .filter(report=report)
-        .order_by("-version_number")
-        .first()
-    )
-
-    next_version = 1 if not latest else latest.version_number + 1
-
-    return ReportVersion.objects.create(
-        report=report,
-        version_number=next_version,
-        sections_snapshot=_build_sections_snapshot(report),
-        action=action,
-        triggered_by=triggered_by,
-        notes=notes,
-    )
-
-
-def _validate_field_value(field, value: str):
-    """
-    Validates a value against its field type.
-    Returns error message string if invalid, None if valid.
-    """
-    ft = TemplateField.FieldType
-
-    if field.field_type == ft.NUMBER:
-        try:
-            float(value)
-        except ValueError:
-            return f"{field.label} must be a number."
-
-    elif field.field_type == ft.BOOLEAN:
-        if value.lower() not in ["true", "false"]:
-            return f"{field.label} must be 'true' or 'false'."
-
-    elif field.field_type == ft.BLOOD_PRESSURE:
-        if not re.match(r"^\d{2,3}/\d{2,3}$", value):
-            return f"{field.label} must be in the format 120/80."
-
-    elif field.field_type == ft.CHOICE:
-        options = field.choices if isinstance(field.choices, list) else []
-        if value not in options:
-            return f"{field.label} must be one of: {', '.join(options)}."
-
-    elif field.field_type == ft.ATTACHMENT:
-        if not re.match(r"^https?://[^\s]+$", value):
-            return f"{field.label} must be a valid URL (upload the file first)."
-
-    return None
+    return report_versions.write_version(report, action, triggered_by=triggered_by, notes=notes)
 
 
 def _validate_and_save_sections(report: Report, sections_input: list) -> None:
     """
-    Validates section input against the visit type's template.
-    Checks:
+    Validates section input against the visit type's template in a single
+    pass (CompiledTemplate.validate_sections). Checks, all reported together:
       - No duplicate, unknown field IDs sent by client 
       - All required fields are present and non-empty
       - All values match their field type
-    Then creates/updates ReportSection rows.
+    Then writes all sections in one atomic upsert — the query count per
+    save does not grow with the template size.
     """
     try:
         template = report.visit.visit_type.report_template
@@ -91,62 +33,40 @@ def _validate_and_save_sections(report: Report, sections_input: list) -> None:
             "Ask the hospital admin to set one up first."
         )
 
-    template_fields = {str(f.id): f for f in template.fields.all()}
-
-    # Detect duplicate field IDs in input before building the map
-    seen_field_ids = []
-    duplicates = []
-    for s in sections_input:
-        fid = str(s["field_id"])
-        if fid in seen_field_ids:
-            duplicates.append(fid)
-        seen_field_ids.append(fid)
-
-    if duplicates:
-        raise ValidationError(
-            {"sections": f"Duplicate field IDs submitted: {', '.join(set(duplicates))}."}
-        )
-
-    input_map = {str(s["field_id"]): s["value"] for s in sections_input}
-
-    # Reject unknown field IDs
-    unknown = [fid for fid in input_map if fid not in template_fields]
-    if unknown:
-        raise ValidationError(
-            {"sections": f"Unknown field IDs not in this template: {', '.join(unknown)}."}
-        )
-
-    # Validate required fields and type correctness
-    errors = {}
-    for field_id, field in template_fields.items():
-        value = input_map.get(field_id, "").strip()
-
-        if field.required and not value:
-            errors[field.name] = f"{field.label} is required."
-            continue
-
-        if value:
-            type_error = _validate_field_value(field, value)
-            if type_error:
-                errors[field.name] = type_error
-
+    compiled = get_compiled_template(template)
+    values, errors = compiled.validate_sections(sections_input)
     if errors:
         raise ValidationError(errors)
 
-    # Save sections
-    for field_id, field in template_fields.items():
-        value = input_map.get(field_id, "")
-        ReportSection.objects.update_or_create(
+    # Save sections: only rows that are new or whose value changed are written
+    existing_values = dict(
+        ReportSection.objects.filter(report=report).values_list("field_id", "value")
+    )
+    changed = [
+        ReportSection(
             report=report,
-            field=field,
-            defaults={"value": value},
-        )    
+            field_id=field.id,
+            value=values.get(field.id, ""),
+            **typed_columns(field.field_type, values.get(field.id, "")),
+        )
+        for field in compiled.fields
+        if existing_values.get(field.id) != values.get(field.id, "")
+    ]
+
+    with transaction.atomic():
+        ReportSection.objects.bulk_create(
+            changed,
+            update_conflicts=True,
+            unique_fields=["report", "field"],
+            update_fields=["value", *ReportSection.TYPED_VALUE_FIELDS, "updated_at"],
+        )
 
 
+@transaction.atomic
 def create_report(visit_id: str, sections_input: list, nurse) -> Report:
     try:
         visit = Visit.objects.select_related(
-            "visit_type__report_template"
+            "visit_type__report_template", "current_assignment",
         ).get(id=visit_id)
     except Visit.DoesNotExist:
         raise ValidationError("Visit not found.")
@@ -154,12 +74,7 @@ def create_report(visit_id: str, sections_input: list, nurse) -> Report:
     if visit.status not in [Visit.Status.COMPLETED, Visit.Status.REPORT_SUBMITTED]:
         raise ValidationError("Reports can only be created for completed visits.")
 
-    is_assigned = VisitAssignment.objects.filter(
-        visit=visit,
-        nurse=nurse,
-        status=VisitAssignment.AssignmentStatus.ACCEPTED,
-    ).exists()
-    if not is_assigned:
+    if not visit.is_accepted_nurse(nurse):
         raise PermissionDenied("You are not the accepted nurse for this visit.")
 
     report = Report.objects.create(
@@ -169,9 +84,11 @@ def create_report(visit_id: str, sections_input: list, nurse) -> Report:
     )
 
     _validate_and_save_sections(report, sections_input)
+    invalidate_hospital_analytics(visit.hospital_id)
     return report        
 
 
+@transaction.atomic
 def update_report(report: Report, sections_input: list) -> Report:
     if report.is_locked:
         raise ValidationError("This report has been approved and cannot be edited.")
@@ -183,14 +100,17 @@ def update_report(report: Report, sections_input: list) -> Report:
     return report
 
 
+@transaction.atomic
 def submit_report(report: Report, nurse) -> Report:
     if report.status != Report.Status.DRAFT:
         raise ValidationError("Only draft reports can be submitted.")
 
     report.status = Report.Status.SUBMITTED
-    report.save(update_fields=["status", "updated_at"])
+    report.submitted_at = timezone.now()
+    report.save(update_fields=["status", "submitted_at", "updated_at"])
 
     _snapshot_version(report, ReportVersion.Action.SUBMITTED, triggered_by=nurse)
+    invalidate_hospital_analytics(report.visit.hospital_id)
 
     if report.visit.status == Visit.Status.COMPLETED:  # future: is the condition even needed
         mark_report_submitted(report.visit, nurse)
@@ -201,31 +121,40 @@ def submit_report(report: Report, nurse) -> Report:
 def delete_report(report: Report) -> None:
     if report.status != Report.Status.DRAFT:
         raise ValidationError("Only draft reports can be deleted.")
+    hospital_id = report.visit.hospital_id
     report.delete()
+    invalidate_hospital_analytics(hospital_id)
 
 
+@transaction.atomic
 def approve_report(report: Report, medical_admin, review_notes: str = "") -> Report:
     if report.status != Report.Status.SUBMITTED:
         raise ValidationError("Only submitted reports can be approved.")
+    review_queue.take_claim_for_review(report, medical_admin)
 
     report.status = Report.Status.APPROVED
     report.reviewed_by = medical_admin
     report.reviewed_at = timezone.now()
     report.review_notes = review_notes
     report.save(update_fields=[
-        "status", "reviewed_by", "reviewed_at", "review_notes", "updated_at"
+        "status", "reviewed_by", "reviewed_at", "review_notes",
+        "claimed_by", "lease_expires_at", "updated_at",
     ])
  
     _snapshot_version(
         report, ReportVersion.Action.APPROVED,
         triggered_by=medical_admin, notes=review_notes,
     )
+    record_observations(report)
+    invalidate_hospital_analytics(report.visit.hospital_id)
     return report
      
 
+@transaction.atomic
 def reject_report(report: Report, medical_admin, review_notes: str) -> Report:
     if report.status != Report.Status.SUBMITTED:
         raise ValidationError("Only submitted reports can be rejected.")
+    review_queue.take_claim_for_review(report, medical_admin)
  
     _snapshot_version(
         report, ReportVersion.Action.REJECTED,
@@ -238,6 +167,7 @@ def reject_report(report: Report, medical_admin, review_notes: str) -> Report:
     report.review_notes = review_notes
     report.save(update_fields=[
         "status", "reviewed_by", "reviewed_at",
-        "review_notes", "version", "updated_at",
+        "review_notes", "version", "claimed_by", "lease_expires_at", "updated_at",
     ])
+    invalidate_hospital_analytics(report.visit.hospital_id)
     return report     
\ No newline at end of file
@@ -0,0 +1,207 @@
+"""
+Report version history, stored incrementally.
+
+Every Nth version (REPORT_VERSION_KEYFRAME_INTERVAL, default 10) is a
+keyframe holding the full sections snapshot; the versions in between store
+only a delta against the version before them:
+
+    {"set": [<section entry>, ...],   # added or changed, keyed by field_id
+     "removed": ["<field_id>", ...]}
+
+Reconstructing any version reads its nearest keyframe plus at most N-1
+deltas, in one query. Rows written before delta encoding are all keyframes.
+
+Version numbers come from Report.version (the latest allocated number),
+incremented with a conditional UPDATE — the report row stays locked until
+the surrounding transaction ends, so concurrent snapshots of the same
+report get distinct, gap-free numbers without a max() query.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Max, Prefetch, Q
+
+from apps.reports.models import Report, ReportVersion
+
+
+def keyframe_interval() -> int:
+    return max(1, getattr(settings, "REPORT_VERSION_KEYFRAME_INTERVAL", 10))
+
+
+def build_sections_snapshot(report: Report) -> list:
+    return [
+        {
+            "field_id": str(section.field_id),
+            "field_name": section.field.name,
+            "label": section.field.label,
+            "field_type": section.field.field_type,
+            "value": section.value,
+            # "required" : ...
+        }
+        for section in report.sections.select_related("field").order_by("field__order")
+    ]
+
+
+def diff_sections(previous: list, current: list) -> dict:
+    before = {entry["field_id"]: entry for entry in previous}
+    now    = {entry["field_id"]: entry for entry in current}
+    return {
+        "set": [entry for field_id, entry in now.items() if before.get(field_id) != entry],
+        "removed": [field_id for field_id in before if field_id not in now],
+    }
+
+
+def apply_delta(sections: list, delta: dict) -> list:
+    by_field = {entry["field_id"]: entry for entry in sections}
+    for field_id in delta.get("removed", []):
+        by_field.pop(field_id, None)
+    for entry in delta.get("set", []):
+        by_field[entry["field_id"]] = entry
+    return list(by_field.values())
+
+
+def _replay(chain) -> dict:
+    """{version_number: sections} for a chain of versions starting at a keyframe."""
+    sections, result = None, {}
+    for version in chain:
+        if version.is_keyframe:
+            sections = version.sections_snapshot
+        else:
+            sections = apply_delta(sections, version.sections_delta)
+        result[version.version_number] = sections
+    return result
+
+
+def _last_keyframe(report_id, version_number: int):
+    """Subquery: number of the report's nearest keyframe at/below `version_number`."""
+    return (
+        ReportVersion.objects
+        .filter(report_id=report_id, version_number__lte=version_number, is_keyframe=True)
+        .values("report_id")
+        .annotate(n=Max("version_number"))
+        .values("n")
+    )
+
+
+def _chain_to(report_id, version_number: int):
+    """Versions from the nearest keyframe at/below `version_number` up to it — one query."""
+    return ReportVersion.objects.filter(
+        report_id=report_id,
+        version_number__gte=_last_keyframe(report_id, version_number),
+        version_number__lte=version_number,
+    ).order_by("version_number")
+
+
+def _chain_prefixes(first_versions: dict) -> dict:
+    """
+    {report_id: [versions]} from each report's nearest keyframe up to (not
+    including) the given version number — every report in one query.
+    """
+    q = Q()
+    for report_id, version_number in first_versions.items():
+        q |= Q(
+            report_id=report_id,
+            version_number__gte=_last_keyframe(report_id, version_number),
+            version_number__lt=version_number,
+        )
+    prefixes = {report_id: [] for report_id in first_versions}
+    if first_versions:
+        for version in ReportVersion.objects.filter(q).order_by("report_id", "version_number"):
+            prefixes[version.report_id].append(version)
+    return prefixes
+
+
+def get_version_sections(report, version_number: int) -> list:
+    """
+    Full sections snapshot of one version (`report` is a Report or its id).
+    Raises ReportVersion.DoesNotExist.
+    """
+    report_id = getattr(report, "pk", report)
+    sections = _replay(_chain_to(report_id, version_number)).get(version_number)
+    if sections is None:
+        raise ReportVersion.DoesNotExist(f"Report {report_id} has no version {version_number}.")
+    return sections
+
+
+def attach_sections(versions) -> list:
+    """
+    Sets `.sections` (the reconstructed full snapshot) on each version and
+    returns them ordered by (report, version_number). Versions whose chain
+    starts before the first given one are completed with one query for all
+    reports. Versions that already have `.sections` are left as they are.
+    """
+    versions = sorted(versions, key=lambda v: (str(v.report_id), v.version_number))
+    by_report = {}
+    for version in versions:
+        if not hasattr(version, "sections"):
+            by_report.setdefault(version.report_id, []).append(version)
+
+    prefixes = _chain_prefixes({
+        report_id: chain[0].version_number
+        for report_id, chain in by_report.items()
+        if not chain[0].is_keyframe
+    })
+    for report_id, chain in by_report.items():
+        replayed = _replay(prefixes.get(report_id, []) + chain)
+        for version in chain:
+            version.sections = replayed[version.version_number]
+    return versions
+
+
+def versions_prefetch_limit() -> int:
+    return max(1, getattr(settings, "REPORT_VERSIONS_PREFETCH_LIMIT", 10))
+
+
+def recent_versions_prefetch() -> Prefetch:
+    """
+    Prefetch of each report's latest REPORT_VERSIONS_PREFETCH_LIMIT versions
+    into `report.recent_versions` (one windowed query for the whole list).
+    """
+    return Prefetch(
+        "versions",
+        queryset=ReportVersion.objects.select_related("triggered_by")
+        .order_by("-version_number")[:versions_prefetch_limit()],
+        to_attr="recent_versions",
+    )
+
+
+def recent_versions(report: Report) -> list:
+    """The report's latest versions — prefetched if available, else one query."""
+    versions = getattr(report, "recent_versions", None)
+    if versions is None:
+        versions = list(
+            report.versions.select_related("triggered_by")
+            .order_by("-version_number")[:versions_prefetch_limit()]
+        )
+    return versions
+
+
+def allocate_version_number(report: Report) -> int:
+    """Atomically takes the next version number for `report` (call inside a transaction)."""
+    Report.objects.filter(pk=report.pk).update(version=F("version") + 1)
+    report.version = Report.objects.values_list("version", flat=True).get(pk=report.pk)
+    return report.version
+
+
+@transaction.atomic
+def write_version(report: Report, action: str, triggered_by, notes: str = "") -> ReportVersion:
+    version_number = allocate_version_number(report)
+    current = build_sections_snapshot(report)
+
+    is_keyframe = version_number == 1 or (version_number - 1) % keyframe_interval() == 0
+    if not is_keyframe:
+        try:
+            previous = get_version_sections(report, version_number - 1)
+        except ReportVersion.DoesNotExist:
+            is_keyframe = True   # history gap — start a new chain
+
+    return ReportVersion.objects.create(
+        report=report,
+        version_number=version_number,
+        is_keyframe=is_keyframe,
+        sections_snapshot=current if is_keyframe else [],
+        sections_delta=None if is_keyframe else diff_sections(previous, current),
+        action=action,
+        triggered_by=triggered_by,
+        notes=notes,
+    )
@@ -0,0 +1,174 @@
+"""
+Medical admin review queue: a hospital's SUBMITTED reports, oldest
+submission first.
+
+Reading — get_queue_page() is keyset-paginated on (submitted_at, id), served
+by the partial index reports_review_queue_idx (status = 'submitted'), which
+only ever holds the reports still waiting for review. submitted_at is never
+NULL there (constraint reports_submitted_has_submitted_at; reports submitted
+before it existed were backfilled by migration reports.0009).
+
+Claiming — reviewers pull work with claim_next(): the next unclaimed (or
+lease-expired) reports are locked with SELECT ... FOR UPDATE SKIP LOCKED and
+stamped with claimed_by / lease_expires_at in the same transaction. Two
+reviewers claiming at once each skip the rows the other is locking, so
+they never receive the same report and never wait on each other.
+A claim is a lease (REPORT_REVIEW_LEASE_MINUTES): if the reviewer goes
+away, the report becomes claimable again once it expires.
+
+Approving or rejecting a report (report_service) takes the claim via
+take_claim_for_review() and clears it in the same save.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from apps.reports.models import Report
+from common.pagination import encode_cursor, decode_cursor
+
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+MAX_CLAIM_COUNT = 20
+
+QUEUE_ORDERING = ["submitted_at", "id"]
+
+
+class ClaimConflict(APIException):
+    """The report is claimed by another reviewer whose lease has not expired."""
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "This report is being reviewed by someone else."
+    default_code = "claim_conflict"
+
+
+def lease_duration() -> timedelta:
+    return timedelta(minutes=getattr(settings, "REPORT_REVIEW_LEASE_MINUTES", 15))
+
+
+def _queue(hospital_id, queryset=None):
+    qs = Report.objects.all() if queryset is None else queryset
+    return qs.filter(status=Report.Status.SUBMITTED, visit__hospital_id=hospital_id)
+
+
+def _unclaimed(now) -> Q:
+    return Q(claimed_by__isnull=True) | Q(lease_expires_at__lte=now)
+
+
+def _is_held_by_other(claimed_by_id, lease_expires_at, reviewer, now) -> bool:
+    return (
+        claimed_by_id is not None
+        and claimed_by_id != reviewer.id
+        and lease_expires_at is not None
+        and lease_expires_at > now
+    )
+
+
+def get_queue_page(
+    hospital_id, cursor: str | None = None, page_size: int = DEFAULT_PAGE_SIZE,
+    unclaimed_only: bool = False, queryset=None,
+) -> tuple:
+    """
+    Returns (reports, next_cursor) for one page of the hospital's queue.
+    queryset: base Report queryset to load from (select/prefetch as needed).
+    """
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+
+    qs = _queue(hospital_id, queryset)
+    if unclaimed_only:
+        qs = qs.filter(_unclaimed(timezone.now()))
+    if cursor:
+        submitted_at, report_id = decode_cursor(cursor)
+        qs = qs.filter(
+            Q(submitted_at__gt=submitted_at) |
+            Q(submitted_at=submitted_at, id__gt=report_id)
+        )
+
+    reports = list(qs.order_by(*QUEUE_ORDERING)[:page_size + 1])
+    next_cursor = None
+    if len(reports) > page_size:
+        reports = reports[:page_size]
+        next_cursor = encode_cursor(reports[-1].submitted_at, reports[-1].id)
+    return reports, next_cursor
+
+
+@transaction.atomic
+def claim_next(hospital_id, reviewer, count: int = 1) -> list:
+    """
+    Claims up to `count` of the oldest claimable reports for `reviewer`.
+    Returns the claimed report ids in queue order (may be fewer, or none).
+    """
+    now = timezone.now()
+    count = max(1, min(count, MAX_CLAIM_COUNT))
+
+    ids = list(
+        _queue(hospital_id)
+        .filter(_unclaimed(now))
+        .order_by(*QUEUE_ORDERING)
+        .select_for_update(skip_locked=True, of=("self",))
+        .values_list("id", flat=True)[:count]
+    )
+    Report.objects.filter(id__in=ids).update(
+        claimed_by=reviewer,
+        lease_expires_at=now + lease_duration(),
+        updated_at=now,
+    )
+    return ids
+
+
+@transaction.atomic
+def claim_report(report: Report, reviewer) -> Report:
+    """Claims one specific report, or extends the reviewer's own lease on it."""
+    now = timezone.now()
+    locked = Report.objects.select_for_update().values(
+        "status", "claimed_by_id", "lease_expires_at",
+    ).get(pk=report.pk)
+
+    if locked["status"] != Report.Status.SUBMITTED:
+        raise ValidationError("Only submitted reports can be claimed.")
+    if _is_held_by_other(locked["claimed_by_id"], locked["lease_expires_at"], reviewer, now):
+        raise ClaimConflict()
+
+    report.claimed_by = reviewer
+    report.lease_expires_at = now + lease_duration()
+    report.save(update_fields=["claimed_by", "lease_expires_at", "updated_at"])
+    return report
+
+
+@transaction.atomic
+def release_claim(report: Report, reviewer) -> Report:
+    """Gives the report back to the queue. Only the claim holder can release an active claim."""
+    now = timezone.now()
+    locked = Report.objects.select_for_update().values(
+        "claimed_by_id", "lease_expires_at",
+    ).get(pk=report.pk)
+
+    if _is_held_by_other(locked["claimed_by_id"], locked["lease_expires_at"], reviewer, now):
+        raise ClaimConflict()
+
+    report.claimed_by = None
+    report.lease_expires_at = None
+    report.save(update_fields=["claimed_by", "lease_expires_at", "updated_at"])
+    return report
+
+
+def take_claim_for_review(report: Report, reviewer) -> None:
+    """
+    Called by approve/reject inside their transaction: fails if another
+    reviewer holds an active claim, otherwise clears the claim on `report`
+    (the caller's save writes claimed_by / lease_expires_at).
+    """
+    locked = Report.objects.select_for_update().values(
+        "claimed_by_id", "lease_expires_at",
+    ).get(pk=report.pk)
+
+    if _is_held_by_other(locked["claimed_by_id"], locked["lease_expires_at"], reviewer, timezone.now()):
+        raise ClaimConflict()
+
+    report.claimed_by = None
+    report.lease_expires_at = None
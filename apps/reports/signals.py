@@ -0,0 +1,18 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.reports.models import Report, ReportTemplate, TemplateField
+from apps.analytics.services.rollups import record_deletion
+
+
+@receiver(post_save, sender=TemplateField)
+@receiver(post_delete, sender=TemplateField)
+def bump_template_revision(sender, instance, **kwargs):
+    """Field added/changed/removed — compiled copies of the template are now stale."""
+    ReportTemplate(pk=instance.template_id).bump_revision()
+
+
+@receiver(post_delete, sender=Report)
+def record_report_deletion(sender, instance, **kwargs):
+    """The report's day must be recounted by the next analytics rollup refresh."""
+    record_deletion(instance.visit.hospital_id, instance.created_at)
@@ -0,0 +1,237 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.dependents.models import Dependent
+from apps.hospitals.models import Hospital
+from apps.reports.models import (
+    HealthObservation, Report, ReportVersion, ReportTemplate, TemplateField, ReportSection,
+)
+from apps.reports.serializers.report import ReportSerializer
+from apps.reports.services import report_service, report_versions
+from apps.reports.services.health_observations import record_observations
+from apps.visits.models import Visit, VisitType
+
+
+@override_settings(REPORT_VERSION_KEYFRAME_INTERVAL=4, REPORT_VERSIONS_PREFETCH_LIMIT=2)
+class EmbeddedVersionsQueryCountTests(TestCase):
+    """
+    With 8 versions per report (keyframes 1 and 5), the embedded latest two
+    (7, 8) need versions 5-6 loaded to be reconstructed.
+    """
+
+    VERSIONS = 8
+
+    @classmethod
+    def setUpTestData(cls):
+        hospital = Hospital.objects.create(
+            name="General", registration_number="RV-1", email="general@example.com",
+        )
+        cls.visit_type = VisitType.objects.create(hospital=hospital, name="Checkup")
+        template = ReportTemplate.objects.create(visit_type=cls.visit_type)
+        cls.fields = [
+            TemplateField.objects.create(template=template, name=f"f{i}", label=f"F{i}", order=i)
+            for i in range(3)
+        ]
+        cls.hospital  = hospital
+        cls.dependent = Dependent.objects.create(first_name="Dep", last_name="One")
+        cls.nurse = User.objects.create_user(
+            email="nurse@example.com", password="pw", first_name="N", last_name="One",
+        )
+
+    def _report_with_history(self):
+        visit = Visit.objects.create(
+            hospital=self.hospital, dependent=self.dependent, visit_type=self.visit_type,
+            requested_by=self.nurse, address="1 Main St", status=Visit.Status.COMPLETED,
+        )
+        report = Report.objects.create(visit=visit, nurse=self.nurse)
+        for field in self.fields:
+            ReportSection.objects.create(report=report, field=field, value="0")
+        for n in range(1, self.VERSIONS + 1):
+            ReportSection.objects.filter(report=report, field=self.fields[n % 3]).update(value=str(n))
+            report_versions.write_version(report, ReportVersion.Action.SUBMITTED, self.nurse)
+        return report
+
+    def _serialize(self, report_ids):
+        reports = (
+            Report.objects.filter(id__in=report_ids)
+            .prefetch_related(report_versions.recent_versions_prefetch())
+        )
+        context = {"sparse_fields": frozenset({"id", "versions"})}
+        return ReportSerializer(reports, many=True, context=context).data
+
+    def test_constant_query_count(self):
+        reports = [self._report_with_history() for _ in range(5)]
+        for count in (1, 5):
+            with self.subTest(reports=count):
+                # reports + their latest versions + the keyframe prefixes of all of them
+                with self.assertNumQueries(3):
+                    data = self._serialize([r.id for r in reports[:count]])
+                self.assertEqual(len(data), count)
+
+    def test_sections_match_replay(self):
+        report = self._report_with_history()
+        versions = self._serialize([report.id])[0]["versions"]
+        self.assertEqual([v["version_number"] for v in versions], [7, 8])
+        for version in versions:
+            expected = report_versions.get_version_sections(report, version["version_number"])
+            self.assertEqual(version["sections_snapshot"], expected)
+
+
+class SectionUpsertTests(TestCase):
+    """Saving a report writes only the sections whose value changed, in one statement."""
+
+    @classmethod
+    def setUpTestData(cls):
+        hospital = Hospital.objects.create(
+            name="General", registration_number="RS-1", email="general@example.com",
+        )
+        visit_type = VisitType.objects.create(hospital=hospital, name="Checkup")
+        template = ReportTemplate.objects.create(visit_type=visit_type)
+        cls.notes = TemplateField.objects.create(template=template, name="notes", label="Notes", order=0)
+        cls.temperature = TemplateField.objects.create(
+            template=template, name="temperature", label="Temperature", order=1,
+            field_type=TemplateField.FieldType.NUMBER,
+        )
+        cls.mood = TemplateField.objects.create(
+            template=template, name="mood", label="Mood", order=2, required=False,
+        )
+        nurse = User.objects.create_user(
+            email="nurse@example.com", password="pw", first_name="N", last_name="One",
+        )
+        visit = Visit.objects.create(
+            hospital=hospital, dependent=Dependent.objects.create(first_name="Dep", last_name="One"),
+            visit_type=visit_type, requested_by=nurse, address="1 Main St", status=Visit.Status.COMPLETED,
+        )
+        cls.report = Report.objects.create(visit=visit, nurse=nurse)
+
+    def _input(self, notes="stable", temperature="36.6", mood="calm"):
+        return [
+            {"field_id": str(self.notes.id),       "value": notes},
+            {"field_id": str(self.temperature.id), "value": temperature},
+            {"field_id": str(self.mood.id),        "value": mood},
+        ]
+
+    def _save(self, sections_input):
+        report = Report.objects.select_related("visit__visit_type__report_template").get(pk=self.report.pk)
+        with CaptureQueriesContext(connection) as ctx:
+            report_service.update_report(report, sections_input)
+        return [q["sql"] for q in ctx.captured_queries if q["sql"].startswith('INSERT INTO "reports_section"')]
+
+    def _sections(self):
+        return {s.field_id: s for s in ReportSection.objects.filter(report=self.report)}
+
+    def test_first_save_inserts_every_section(self):
+        writes = self._save(self._input())
+        self.assertEqual(len(writes), 1)
+        self.assertEqual({f: s.value for f, s in self._sections().items()}, {
+            self.notes.id: "stable", self.temperature.id: "36.6", self.mood.id: "calm",
+        })
+
+    def test_only_changed_sections_are_written(self):
+        self._save(self._input())
+        ReportSection.objects.update(updated_at=timezone.now() - timedelta(days=1))
+        before = self._sections()
+
+        writes = self._save(self._input(temperature="38.2"))
+
+        self.assertEqual(len(writes), 1)
+        self.assertEqual(writes[0].count("ON CONFLICT"), 1)
+        after = self._sections()
+        self.assertEqual(after[self.temperature.id].value, "38.2")
+        self.assertEqual(float(after[self.temperature.id].value_numeric), 38.2)
+        for field in (self.notes, self.mood):
+            self.assertEqual(after[field.id].updated_at, before[field.id].updated_at)
+        self.assertGreater(after[self.temperature.id].updated_at, before[self.temperature.id].updated_at)
+        # The row was updated in place, not replaced
+        self.assertEqual(after[self.temperature.id].id, before[self.temperature.id].id)
+
+    def test_unchanged_save_writes_nothing(self):
+        self._save(self._input())
+        self.assertEqual(self._save(self._input()), [])
+
+    def test_omitted_optional_section_is_cleared(self):
+        self._save(self._input())
+        self._save(self._input()[:2])
+        self.assertEqual(self._sections()[self.mood.id].value, "")
+
+
+class HealthObservationTests(TestCase):
+    """Approving a report appends its observations exactly once."""
+
+    @classmethod
+    def setUpTestData(cls):
+        hospital = Hospital.objects.create(
+            name="General", registration_number="HO-1", email="general@example.com",
+        )
+        visit_type = VisitType.objects.create(hospital=hospital, name="Checkup")
+        template = ReportTemplate.objects.create(visit_type=visit_type)
+        field_type = TemplateField.FieldType
+        cls.temperature = TemplateField.objects.create(
+            template=template, name="Temperature ", label="Temperature", order=0, field_type=field_type.NUMBER,
+        )
+        cls.pressure = TemplateField.objects.create(
+            template=template, name="bp", label="Blood pressure", order=1, field_type=field_type.BLOOD_PRESSURE,
+        )
+        cls.notes = TemplateField.objects.create(
+            template=template, name="notes", label="Notes", order=2, required=False,
+        )
+        cls.nurse = User.objects.create_user(
+            email="nurse@example.com", password="pw", first_name="N", last_name="One",
+        )
+        cls.reviewer = User.objects.create_user(
+            email="reviewer@example.com", password="pw", first_name="R", last_name="One",
+        )
+        cls.visit = Visit.objects.create(
+            hospital=hospital, dependent=Dependent.objects.create(first_name="Dep", last_name="One"),
+            visit_type=visit_type, requested_by=cls.nurse, address="1 Main St", status=Visit.Status.COMPLETED,
+        )
+
+    def _approved_report(self):
+        report = Report.objects.create(visit=self.visit, nurse=self.nurse)
+        report_service.update_report(report, [
+            {"field_id": str(self.temperature.id), "value": "37.5"},
+            {"field_id": str(self.pressure.id),    "value": "120/80"},
+            {"field_id": str(self.notes.id),       "value": "  "},
+        ])
+        Report.objects.filter(pk=report.pk).update(status=Report.Status.SUBMITTED, submitted_at=timezone.now())
+        report.refresh_from_db()
+        return report_service.approve_report(report, self.reviewer)
+
+    def test_approval_records_non_empty_sections(self):
+        report = self._approved_report()
+        rows = {
+            o.field_name: o for o in HealthObservation.objects.filter(report=report)
+        }
+        self.assertEqual(set(rows), {"temperature", "bp"})
+        self.assertEqual(rows["temperature"].value_numeric, 37.5)
+        self.assertEqual((rows["bp"].value_systolic, rows["bp"].value_diastolic), (120, 80))
+        for row in rows.values():
+            self.assertEqual(
+                (row.dependent_id, row.visit_id, row.observed_at),
+                (self.visit.dependent_id, self.visit.id, self.visit.created_at),
+            )
+
+    def test_recording_again_is_idempotent(self):
+        report = self._approved_report()
+        record_observations(report)
+        call_command("backfill_health_observations", stdout=StringIO())
+        self.assertEqual(HealthObservation.objects.filter(report=report).count(), 2)
+
+    def test_backfill_fills_reports_approved_earlier(self):
+        report = self._approved_report()
+        HealthObservation.objects.all().delete()
+
+        call_command("backfill_health_observations", "--batch-size", "1", stdout=StringIO())
+        self.assertEqual(HealthObservation.objects.filter(report=report).count(), 2)
+
+    def test_draft_reports_record_nothing(self):
+        Report.objects.create(visit=self.visit, nurse=self.nurse)
+        call_command("backfill_health_observations", stdout=StringIO())
+        self.assertFalse(HealthObservation.objects.exists())
@@ -3,8 +3,14 @@ from apps.reports.views.nurse import (
     ReportListCreateView,
     ReportDetailView,
     ReportSubmitView,
+    ReportVersionListView,
+)
+from apps.reports.views.review import (
+    ReportReviewView,
+    ReviewQueueView,
+    ReviewQueueClaimView,
+    ReportClaimView,
 )
-from apps.reports.views.review import ReportReviewView
 from apps.reports.views.template import (
     ReportTemplateView,
     TemplateFieldListCreateView,
@@ -22,4 +28,10 @@ urlpatterns = [
     path("<uuid:report_id>/", ReportDetailView.as_view(), name="report-detail"),
     path("<uuid:report_id>/submit/", ReportSubmitView.as_view(), name="report-submit"),
     path("<uuid:report_id>/review/", ReportReviewView.as_view(), name="report-review"),
+    path("<uuid:report_id>/versions/", ReportVersionListView.as_view(), name="report-versions"),
+    path("<uuid:report_id>/claim/", ReportClaimView.as_view(), name="report-claim"),
+
+    # Review queue (medical admin)
+    path("review-queue/<uuid:hospital_id>/", ReviewQueueView.as_view(), name="review-queue"),
+    path("review-queue/<uuid:hospital_id>/claim/", ReviewQueueClaimView.as_view(), name="review-queue-claim"),
 ]
\ No newline at end of file
@@ -1,57 +1,78 @@
+from django.db.models import Q
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiParameter, OpenApiTypes
  
-from apps.reports.models import Report
+from apps.reports.models import Report, ReportVersion
 from apps.reports.serializers.report import (
     ReportSerializer,
+    ReportVersionSerializer,
     CreateReportSerializer,
     UpdateReportSerializer,
 )
-from apps.reports.services import report_service
-from apps.hospitals.models import HospitalMembership
-from apps.dependents.models import Guardianship
+from apps.reports.services import report_service, report_versions
+from common.pagination import cursor_page_schema, encode_cursor, decode_cursor
+
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
  
 
-def get_report_or_404(report_id):
-    try:
-        return Report.objects.select_related(
+def report_queryset(user, selected=None):
+    """
+    Reports `user` can read (Report.objects.accessible_to), with what
+    ReportSerializer will render loaded. `selected` is the field set from
+    ReportSerializer.select_fields(); None loads everything (write paths).
+    Versions are capped at the latest REPORT_VERSIONS_PREFETCH_LIMIT (full
+    history is paged by ReportVersionListView).
+    """
+    qs = Report.objects.accessible_to(user)
+    if selected is None:
+        return qs.select_related(
             "visit__hospital", "visit__dependent",
             "visit__visit_type__report_template",
             "nurse", "reviewed_by",
         ).prefetch_related(
             "sections__field",
-            "versions",
-        ).get(id=report_id)
-    except Report.DoesNotExist:
-        return None 
-    
+            report_versions.recent_versions_prefetch(),
+        )
+
+    if selected & {"nurse_email", "nurse_name"}:
+        qs = qs.select_related("nurse")
+    if "reviewed_by_email" in selected:
+        qs = qs.select_related("reviewed_by")
+    if "sections" in selected:
+        qs = qs.prefetch_related("sections__field")
+    if "versions" in selected:
+        qs = qs.prefetch_related(report_versions.recent_versions_prefetch())
+    return qs
 
-def can_access_report(user, report) -> bool:
-    # Assigned nurse
-    if report.nurse_id == user.id:
-        return True
 
-    is_admin = HospitalMembership.objects.filter(
-        user=user,
-        hospital=report.visit.hospital,
-        role__in=["hospital_admin", "medical_admin"],
-        is_active=True,
-    ).exists()
-    if is_admin:
-        return True
+def get_report_or_404(report_id, user, selected=None):
+    """The report if it exists and `user` can read it, else None."""
+    try:
+        return report_queryset(user, selected).get(id=report_id)
+    except Report.DoesNotExist:
+        return None 
 
-    is_guardian = Guardianship.objects.filter(
-        user=user,
-        dependent=report.visit.dependent,
-        is_active=True,
-    ).exists()
-    if is_guardian:
-        return True
 
-    return False
+SPARSE_PARAMETERS = [
+    OpenApiParameter(
+        name="fields",
+        description="Comma-separated fields to return, e.g. id,status,submitted_at.",
+        required=False,
+        type=OpenApiTypes.STR,
+    ),
+    OpenApiParameter(
+        name="expand",
+        description="Comma-separated nested fields to include: sections, versions.",
+        required=False,
+        type=OpenApiTypes.STR,
+    ),
+]
 
 
 class ReportListCreateView(APIView):
@@ -65,9 +86,22 @@ class ReportListCreateView(APIView):
                 required=True,
                 type=OpenApiTypes.UUID, 
             ),
+            OpenApiParameter(
+                name="cursor",
+                description="Opaque cursor from the previous page's `next`.",
+                required=False,
+                type=OpenApiTypes.STR,
+            ),
+            OpenApiParameter(
+                name="page_size",
+                description=f"Reports per page (max {MAX_PAGE_SIZE}).",
+                required=False,
+                type=OpenApiTypes.INT,
+            ),
+            *SPARSE_PARAMETERS,
         ],          
-        responses={200: ReportSerializer(many=True)},
-        summary="List reports for a visit",
+        responses={200: cursor_page_schema("PaginatedReportList", ReportSerializer)},
+        summary="List reports for a visit (cursor-paginated)",
         tags=["Reports"],
     )
     def get(self, request):
@@ -77,37 +111,37 @@ class ReportListCreateView(APIView):
                 {"detail": "visit query param is required."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        reports = Report.objects.filter(visit_id=visit_id).select_related(
-            "nurse", "reviewed_by", "visit__hospital", "visit__dependent"
-        ).prefetch_related("sections__field", "versions")
+        try:
+            page_size = int(request.query_params.get("page_size", DEFAULT_PAGE_SIZE))
+        except ValueError:
+            raise ValidationError({"page_size": "Must be an integer."})
+        page_size = max(1, min(page_size, MAX_PAGE_SIZE))
 
-        accessible = [r for r in reports if can_access_report(request.user, r)]
-        return Response(ReportSerializer(accessible, many=True).data)
- 
+        # Slim by default: sections / versions only with ?expand= (or ?fields=)
+        selected = ReportSerializer.select_fields(request)
 
-    #Better Version:
-    # from django.db.models import Q
-
-    # def get(self, request):
-    #     visit_id = request.query_params.get("visit")
-    #     user = request.user
-        
-    #     # 1. Define the filters for accessibility
-    #     # (Matches your logic in can_access_report)
-    #     accessible_filter = Q(nurse=user) | \
-    #                         Q(visit__hospital__memberships__user=user, 
-    #                         visit__hospital__memberships__is_active=True) | \
-    #                         Q(visit__dependent__guardianships__user=user, 
-    #                         visit__dependent__guardianships__is_active=True)
-
-    #     # 2. Combine with the visit_id filter
-    #     reports = Report.objects.filter(
-    #         Q(visit_id=visit_id) & accessible_filter
-    #     ).distinct().select_related(
-    #         "nurse", "reviewed_by", "visit__hospital", "visit__dependent"
-    #     ).prefetch_related("sections__field", "versions")
-
-    #     return Response(ReportSerializer(reports, many=True).data)
+        # Newest first, keyset-paginated on (created_at, id)
+        reports = report_queryset(request.user, selected).filter(visit_id=visit_id)
+        cursor = request.query_params.get("cursor")
+        if cursor:
+            created_at, report_id = decode_cursor(cursor)
+            reports = reports.filter(
+                Q(created_at__lt=created_at) |
+                Q(created_at=created_at, id__lt=report_id)
+            )
+        reports = list(reports.order_by("-created_at", "-id")[:page_size + 1])
+
+        next_url = None
+        if len(reports) > page_size:
+            reports = reports[:page_size]
+            params = request.query_params.copy()
+            params["cursor"] = encode_cursor(reports[-1].created_at, reports[-1].id)
+            next_url = request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+
+        return Response({
+            "next": next_url,
+            "results": ReportSerializer(reports, many=True, context={"sparse_fields": selected}).data,
+        })
 
     @extend_schema(
         request=CreateReportSerializer,
@@ -132,15 +166,20 @@ class ReportDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
     @extend_schema(
+        parameters=SPARSE_PARAMETERS,
         responses={200: ReportSerializer},
         summary="Get report detail",
         tags=["Reports"]
     )
     def get(self, request, report_id):
-        report = get_report_or_404(report_id)
-        if not report or not can_access_report(request.user, report):
+        # Full by default; ?expand= / ?fields= narrow it
+        selected = ReportSerializer.select_fields(
+            request, expand_default=ReportSerializer.Meta.expandable_fields,
+        )
+        report = get_report_or_404(report_id, request.user, selected)
+        if not report:
             return Response({"detail": "Report not found."}, status=status.HTTP_404_NOT_FOUND)
-        return Response(ReportSerializer(report).data)
+        return Response(ReportSerializer(report, context={"sparse_fields": selected}).data)
     
 
     @extend_schema(
@@ -150,11 +189,11 @@ class ReportDetailView(APIView):
         tags=["Reports"]
     )
     def patch(self, request, report_id):
-        report = get_report_or_404(report_id)
-        if not report or not can_access_report(request.user, report):
+        report = get_report_or_404(report_id, request.user)
+        if not report:
             return Response({"detail": "Report not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        # if report.nurse != request.user:     NOT NEEDED  can_access_report CAN HANDLE THIS
+        # if report.nurse != request.user:     NOT NEEDED  accessible_to CAN HANDLE THIS
         #     return Response({"detail": "Only the nurse who created this report can edit it."}, status=status.HTTP_403_FORBIDDEN)
 
         serializer = UpdateReportSerializer(data=request.data)
@@ -171,8 +210,8 @@ class ReportDetailView(APIView):
         tags=["Reports"]
     )
     def delete(self, request, report_id):
-        report = get_report_or_404(report_id)
-        if not report or not can_access_report(request.user, report):
+        report = get_report_or_404(report_id, request.user)
+        if not report:
             return Response({"detail": "Report not found."}, status=status.HTTP_404_NOT_FOUND)
 
         report_service.delete_report(report)            
@@ -188,11 +227,64 @@ class ReportSubmitView(APIView):
         tags=["Reports"]
     )
     def post(self, request, report_id):
-        report = get_report_or_404(report_id)
+        report = get_report_or_404(report_id, request.user)
         if not report:
             return Response({"detail": "Report not found."}, status=status.HTTP_404_NOT_FOUND)
         if report.nurse != request.user:
             return Response({"detail": "Only the nurse who created this report can submit it."}, status=status.HTTP_403_FORBIDDEN)
  
         report = report_service.submit_report(report, nurse=request.user)
-        return Response(ReportSerializer(report).data)
\ No newline at end of file
+        return Response(ReportSerializer(report).data)
+
+
+class ReportVersionListView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="before",
+                description="Only versions older than this version number (from the previous page's `next`).",
+                required=False,
+                type=OpenApiTypes.INT,
+            ),
+            OpenApiParameter(
+                name="page_size",
+                description=f"Versions per page (max {MAX_PAGE_SIZE}).",
+                required=False,
+                type=OpenApiTypes.INT,
+            ),
+        ],
+        responses={200: cursor_page_schema("PaginatedReportVersionList", ReportVersionSerializer)},
+        summary="Report version history (paginated, newest page first)",
+        tags=["Reports"],
+    )
+    def get(self, request, report_id):
+        if not Report.objects.accessible_to(request.user).filter(id=report_id).exists():
+            return Response({"detail": "Report not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            page_size = int(request.query_params.get("page_size", DEFAULT_PAGE_SIZE))
+            before = request.query_params.get("before")
+            before = int(before) if before else None
+        except ValueError:
+            raise ValidationError({"detail": "page_size and before must be integers."})
+        page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+
+        versions = ReportVersion.objects.filter(report_id=report_id).select_related("triggered_by")
+        if before is not None:
+            versions = versions.filter(version_number__lt=before)
+        versions = list(versions.order_by("-version_number")[:page_size + 1])
+
+        next_url = None
+        if len(versions) > page_size:
+            versions = versions[:page_size]
+            params = request.query_params.copy()
+            params["before"] = versions[-1].version_number
+            next_url = request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+
+        # Each page is returned oldest → newest, like the versions embedded in a report
+        return Response({
+            "next": next_url,
+            "results": ReportVersionSerializer(versions, many=True).data,
+        })
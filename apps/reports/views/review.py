@@ -1,30 +1,42 @@
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes
  
-from apps.reports.models import Report
-from apps.reports.serializers.report import ReportSerializer, ReviewReportSerializer
-from apps.reports.services import report_service
+from apps.reports.serializers.report import (
+    ReportSerializer,
+    ReviewReportSerializer,
+    ClaimReportsSerializer,
+)
+from apps.reports.services import report_service, review_queue
+from apps.reports.views.nurse import get_report_or_404, report_queryset, SPARSE_PARAMETERS
 from apps.hospitals.models import HospitalMembership
+from common.pagination import cursor_page_schema
+from common.permissions.access_context import get_access_context
+
+
+def is_medical_admin(user, hospital_id) -> bool:
+    return get_access_context(user).has_role(hospital_id, HospitalMembership.Role.MEDICAL_ADMIN)
+
+
+def not_medical_admin() -> Response:
+    return Response(
+        {"detail": "Only a medical admin of this hospital can review reports."},
+        status=status.HTTP_403_FORBIDDEN,
+    )
 
 
 class ReportReviewView(APIView):
     """
     Medical admin either approves or rejects with a single endpoint.
     Action is determined by the "action" field in the request body.
+    Either one releases the report's review-queue claim; a report claimed
+    by another reviewer (unexpired lease) is refused with 409.
     """
     permission_classes = [IsAuthenticated]
 
-    def get_report(self, report_id):
-        try:
-            return Report.objects.select_related(
-                "visit__hospital", "nurse", "reviewed_by"
-            ).prefetch_related("versions").get(id=report_id)
-        except Report.DoesNotExist:
-            return None
-
     @extend_schema(
         request=ReviewReportSerializer,
         responses={200: ReportSerializer},
@@ -32,22 +44,13 @@ class ReportReviewView(APIView):
         tags=["Reports"],
     )
     def post(self, request, report_id):
-        report = self.get_report(report_id)
+        report = get_report_or_404(report_id, request.user)
         if not report:
             return Response({"detail": "Report not found."}, status=status.HTTP_404_NOT_FOUND)
 
         # Must be medical admin of this hospital
-        is_medical_admin = HospitalMembership.objects.filter(
-            user=request.user,
-            hospital=report.visit.hospital,
-            role=HospitalMembership.Role.MEDICAL_ADMIN,
-            is_active=True,
-        ).exists()
-        if not is_medical_admin:
-            return Response(
-                {"detail": "Only a medical admin of this hospital can review reports."},
-                status=status.HTTP_403_FORBIDDEN,
-            )
+        if not is_medical_admin(request.user, report.visit.hospital_id):
+            return not_medical_admin()
         
         serializer = ReviewReportSerializer(data=request.data)
         if not serializer.is_valid():
@@ -69,4 +72,132 @@ class ReportReviewView(APIView):
                 review_notes=review_notes,
             )    
 
-        return Response(ReportSerializer(report).data)   
\ No newline at end of file
+        return Response(ReportSerializer(report).data)
+
+
+class ReviewQueueView(APIView):
+    """
+    A hospital's reports awaiting review, oldest submission first.
+    Slim by default (?expand= / ?fields= as for the report list).
+    """
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="cursor",
+                description="Opaque cursor from the previous page's `next`.",
+                required=False,
+                type=OpenApiTypes.STR,
+            ),
+            OpenApiParameter(
+                name="page_size",
+                description=f"Reports per page (max {review_queue.MAX_PAGE_SIZE}).",
+                required=False,
+                type=OpenApiTypes.INT,
+            ),
+            OpenApiParameter(
+                name="unclaimed",
+                description="true: only reports nobody holds an active claim on.",
+                required=False,
+                type=OpenApiTypes.BOOL,
+            ),
+            *SPARSE_PARAMETERS,
+        ],
+        responses={200: cursor_page_schema("PaginatedReviewQueue", ReportSerializer)},
+        summary="Review queue (medical admin)",
+        tags=["Reports"],
+    )
+    def get(self, request, hospital_id):
+        if not is_medical_admin(request.user, hospital_id):
+            return not_medical_admin()
+
+        try:
+            page_size = int(request.query_params.get("page_size", review_queue.DEFAULT_PAGE_SIZE))
+        except ValueError:
+            raise ValidationError({"page_size": "Must be an integer."})
+
+        selected = ReportSerializer.select_fields(request)
+        reports, next_cursor = review_queue.get_queue_page(
+            hospital_id,
+            cursor=request.query_params.get("cursor"),
+            page_size=page_size,
+            unclaimed_only=request.query_params.get("unclaimed") == "true",
+            queryset=report_queryset(request.user, selected),
+        )
+
+        next_url = None
+        if next_cursor:
+            params = request.query_params.copy()
+            params["cursor"] = next_cursor
+            next_url = request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+
+        return Response({
+            "next": next_url,
+            "results": ReportSerializer(reports, many=True, context={"sparse_fields": selected}).data,
+        })
+
+
+class ReviewQueueClaimView(APIView):
+    """
+    Claims the next `count` unclaimed reports of the queue for the caller.
+    Concurrent reviewers never receive the same report (SKIP LOCKED).
+    """
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        request=ClaimReportsSerializer,
+        responses={200: ReportSerializer(many=True)},
+        summary="Claim the next reports to review (medical admin)",
+        tags=["Reports"],
+    )
+    def post(self, request, hospital_id):
+        if not is_medical_admin(request.user, hospital_id):
+            return not_medical_admin()
+
+        serializer = ClaimReportsSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        ids = review_queue.claim_next(hospital_id, request.user, serializer.validated_data["count"])
+        reports_by_id = report_queryset(request.user).in_bulk(ids)
+        reports = [reports_by_id[i] for i in ids if i in reports_by_id]
+        return Response(ReportSerializer(reports, many=True).data)
+
+
+class ReportClaimView(APIView):
+    """Claim (or renew the lease on) one report, or release it back to the queue."""
+    permission_classes = [IsAuthenticated]
+
+    def get_claimable(self, request, report_id):
+        report = get_report_or_404(report_id, request.user)
+        if not report:
+            return None, Response({"detail": "Report not found."}, status=status.HTTP_404_NOT_FOUND)
+        if not is_medical_admin(request.user, report.visit.hospital_id):
+            return None, not_medical_admin()
+        return report, None
+
+    @extend_schema(
+        request=None,
+        responses={200: ReportSerializer},
+        summary="Claim a report or renew the lease (medical admin)",
+        tags=["Reports"],
+    )
+    def post(self, request, report_id):
+        report, error = self.get_claimable(request, report_id)
+        if error:
+            return error
+        report = review_queue.claim_report(report, request.user)
+        return Response(ReportSerializer(report).data)
+
+    @extend_schema(
+        responses={200: ReportSerializer},
+        summary="Release a claimed report (medical admin)",
+        tags=["Reports"],
+    )
+    def delete(self, request, report_id):
+        report, error = self.get_claimable(request, report_id)
+        if error:
+            return error
+        report = review_queue.release_claim(report, request.user)
+        return Response(ReportSerializer(report).data)
@@ -8,15 +8,13 @@ from apps.reports.models import ReportTemplate, TemplateField
 from apps.reports.serializers.report import ReportTemplateSerializer, CreateReportTemplateSerializer, TemplateFieldSerializer
 from apps.hospitals.models import HospitalMembership
 from apps.visits.models import VisitType
+from common.permissions.access_context import get_access_context
 
 
 def is_hospital_admin_of_visit_type(user, visit_type) -> bool:
-    return HospitalMembership.objects.filter(
-        user=user,
-        hospital=visit_type.hospital,
-        role=HospitalMembership.Role.HOSPITAL_ADMIN,
-        is_active=True,
-    ).exists()
+    return get_access_context(user).has_role(
+        visit_type.hospital_id, HospitalMembership.Role.HOSPITAL_ADMIN,
+    )
 
 
 class ReportTemplateView(APIView):
@@ -0,0 +1,42 @@
+"""
+Auto-confirms visits whose guardian response deadline has passed.
+
+One-shot (cron):
+    python manage.py auto_confirm_visits
+
+Long-running worker, sweeping every 60s (run several in parallel to drain a backlog):
+    python manage.py auto_confirm_visits --interval 60
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.visits.services.visit_service import auto_confirm_expired_visits
+
+
+class Command(BaseCommand):
+    help = "Auto-confirm PENDING visits past guardian_response_deadline, in SKIP LOCKED chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None,
+                            help="Rows per chunk (default: settings.VISIT_AUTO_CONFIRM_BATCH_SIZE).")
+        parser.add_argument("--max-batches", type=int, default=None,
+                            help="Stop after this many chunks per sweep.")
+        parser.add_argument("--interval", type=int, default=None,
+                            help="Keep running, sweeping every N seconds.")
+
+    def handle(self, *args, **options):
+        while True:
+            stats = auto_confirm_expired_visits(
+                batch_size=options["batch_size"],
+                max_batches=options["max_batches"],
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f"Auto-confirmed {stats['processed']} visits "
+                f"in {stats['batches']} batches ({stats['elapsed_seconds']}s)."
+            ))
+
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
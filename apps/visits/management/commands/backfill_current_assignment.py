@@ -0,0 +1,52 @@
+"""
+Backfills Visit.current_assignment / current_nurse from visits_assignment.
+
+Migration visits 0006 fills the pointer on visits that predate it; run this
+any time the pointer is suspected to have drifted. Safe to re-run — every
+visit is recomputed, not patched.
+
+    python manage.py backfill_current_assignment --batch-size 5000
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+from apps.visits.models import Visit, VisitAssignment
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized current_assignment/current_nurse pointer on every visit."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        latest_active = VisitAssignment.objects.filter(
+            visit=OuterRef("pk"),
+            status__in=[
+                VisitAssignment.AssignmentStatus.PENDING,
+                VisitAssignment.AssignmentStatus.ACCEPTED,
+            ],
+        ).order_by("-created_at")
+
+        ids = Visit.objects.order_by("pk").values_list("pk", flat=True)
+        last_pk = None
+        updated = 0
+
+        while True:
+            batch = ids.filter(pk__gt=last_pk) if last_pk else ids
+            batch = list(batch[:batch_size])
+            if not batch:
+                break
+
+            with transaction.atomic():
+                updated += Visit.objects.filter(pk__in=batch).update(
+                    current_assignment=Subquery(latest_active.values("id")[:1]),
+                    current_nurse=Subquery(latest_active.values("nurse_id")[:1]),
+                )
+            last_pk = batch[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled current assignment on {updated} visits."))
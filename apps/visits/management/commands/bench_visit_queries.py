@@ -0,0 +1,315 @@
+"""
+Benchmarks the hot visit lifecycle + analytics queries against the index set
+declared on Visit / VisitAssignment (visits 0003).
+
+DEV / STAGING DATABASES ONLY — seeding writes a lot of rows, and --compare
+drops the indexes inside a transaction (ACCESS EXCLUSIVE lock on PostgreSQL)
+before rolling back.
+
+    # seed 1M visits, then print EXPLAIN + timings with and without the indexes
+    python manage.py bench_visit_queries --seed 1000000 --compare
+
+    # re-run against already seeded data
+    python manage.py bench_visit_queries --compare
+
+Seeded rows are recognisable by the "BENCH-" hospital registration numbers
+and the @bench.familypulse.local email domain.
+"""
+
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.hospitals.models import Hospital, HospitalMembership
+from apps.dependents.models import Dependent, Guardianship
+from apps.visits.models import Visit, VisitType, VisitAssignment
+from apps.visits.services import visit_feed
+from apps.analytics.services.analytics_helpers import date_filter
+from apps.analytics.services import (
+    hospitaladmin_analytics,
+    nurse_analytics,
+    guardian_analytics,
+    superadmin_analytics,
+)
+
+BENCH_DOMAIN = "bench.familypulse.local"
+
+# Rough shape of a mature deployment: most visits are finished.
+STATUS_WEIGHTS = {
+    Visit.Status.APPROVED:         55,
+    Visit.Status.CANCELLED:        12,
+    Visit.Status.REJECTED:          3,
+    Visit.Status.REPORT_SUBMITTED:  6,
+    Visit.Status.COMPLETED:         4,
+    Visit.Status.STARTED:           2,
+    Visit.Status.ACCEPTED:          5,
+    Visit.Status.ASSIGNED:          4,
+    Visit.Status.SCHEDULED:         5,
+    Visit.Status.REQUESTED:         4,
+}
+ASSIGNED_OR_LATER = {
+    Visit.Status.ASSIGNED, Visit.Status.ACCEPTED, Visit.Status.STARTED,
+    Visit.Status.COMPLETED, Visit.Status.REPORT_SUBMITTED,
+    Visit.Status.APPROVED, Visit.Status.REJECTED,
+}
+AWAITING_GUARDIAN = {Visit.Status.SCHEDULED, Visit.Status.ASSIGNED, Visit.Status.ACCEPTED}
+
+
+@contextmanager
+def _manual_created_at(*models):
+    """bulk_create honours auto_now_add — switch it off so seeded history is spread out."""
+    fields = [m._meta.get_field("created_at") for m in models]
+    for f in fields:
+        f.auto_now_add = False
+    try:
+        yield
+    finally:
+        for f in fields:
+            f.auto_now_add = True
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Seed visits and print EXPLAIN plans + timings for the hot visit/analytics queries."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=0, help="Number of visits to seed first.")
+        parser.add_argument("--hospitals", type=int, default=50)
+        parser.add_argument("--nurses-per-hospital", type=int, default=20)
+        parser.add_argument("--batch-size", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=3, help="Timing runs per query (best is reported).")
+        parser.add_argument("--compare", action="store_true",
+                            help="Also run every query with the lifecycle indexes dropped (rolled back).")
+
+    def handle(self, *args, **options):
+        if options["seed"]:
+            self._seed(options)
+
+        hospital = (
+            Hospital.objects.filter(registration_number__startswith="BENCH-")
+            .annotate(n=Count("visits")).order_by("-n").first()
+        )
+        if not hospital:
+            raise CommandError("No seeded data found. Run with --seed N first.")
+
+        cases = self._cases(hospital)
+
+        if options["compare"]:
+            self.stdout.write(self.style.WARNING("\n######## BEFORE (lifecycle indexes dropped) ########"))
+            try:
+                with transaction.atomic():
+                    self._drop_lifecycle_indexes()
+                    self._run(cases, options["repeat"])
+                    raise _Rollback
+            except _Rollback:
+                pass
+            self.stdout.write(self.style.WARNING("\n######## AFTER (lifecycle indexes present) ########"))
+
+        self._run(cases, options["repeat"])
+
+    # Queries
+
+    def _cases(self, hospital) -> list:
+        """
+        (label, queryset to EXPLAIN or None, callable to time).
+        Analytics functions are timed .uncached — through the result cache
+        every run after the first would be a cache hit.
+        """
+        admin = User.objects.filter(
+            hospital_memberships__hospital=hospital,
+            hospital_memberships__role=HospitalMembership.Role.HOSPITAL_ADMIN,
+        ).first()
+        nurse = User.objects.filter(
+            hospital_memberships__hospital=hospital,
+            hospital_memberships__role=HospitalMembership.Role.NURSE,
+        ).first()
+        dependent = Dependent.objects.filter(visits__hospital=hospital).first()
+        visit = Visit.objects.filter(hospital=hospital, status=Visit.Status.ASSIGNED).first()
+        now = timezone.now()
+        date_from = date.today() - timedelta(days=90)
+
+        sweep = Visit.objects.filter(
+            guardian_response=Visit.GuardianResponse.PENDING,
+            guardian_response_deadline__lte=now,
+            status__in=[Visit.Status.SCHEDULED, Visit.Status.ASSIGNED, Visit.Status.ACCEPTED],
+        ).order_by("guardian_response_deadline").values_list("id", flat=True)[:500]
+        hospital_queue = Visit.objects.filter(
+            hospital=hospital, status=Visit.Status.SCHEDULED,
+        ).order_by("-created_at")[:50]
+        dependent_history = Visit.objects.filter(dependent=dependent).order_by("-created_at", "-id")[:50]
+        active_assignment = VisitAssignment.objects.filter(
+            visit=visit,
+            status__in=[
+                VisitAssignment.AssignmentStatus.PENDING,
+                VisitAssignment.AssignmentStatus.ACCEPTED,
+            ],
+        )
+        nurse_accepted = VisitAssignment.objects.filter(
+            nurse=nurse, status=VisitAssignment.AssignmentStatus.ACCEPTED,
+        )
+        hospital_by_status = (
+            date_filter(Visit.objects.filter(hospital=hospital), "created_at", date_from)
+            .values("status").annotate(count=Count("id")).order_by("status")
+        )
+
+        return [
+            ("visit_service: auto-confirm sweep chunk", sweep, None),
+            ("visit_service: hospital scheduled queue", hospital_queue, None),
+            ("visit_service: active assignment of a visit", active_assignment, None),
+            ("visit_feed: dependent history page", dependent_history, None),
+            ("visit_feed: hospital admin first page", None,
+             lambda: visit_feed.get_visit_feed_page(admin)),
+            ("nurse: accepted assignments", nurse_accepted, None),
+            ("analytics: hospital_visit_summary (90d)", hospital_by_status,
+             lambda: hospitaladmin_analytics.hospital_visit_summary.uncached(hospital, date_from)),
+            ("analytics: hospital_visits_over_time (90d)", None,
+             lambda: hospitaladmin_analytics.hospital_visits_over_time.uncached(hospital, date_from)),
+            ("analytics: hospital_nurse_summary (90d)", None,
+             lambda: hospitaladmin_analytics.hospital_nurse_summary.uncached(hospital, date_from)),
+            ("analytics: hospital_nurse_summary (all time, by completed)", None,
+             lambda: hospitaladmin_analytics.hospital_nurse_summary.uncached(
+                 hospital, order_by="-total_completed")),
+            ("analytics: nurse_visit_summary", None,
+             lambda: nurse_analytics.nurse_visit_summary.uncached(nurse)),
+            ("analytics: dependent_visit_summary", None,
+             lambda: guardian_analytics.dependent_visit_summary.uncached(dependent)),
+            ("analytics: superadmin_hospital_breakdown (90d)", None,
+             lambda: superadmin_analytics.superadmin_hospital_breakdown.uncached(date_from)),
+        ]
+
+    def _run(self, cases, repeat):
+        analyze = connection.vendor == "postgresql"
+        for label, qs, fn in cases:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n== {label} =="))
+            if qs is not None:
+                plan = qs.explain(analyze=True, buffers=True) if analyze else qs.explain()
+                self.stdout.write(plan)
+            fn = fn or (lambda qs=qs: list(qs.all()))  # .all() clones — no result cache
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                fn()
+                timings.append((time.perf_counter() - started) * 1000)
+            self.stdout.write(self.style.SUCCESS(f"best of {repeat}: {min(timings):.1f} ms"))
+
+    def _drop_lifecycle_indexes(self):
+        qn = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            for model in (Visit, VisitAssignment):
+                for index in model._meta.indexes:
+                    cursor.execute(f"DROP INDEX {qn(index.name)}")
+
+    # Seeding
+
+    def _seed(self, options):
+        n_visits = options["seed"]
+        batch_size = options["batch_size"]
+        rng = random.Random(42)
+        now = timezone.now()
+        run = uuid.uuid4().hex[:8]
+
+        self.stdout.write(f"Seeding {n_visits} visits across {options['hospitals']} hospitals...")
+
+        hospitals, visit_types, nurses_by_hospital = [], {}, {}
+        users, memberships = [], []
+        for i in range(options["hospitals"]):
+            h = Hospital(
+                name=f"Bench Hospital {run}-{i}",
+                registration_number=f"BENCH-{run}-{i}",
+                email=f"hospital-{run}-{i}@{BENCH_DOMAIN}",
+                status=Hospital.Status.ACTIVE,
+            )
+            hospitals.append(h)
+            admin = User(email=f"admin-{run}-{i}@{BENCH_DOMAIN}", first_name="Bench", last_name="Admin", password="!")
+            users.append(admin)
+            memberships.append(HospitalMembership(user=admin, hospital=h, role=HospitalMembership.Role.HOSPITAL_ADMIN))
+            nurses_by_hospital[h.id] = []
+            for j in range(options["nurses_per_hospital"]):
+                nurse = User(email=f"nurse-{run}-{i}-{j}@{BENCH_DOMAIN}", first_name="Bench", last_name="Nurse", password="!")
+                users.append(nurse)
+                nurses_by_hospital[h.id].append(nurse)
+                memberships.append(HospitalMembership(user=nurse, hospital=h, role=HospitalMembership.Role.NURSE))
+            visit_types[h.id] = VisitType(hospital=h, name="Bench Checkup")
+
+        n_dependents = max(1, n_visits // 20)
+        dependents, guardianships = [], []
+        for k in range(n_dependents):
+            d = Dependent(first_name="Bench", last_name=f"Dependent {k}")
+            dependents.append(d)
+            guardian = User(email=f"guardian-{run}-{k}@{BENCH_DOMAIN}", first_name="Bench", last_name="Guardian", password="!")
+            users.append(guardian)
+            guardianships.append(Guardianship(user=guardian, dependent=d, added_by=guardian))
+
+        with transaction.atomic():
+            Hospital.objects.bulk_create(hospitals, batch_size=batch_size)
+            User.objects.bulk_create(users, batch_size=batch_size)
+            HospitalMembership.objects.bulk_create(memberships, batch_size=batch_size)
+            VisitType.objects.bulk_create(visit_types.values(), batch_size=batch_size)
+            Dependent.objects.bulk_create(dependents, batch_size=batch_size)
+            Guardianship.objects.bulk_create(guardianships, batch_size=batch_size)
+
+        statuses, weights = zip(*STATUS_WEIGHTS.items())
+        span_seconds = 3 * 365 * 24 * 3600
+        created = 0
+
+        with _manual_created_at(Visit, VisitAssignment):
+            while created < n_visits:
+                visits, assignments = [], []
+                for _ in range(min(batch_size, n_visits - created)):
+                    g = rng.randrange(n_dependents)
+                    h = hospitals[g % len(hospitals)]
+                    status = rng.choices(statuses, weights)[0]
+                    created_at = now - timedelta(seconds=rng.randrange(span_seconds))
+                    visit = Visit(
+                        hospital=h,
+                        dependent=dependents[g],
+                        visit_type=visit_types[h.id],
+                        requested_by=guardianships[g].user,
+                        address="Bench address",
+                        status=status,
+                        created_at=created_at,
+                    )
+                    if status in AWAITING_GUARDIAN and rng.random() < 0.3:
+                        visit.guardian_response = Visit.GuardianResponse.PENDING
+                        visit.guardian_response_deadline = now + timedelta(hours=rng.randint(-48, 24))
+                    if status in ASSIGNED_OR_LATER:
+                        nurse = rng.choice(nurses_by_hospital[h.id])
+                        assignment = VisitAssignment(
+                            visit=visit,
+                            nurse=nurse,
+                            assigned_by=nurse,
+                            status=(
+                                VisitAssignment.AssignmentStatus.PENDING
+                                if status == Visit.Status.ASSIGNED
+                                else VisitAssignment.AssignmentStatus.ACCEPTED
+                            ),
+                            created_at=created_at,
+                        )
+                        assignments.append(assignment)
+                        visit.current_assignment = assignment
+                        visit.current_nurse = nurse
+                    visits.append(visit)
+
+                with transaction.atomic():
+                    Visit.objects.bulk_create(visits, batch_size=batch_size)
+                    VisitAssignment.objects.bulk_create(assignments, batch_size=batch_size)
+                created += len(visits)
+                self.stdout.write(f"  {created}/{n_visits}")
+
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                for table in ("visits_visit", "visits_assignment", "hospitals_membership", "dependents_guardianship"):
+                    cursor.execute(f"ANALYZE {table}")
+
+        self.stdout.write(self.style.SUCCESS(f"Seeded {n_visits} visits."))
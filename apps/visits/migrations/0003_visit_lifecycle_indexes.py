@@ -0,0 +1,41 @@
+# Generated by Django 6.0.2 on 2026-10-18 15:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dependents', '0001_initial'),
+        ('hospitals', '0001_initial'),
+        ('visits', '0002_visit_current_assignment'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='visit',
+            index=models.Index(condition=models.Q(('guardian_response', 'pending'), ('status__in', ['scheduled', 'assigned', 'accepted'])), fields=['guardian_response_deadline'], name='visits_pending_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visit',
+            index=models.Index(condition=models.Q(('status__in', ['requested', 'scheduled', 'assigned', 'accepted', 'started', 'completed', 'report_submitted'])), fields=['hospital', 'status', 'created_at'], name='visits_hospital_open_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visit',
+            index=models.Index(fields=['hospital', 'created_at', 'id'], name='visits_hospital_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visit',
+            index=models.Index(fields=['dependent', 'created_at', 'id'], name='visits_dependent_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visitassignment',
+            index=models.Index(fields=['nurse', 'status'], name='visits_asg_nurse_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visitassignment',
+            index=models.Index(condition=models.Q(('status__in', ['pending', 'accepted'])), fields=['visit', 'created_at'], name='visits_asg_active_idx'),
+        ),
+    ]
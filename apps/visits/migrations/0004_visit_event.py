@@ -0,0 +1,39 @@
+# Generated by Django 6.0.2 on 2026-10-18 15:48
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hospitals', '0001_initial'),
+        ('visits', '0003_visit_lifecycle_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VisitEvent',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('from_status', models.CharField(blank=True, choices=[('requested', 'Requested'), ('scheduled', 'Scheduled'), ('assigned', 'Assigned'), ('accepted', 'Accepted'), ('started', 'Started'), ('completed', 'Completed'), ('report_submitted', 'Report Submitted'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('cancelled', 'Cancelled')], default='', max_length=20)),
+                ('to_status', models.CharField(choices=[('requested', 'Requested'), ('scheduled', 'Scheduled'), ('assigned', 'Assigned'), ('accepted', 'Accepted'), ('started', 'Started'), ('completed', 'Completed'), ('report_submitted', 'Report Submitted'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('role', models.CharField(blank=True, default='', max_length=20)),
+                ('occurred_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='visit_events', to=settings.AUTH_USER_MODEL)),
+                ('hospital', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='visit_events', to='hospitals.hospital')),
+                ('visit', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='visits.visit')),
+            ],
+            options={
+                'db_table': 'visits_event',
+                'ordering': ['occurred_at'],
+                'indexes': [models.Index(fields=['hospital', 'occurred_at'], name='visits_event_hosp_time_idx'), models.Index(fields=['visit', 'occurred_at'], name='visits_event_visit_time_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-18 16:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dependents', '0001_initial'),
+        ('hospitals', '0001_initial'),
+        ('visits', '0004_visit_event'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='visit',
+            index=models.Index(fields=['updated_at'], name='visits_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.2 on 2026-10-18 16:40
+
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_current_assignment(apps, schema_editor):
+    """
+    Fills the current_assignment / current_nurse pointers (visits 0002) on
+    visits that predate them: accept/start/complete and report creation check
+    only the pointer. Same rule as the backfill_current_assignment command —
+    the latest PENDING or ACCEPTED assignment.
+    """
+    Visit = apps.get_model("visits", "Visit")
+    VisitAssignment = apps.get_model("visits", "VisitAssignment")
+    latest_active = VisitAssignment.objects.filter(
+        visit=OuterRef("pk"),
+        status__in=["pending", "accepted"],
+    ).order_by("-created_at")
+    Visit.objects.filter(current_assignment__isnull=True).update(
+        current_assignment=Subquery(latest_active.values("id")[:1]),
+        current_nurse=Subquery(latest_active.values("nurse_id")[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('visits', '0005_visit_updated_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_current_assignment, migrations.RunPython.noop),
+    ]
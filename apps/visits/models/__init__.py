@@ -1,5 +1,6 @@
 from .visit_type import VisitType
 from .visit import Visit
 from .visit_assignment import VisitAssignment
+from .visit_event import VisitEvent
 
-__all__ = ["VisitType", "Visit", "VisitAssignment"]
+__all__ = ["VisitType", "Visit", "VisitAssignment", "VisitEvent"]
@@ -109,6 +109,25 @@ class Visit(UUIDModel):
     )
     cancellation_reason = models.TextField(blank=True, default="")
 
+    # Denormalized pointer to the active (PENDING/ACCEPTED) assignment.
+    # Maintained by visit_service — assign_nurse sets it, reject_assignment and
+    # cancel_by_guardian clear it. Lets nurse-scoped lookups filter on
+    # current_nurse instead of joining visits_assignment by status.
+    current_assignment = models.ForeignKey(
+        "visits.VisitAssignment",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    current_nurse = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="current_visits",
+    )
+
     # Notes
     guardian_notes = models.TextField(
         blank=True,
@@ -119,6 +138,36 @@ class Visit(UUIDModel):
     class Meta:
         db_table = "visits_visit"
         ordering = ["-created_at"]
+        # Status literals below because Meta can't see the Status enum.
+        indexes = [
+            # Auto-confirm sweep: PENDING responses past their deadline.
+            # Partial — only the few rows still awaiting a guardian are indexed.
+            models.Index(
+                fields=["guardian_response_deadline"],
+                name="visits_pending_deadline_idx",
+                condition=models.Q(
+                    guardian_response="pending",
+                    status__in=["scheduled", "assigned", "accepted"],
+                ),
+            ),
+            # Hospital work queues (requested → report_submitted), newest first.
+            # Terminal visits (approved/rejected/cancelled) are the bulk of the
+            # table and never appear in a queue, so they are left out.
+            models.Index(
+                fields=["hospital", "status", "created_at"],
+                name="visits_hospital_open_idx",
+                condition=models.Q(status__in=[
+                    "requested", "scheduled", "assigned", "accepted",
+                    "started", "completed", "report_submitted",
+                ]),
+            ),
+            # Hospital analytics date ranges + admin visit feed keyset (created_at, id).
+            models.Index(fields=["hospital", "created_at", "id"], name="visits_hospital_created_idx"),
+            # Dependent history + guardian visit feed keyset.
+            models.Index(fields=["dependent", "created_at", "id"], name="visits_dependent_created_idx"),
+            # Analytics rollup refresh: visits changed since the last watermark.
+            models.Index(fields=["updated_at"], name="visits_updated_idx"),
+        ]
 
     def __str__(self):
         return f"Visit({self.dependent.full_name}, {self.status}, {self.scheduled_at})"
@@ -133,4 +182,13 @@ class Visit(UUIDModel):
  
     @property
     def awaiting_guardian_response(self) -> bool:
-        return self.guardian_response == self.GuardianResponse.PENDING    
\ No newline at end of file
+        return self.guardian_response == self.GuardianResponse.PENDING
+
+    def is_accepted_nurse(self, user) -> bool:
+        """
+        True if user is the nurse whose current assignment was accepted.
+        select_related("current_assignment") to avoid the extra query.
+        """
+        if self.current_nurse_id is None or self.current_nurse_id != user.id:
+            return False
+        return self.current_assignment.status == self.current_assignment.AssignmentStatus.ACCEPTED    
\ No newline at end of file
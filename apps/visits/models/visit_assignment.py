@@ -36,6 +36,16 @@ class VisitAssignment(UUIDModel):
     class Meta:
         db_table = "visits_assignment"
         ordering = ["-created_at"]
+        indexes = [
+            # Nurse dashboards / analytics: "my accepted assignments".
+            models.Index(fields=["nurse", "status"], name="visits_asg_nurse_status_idx"),
+            # Active (pending/accepted) assignment of a visit — assign/cancel/backfill.
+            models.Index(
+                fields=["visit", "created_at"],
+                name="visits_asg_active_idx",
+                condition=models.Q(status__in=["pending", "accepted"]),
+            ),
+        ]
 
     def __str__(self):
         return f"Assignment({self.nurse.email} → Visit {self.visit_id}, {self.status})"
\ No newline at end of file
@@ -0,0 +1,52 @@
+"""
+Append-only log of visit status transitions.
+- One row per transition, written by state_machine.transition() in the same
+  transaction as the status change (bulk dispatch writes them with bulk_create).
+- A "requested" row (blank from_status) is written when the visit is created,
+  so every lifecycle duration can be read from this table alone.
+- Rows are never updated or deleted by the application.
+- hospital is denormalized from the visit so hospital-scoped time-range
+  scans never join visits.
+"""
+
+from django.db import models
+from django.conf import settings
+from django.utils import timezone
+from common.models import UUIDModel
+from apps.hospitals.models import Hospital
+from apps.visits.models.visit import Visit
+
+
+class VisitEvent(UUIDModel):
+
+    visit = models.ForeignKey(Visit, on_delete=models.CASCADE, related_name="events",)
+
+    hospital = models.ForeignKey(Hospital, on_delete=models.CASCADE, related_name="visit_events",)
+
+    from_status = models.CharField(max_length=20, choices=Visit.Status.choices, blank=True, default="")
+    to_status   = models.CharField(max_length=20, choices=Visit.Status.choices)
+
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="visit_events",
+    )
+    # Role the actor acted in ("hospital_admin", "nurse", "guardian", ...); blank for system events.
+    role = models.CharField(max_length=20, blank=True, default="")
+
+    occurred_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = "visits_event"
+        ordering = ["occurred_at"]
+        indexes = [
+            # Hospital time-range scans (durations, analytics windows).
+            models.Index(fields=["hospital", "occurred_at"], name="visits_event_hosp_time_idx"),
+            # Per-visit timeline; also the partition/order of the duration window.
+            models.Index(fields=["visit", "occurred_at"], name="visits_event_visit_time_idx"),
+        ]
+
+    def __str__(self):
+        return f"VisitEvent({self.visit_id}: {self.from_status or '-'} → {self.to_status})"
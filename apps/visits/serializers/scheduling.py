@@ -1,8 +1,12 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 
+from apps.visits.serializers.visit import VisitSerializer
+
 User = get_user_model()
 
+BULK_MAX_ITEMS = 1000
+
 
 class ScheduleVisitSerializer(serializers.Serializer):
     scheduled_at = serializers.DateTimeField()
@@ -34,4 +38,37 @@ class RejectAssignmentSerializer(serializers.Serializer):
         default="",
         allow_blank=True,
         help_text="Optional reason for rejecting the assignment.",
-    )    
\ No newline at end of file
+    )    
+
+class BulkScheduleItemSerializer(serializers.Serializer):
+    visit_id     = serializers.UUIDField()
+    scheduled_at = serializers.DateTimeField()
+
+
+class BulkScheduleVisitsSerializer(serializers.Serializer):
+    items = BulkScheduleItemSerializer(many=True, allow_empty=False, max_length=BULK_MAX_ITEMS)
+
+
+class BulkAssignItemSerializer(serializers.Serializer):
+    # nurse_id is checked against hospital memberships for the whole batch in
+    # bulk_service — no per-item lookup here.
+    visit_id = serializers.UUIDField()
+    nurse_id = serializers.UUIDField()
+
+
+class BulkAssignNursesSerializer(serializers.Serializer):
+    items = BulkAssignItemSerializer(many=True, allow_empty=False, max_length=BULK_MAX_ITEMS)
+
+
+class BulkVisitResultSerializer(serializers.Serializer):
+    """One entry per input item, in input order. `visit` on success, `error` on failure."""
+    visit_id = serializers.UUIDField()
+    success  = serializers.BooleanField()
+    error    = serializers.CharField(required=False)
+    visit    = VisitSerializer(required=False)
+
+
+class BulkVisitResponseSerializer(serializers.Serializer):
+    succeeded = serializers.IntegerField()
+    failed    = serializers.IntegerField()
+    results   = BulkVisitResultSerializer(many=True)
@@ -1,5 +1,7 @@
+from django.db.models import prefetch_related_objects
 from rest_framework import serializers
 from apps.visits.models import Visit, VisitType, VisitAssignment
+from common.mixins.sparse_fieldsets import SparseFieldsetsMixin
 
 
 class VisitTypeSerializer(serializers.ModelSerializer):
@@ -21,7 +23,40 @@ class AssignedNurseSerializer(serializers.Serializer):
     assignment_status = serializers.CharField(source="status")
 
 
-class VisitSerializer(serializers.ModelSerializer):
+# Serializer field → relation it reads; only rendered fields' relations are joined
+VISIT_FIELD_RELATIONS = {
+    "dependent_name":     "dependent",
+    "visit_type_name":    "visit_type",
+    "hospital_name":      "hospital",
+    "requested_by_email": "requested_by",
+    "assigned_nurse":     "current_assignment__nurse",
+}
+
+
+def visit_relations(selected=None) -> list:
+    """select_related() paths for a VisitSerializer field set (None = every field)."""
+    return [
+        relation for field, relation in VISIT_FIELD_RELATIONS.items()
+        if selected is None or field in selected
+    ]
+
+
+class VisitListSerializer(serializers.ListSerializer):
+    """
+    Used automatically for VisitSerializer(many=True).
+    Batches the assigned-nurse lookup (via the current_assignment pointer)
+    so a list costs the same number of queries whatever its length.
+    """
+
+    def to_representation(self, data):
+        visits = list(data.all() if hasattr(data, "all") else data)
+        selected = self.context.get("sparse_fields")
+        if selected is None or "assigned_nurse" in selected:
+            prefetch_related_objects(visits, "current_assignment__nurse")
+        return super().to_representation(visits)
+
+
+class VisitSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     dependent_name     = serializers.CharField(source="dependent.full_name", read_only=True)
     visit_type_name    = serializers.CharField(source="visit_type.name", read_only=True)
     hospital_name      = serializers.CharField(source="hospital.name", read_only=True)
@@ -34,6 +69,7 @@ class VisitSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Visit
+        list_serializer_class = VisitListSerializer
         fields = [
             "id",
             "hospital",
@@ -63,6 +99,8 @@ class VisitSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
         ]
+        # Dropped with ?expand= (empty) or when not named in ?fields=
+        expandable_fields = ["assigned_nurse"]
         read_only_fields = [
             "id", "requested_by", "status",
             "scheduled_at",
@@ -72,12 +110,8 @@ class VisitSerializer(serializers.ModelSerializer):
         ]
 
     def get_assigned_nurse(self, visit):
-        assignment = visit.assignments.filter(
-            status__in=[
-                VisitAssignment.AssignmentStatus.PENDING,
-                VisitAssignment.AssignmentStatus.ACCEPTED,
-            ]
-        ).select_related("nurse").first()
+        # Denormalized pointer — select_related/prefetch "current_assignment__nurse"
+        assignment = visit.current_assignment
         if not assignment:
             return None
         return AssignedNurseSerializer(assignment).data
@@ -0,0 +1,186 @@
+"""
+Bulk dispatch: schedule or assign many visits in one call.
+
+The single-visit services run a handful of queries and a save per visit.
+These do the same checks for the whole batch up front with set-based
+queries, then apply every valid item with one bulk_update inside one
+transaction:
+
+    bulk_schedule_visits — REQUESTED → SCHEDULED
+        1 SELECT ... FOR UPDATE for the visits, 1 bulk UPDATE,
+        1 bulk INSERT of VisitEvents
+    bulk_assign_nurses   — SCHEDULED → ASSIGNED
+        1 SELECT ... FOR UPDATE for the visits, 1 membership query for the
+        nurses, 1 UPDATE cancelling stale pending assignments,
+        1 bulk INSERT of assignments, 1 bulk UPDATE of the visits,
+        1 bulk INSERT of VisitEvents
+
+Items are independent: an invalid item is reported and skipped, the rest
+are applied. Each result is
+    {"visit_id": ..., "success": True,  "visit": Visit}
+    {"visit_id": ..., "success": False, "error": "..."}
+in the same order as the input.
+"""
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import APIException
+
+from apps.visits.models import Visit, VisitAssignment, VisitEvent
+from apps.visits.state_machine import check_transition, build_event
+from apps.analytics.services.analytics_cache import invalidate_hospital_analytics
+from apps.visits.services.visit_service import _schedule_fields
+from apps.hospitals.models import HospitalMembership
+
+
+def _error_message(exc: APIException) -> str:
+    detail = exc.detail
+    if isinstance(detail, list) and len(detail) == 1:
+        detail = detail[0]
+    return str(detail)
+
+
+def _lock_visits(items: list) -> dict:
+    # Related rows are joined for the response serializer but only the
+    # visits themselves are locked.
+    return Visit.objects.select_related(
+        "dependent", "visit_type", "hospital", "requested_by",
+    ).select_for_update(of=("self",)).in_bulk(
+        {item["visit_id"] for item in items}
+    )
+
+
+def _prevalidate(item, visits: dict, seen: set) -> str | None:
+    visit_id = item["visit_id"]
+    if visit_id in seen:
+        return "Duplicate visit in this request."
+    seen.add(visit_id)
+    if visit_id not in visits:
+        return "Visit not found."
+    return None
+
+
+@transaction.atomic
+def bulk_schedule_visits(items: list, triggered_by) -> list:
+    """
+    items: [{"visit_id": UUID, "scheduled_at": datetime}, ...]
+    Same rules as schedule_visit(), checked per item.
+    """
+    now = timezone.now()
+    visits = _lock_visits(items)
+
+    results, to_update, events, seen = [], [], [], set()
+    for item in items:
+        visit_id = item["visit_id"]
+        error = _prevalidate(item, visits, seen)
+        if error:
+            results.append({"visit_id": visit_id, "success": False, "error": error})
+            continue
+
+        visit = visits[visit_id]
+        if visit.status != Visit.Status.REQUESTED:
+            # ASSIGNED → SCHEDULED is the nurse-reject path, not scheduling
+            results.append({
+                "visit_id": visit_id,
+                "success": False,
+                "error": "Only requested visits can be scheduled.",
+            })
+            continue
+
+        try:
+            role = check_transition(visit, Visit.Status.SCHEDULED, triggered_by)
+            fields = _schedule_fields(visit, item["scheduled_at"], now)
+        except APIException as exc:
+            results.append({"visit_id": visit_id, "success": False, "error": _error_message(exc)})
+            continue
+
+        events.append(build_event(visit, Visit.Status.SCHEDULED, triggered_by, role, now))
+
+        for name, value in fields.items():
+            setattr(visit, name, value)
+        visit.status     = Visit.Status.SCHEDULED
+        visit.updated_at = now   # bulk_update skips auto_now
+        to_update.append(visit)
+        results.append({"visit_id": visit_id, "success": True, "visit": visit})
+
+    Visit.objects.bulk_update(to_update, fields=[
+        "scheduled_at",
+        "guardian_response",
+        "guardian_response_at",
+        "guardian_response_deadline",
+        "status",
+        "updated_at",
+    ])
+    VisitEvent.objects.bulk_create(events)
+    invalidate_hospital_analytics(*{visit.hospital_id for visit in to_update})
+    return results
+
+
+@transaction.atomic
+def bulk_assign_nurses(items: list, assigned_by) -> list:
+    """
+    items: [{"visit_id": UUID, "nurse_id": UUID}, ...]
+    Same rules as assign_nurse(), checked per item.
+    """
+    now = timezone.now()
+    visits = _lock_visits(items)
+
+    # (nurse_id, hospital_id) pairs for every active nurse membership in the batch
+    nurse_hospitals = set(
+        HospitalMembership.objects.filter(
+            user_id__in={item["nurse_id"] for item in items},
+            role=HospitalMembership.Role.NURSE,
+            is_active=True,
+        ).values_list("user_id", "hospital_id")
+    )
+
+    results, to_update, assignments, events, seen = [], [], [], [], set()
+    for item in items:
+        visit_id = item["visit_id"]
+        error = _prevalidate(item, visits, seen)
+        if error:
+            results.append({"visit_id": visit_id, "success": False, "error": error})
+            continue
+
+        visit = visits[visit_id]
+        try:
+            role = check_transition(visit, Visit.Status.ASSIGNED, assigned_by)
+        except APIException as exc:
+            results.append({"visit_id": visit_id, "success": False, "error": _error_message(exc)})
+            continue
+
+        if (item["nurse_id"], visit.hospital_id) not in nurse_hospitals:
+            results.append({
+                "visit_id": visit_id,
+                "success": False,
+                "error": "This nurse does not belong to this hospital.",
+            })
+            continue
+
+        assignment = VisitAssignment(
+            visit=visit,
+            nurse_id=item["nurse_id"],
+            assigned_by=assigned_by,
+        )
+        assignments.append(assignment)
+        events.append(build_event(visit, Visit.Status.ASSIGNED, assigned_by, role, now))
+
+        visit.status             = Visit.Status.ASSIGNED
+        visit.current_assignment = assignment
+        visit.current_nurse_id   = item["nurse_id"]
+        visit.updated_at         = now
+        to_update.append(visit)
+        results.append({"visit_id": visit_id, "success": True, "visit": visit})
+
+    VisitAssignment.objects.filter(
+        visit__in=to_update,
+        status=VisitAssignment.AssignmentStatus.PENDING,
+    ).update(status=VisitAssignment.AssignmentStatus.CANCELLED, updated_at=now)
+
+    VisitAssignment.objects.bulk_create(assignments)
+    Visit.objects.bulk_update(to_update, fields=[
+        "status", "current_assignment", "current_nurse", "updated_at",
+    ])
+    VisitEvent.objects.bulk_create(events)
+    invalidate_hospital_analytics(*{visit.hospital_id for visit in to_update})
+    return results
@@ -0,0 +1,124 @@
+"""
+Role-scoped visit feed with keyset (cursor) pagination.
+
+A user can see a visit for three independent reasons:
+- guardian of the visit's dependent
+- nurse with an assignment on the visit (any assignment status)
+- hospital admin / medical admin of the visit's hospital
+
+Each scope is its own indexed query and the three are combined with UNION,
+so the database never builds the OR'd join + DISTINCT over every visit
+the user can reach. Pages are ordered newest first by (created_at, id)
+and the cursor is the (created_at, id) of the last row on the page —
+stable under concurrent inserts, and no OFFSET scans on deep pages.
+
+Only one page of visits is ever held in memory.
+"""
+
+from django.db import connection
+from django.db.models import Q
+
+from apps.visits.models import Visit, VisitAssignment
+from apps.hospitals.models import HospitalMembership
+from apps.dependents.models import Guardianship
+from common.pagination import encode_cursor, decode_cursor
+
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+FEED_ORDERING = ["-created_at", "-id"]
+
+
+def _scope_querysets(user) -> list:
+    """One queryset per role scope. Lookups stay as subqueries — no Python id lists."""
+    dependent_ids = Guardianship.objects.filter(
+        user=user, is_active=True,
+    ).values("dependent_id")
+
+    assigned_visit_ids = VisitAssignment.objects.filter(
+        nurse=user,
+    ).values("visit_id")
+
+    admin_hospital_ids = HospitalMembership.objects.filter(
+        user=user,
+        is_active=True,
+        role__in=[
+            HospitalMembership.Role.HOSPITAL_ADMIN,
+            HospitalMembership.Role.MEDICAL_ADMIN,
+        ],
+    ).values("hospital_id")
+
+    return [
+        Visit.objects.filter(dependent_id__in=dependent_ids),    # as guardian
+        Visit.objects.filter(id__in=assigned_visit_ids),         # as nurse
+        Visit.objects.filter(hospital_id__in=admin_hospital_ids),  # as admin
+    ]
+
+
+def _page_keys(user, after: tuple | None, limit: int) -> list:
+    """
+    (id, created_at) of the next `limit` visits after the cursor, as one UNION query.
+    Where the backend allows it (PostgreSQL), each branch is ordered and limited
+    on its own so every scope stops reading after `limit` index entries.
+    """
+    branches = []
+    for qs in _scope_querysets(user):
+        if after:
+            created_at, visit_id = after
+            qs = qs.filter(
+                Q(created_at__lt=created_at) |
+                Q(created_at=created_at, id__lt=visit_id)
+            )
+        qs = qs.values("id", "created_at")
+        if connection.features.supports_slicing_ordering_in_compound:
+            qs = qs.order_by(*FEED_ORDERING)[:limit]
+        else:
+            qs = qs.order_by()
+        branches.append(qs)
+
+    first, *rest = branches
+    return list(first.union(*rest).order_by(*FEED_ORDERING)[:limit])
+
+
+FEED_RELATED = ["dependent", "visit_type", "hospital", "requested_by"]
+
+
+def get_visit_feed_page(
+    user, cursor: str | None = None, page_size: int = DEFAULT_PAGE_SIZE, related=FEED_RELATED,
+) -> tuple:
+    """
+    Returns (visits, next_cursor) for one page of the user's visit feed.
+    next_cursor is None on the last page.
+    related: select_related() paths for the page's visits (empty: no joins).
+    """
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    after = decode_cursor(cursor) if cursor else None
+
+    # Fetch one extra key to know whether another page exists
+    keys = _page_keys(user, after, page_size + 1)
+    has_next = len(keys) > page_size
+    keys = keys[:page_size]
+
+    visits = Visit.objects.all()
+    if related:
+        # select_related() with no arguments would follow every non-null FK
+        visits = visits.select_related(*related)
+    visits_by_id = visits.in_bulk([k["id"] for k in keys])
+    visits = [visits_by_id[k["id"]] for k in keys if k["id"] in visits_by_id]
+
+    next_cursor = None
+    if has_next:
+        next_cursor = encode_cursor(keys[-1]["created_at"], keys[-1]["id"])
+    return visits, next_cursor
+
+
+def iter_visit_feed(user, page_size: int = DEFAULT_PAGE_SIZE):
+    """Yields the user's whole feed page by page (exports, background jobs)."""
+    cursor = None
+    while True:
+        visits, cursor = get_visit_feed_page(user, cursor=cursor, page_size=page_size)
+        if visits:
+            yield visits
+        if not cursor:
+            return
@@ -6,17 +6,26 @@ CHANGES:
 - NEW confirm_visit: guardian confirms the scheduled time
 - NEW cancel_by_guardian: guardian rejects scheduled time → visit cancelled
 - NEW auto_confirm_visit: called by a scheduled task when deadline passes
+- NEW auto_confirm_expired_visits: batched sweep (SKIP LOCKED chunks + bulk UPDATE)
+- Visit.current_assignment / current_nurse kept in sync by assign_nurse,
+  accept_visit, reject_assignment and cancel_by_guardian (same transaction)
+- transition() is a conditional UPDATE on (status, current_assignment);
+  services that write before calling it are atomic so a TransitionConflict
+  rolls their writes back too, and the pointer itself is only moved after it
 """
 
+import time
 from datetime import timedelta
 from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 from rest_framework.exceptions import ValidationError, PermissionDenied
 
-from apps.visits.models import Visit, VisitAssignment
+from apps.visits.models import Visit, VisitAssignment, VisitEvent
 from apps.visits.state_machine import transition, get_user_role_in_hospital
 from apps.hospitals.models import HospitalMembership
-from apps.dependents.models import Guardianship
+from common.permissions.access_context import get_access_context
+from apps.analytics.services.analytics_cache import invalidate_hospital_analytics
 
 
 def create_visit(validated_data: dict, requested_by) -> Visit:
@@ -28,9 +37,7 @@ def create_visit(validated_data: dict, requested_by) -> Visit:
     dependent  = validated_data["dependent"]
     visit_type = validated_data["visit_type"]
 
-    is_guardian = Guardianship.objects.filter(
-        user=requested_by, dependent=dependent, is_active=True,
-    ).exists()
+    is_guardian = get_access_context(requested_by).is_guardian_of(dependent.pk)
     if not is_guardian:
         raise PermissionDenied("You are not a guardian of this dependent.")
 
@@ -40,13 +47,25 @@ def create_visit(validated_data: dict, requested_by) -> Visit:
     if visit_type.hospital_id != hospital.id:
         raise ValidationError("This visit type does not belong to the selected hospital.")
 
-    return Visit.objects.create(
-        **validated_data,
-        requested_by=requested_by,
-        status=Visit.Status.REQUESTED,
-    )
+    with transaction.atomic():
+        visit = Visit.objects.create(
+            **validated_data,
+            requested_by=requested_by,
+            status=Visit.Status.REQUESTED,
+        )
+        VisitEvent.objects.create(
+            visit=visit,
+            hospital=hospital,
+            to_status=Visit.Status.REQUESTED,
+            actor=requested_by,
+            role="guardian",
+            occurred_at=visit.created_at,
+        )
+        invalidate_hospital_analytics(hospital)
+    return visit
 
 
+@transaction.atomic
 def schedule_visit(visit: Visit, scheduled_at, triggered_by) -> Visit:
     """
     Admin schedules a visit — REQUESTED → SCHEDULED.
@@ -63,8 +82,19 @@ def schedule_visit(visit: Visit, scheduled_at, triggered_by) -> Visit:
 
     Nurse assignment is NOT blocked — admin can assign in parallel.
     """
-    now = timezone.now()
+    fields = _schedule_fields(visit, scheduled_at, timezone.now())
+    for name, value in fields.items():
+        setattr(visit, name, value)
+    visit.save(update_fields=[*fields, "updated_at"])
 
+    return transition(visit, Visit.Status.SCHEDULED, triggered_by)
+
+
+def _schedule_fields(visit: Visit, scheduled_at, now) -> dict:
+    """
+    Validates the scheduling rules and returns the field values to apply.
+    Shared by schedule_visit() and bulk_service.bulk_schedule_visits().
+    """
     schedule_within_hours  = getattr(settings, "VISIT_SCHEDULE_WITHIN_HOURS",    24)
     confirmation_hours     = getattr(settings, "VISIT_CONFIRMATION_HOURS",       24)
     buffer_hours           = getattr(settings, "VISIT_CONFIRMATION_BUFFER_HOURS", 2)
@@ -98,19 +128,12 @@ def schedule_visit(visit: Visit, scheduled_at, triggered_by) -> Visit:
         guardian_response    = Visit.GuardianResponse.PENDING
         guardian_response_at = None
 
-    visit.scheduled_at               = scheduled_at
-    visit.guardian_response          = guardian_response
-    visit.guardian_response_at       = guardian_response_at
-    visit.guardian_response_deadline = deadline
-    visit.save(update_fields=[
-        "scheduled_at",
-        "guardian_response",
-        "guardian_response_at",
-        "guardian_response_deadline",
-        "updated_at",
-    ])
-
-    return transition(visit, Visit.Status.SCHEDULED, triggered_by)
+    return {
+        "scheduled_at":               scheduled_at,
+        "guardian_response":          guardian_response,
+        "guardian_response_at":       guardian_response_at,
+        "guardian_response_deadline": deadline,
+    }
 
 
 def confirm_visit(visit: Visit, guardian) -> Visit:
@@ -125,11 +148,7 @@ def confirm_visit(visit: Visit, guardian) -> Visit:
     After confirmation visit continues in its normal lifecycle.
     If a nurse is already assigned, nothing changes — they proceed.
     """
-    is_guardian = Guardianship.objects.filter(
-        user=guardian,
-        dependent=visit.dependent,
-        is_active=True,
-    ).exists()
+    is_guardian = get_access_context(guardian).is_guardian_of(visit.dependent_id)
     if not is_guardian:
         raise PermissionDenied("You are not a guardian of this dependent.")
 
@@ -153,6 +172,7 @@ def confirm_visit(visit: Visit, guardian) -> Visit:
     return visit
 
 
+@transaction.atomic
 def cancel_by_guardian(visit: Visit, guardian, reason: str = "") -> Visit:
     """
     Guardian rejects the scheduled time → visit CANCELLED.
@@ -164,11 +184,7 @@ def cancel_by_guardian(visit: Visit, guardian, reason: str = "") -> Visit:
     - Only works if guardian_response is PENDING.
     - Cannot cancel once visit is STARTED or beyond.
     """
-    is_guardian = Guardianship.objects.filter(
-        user=guardian,
-        dependent=visit.dependent,
-        is_active=True,
-    ).exists()
+    is_guardian = get_access_context(guardian).is_guardian_of(visit.dependent_id)
     if not is_guardian:
         raise PermissionDenied("You are not a guardian of this dependent.")
 
@@ -194,33 +210,31 @@ def cancel_by_guardian(visit: Visit, guardian, reason: str = "") -> Visit:
         ],
     ).update(status=VisitAssignment.AssignmentStatus.CANCELLED)
 
+    transition(visit, Visit.Status.CANCELLED, guardian)
+
     visit.guardian_response    = Visit.GuardianResponse.CANCELLED
     visit.guardian_response_at = timezone.now()
     visit.cancelled_by         = guardian
     visit.cancellation_reason  = reason or "Guardian rejected scheduled time."
+    visit.current_assignment   = None
+    visit.current_nurse        = None
     visit.save(update_fields=[
         "guardian_response", "guardian_response_at",
-        "cancelled_by", "cancellation_reason", "updated_at",
+        "cancelled_by", "cancellation_reason",
+        "current_assignment", "current_nurse", "updated_at",
     ])
 
-    return transition(visit, Visit.Status.CANCELLED, guardian)
+    return visit
 
 
 def auto_confirm_visit(visit: Visit) -> Visit:
     """
-    Called by a scheduled task (e.g. Celery beat) when guardian_response_deadline passes.
+    Auto-confirms a single visit once guardian_response_deadline passes.
     If guardian hasn't responded, visit is auto-confirmed and proceeds normally.
+    The scheduled sweep over all expired visits is auto_confirm_expired_visits().
 
     TODO (notifications): before auto-confirming, send a final reminder notification
     to the guardian X hours before the deadline.
-
-    TODO (scheduled task): wire this up in a Celery periodic task:
-        - Query Visit.objects.filter(
-              guardian_response=GuardianResponse.PENDING,
-              guardian_response_deadline__lte=timezone.now(),
-              status__in=[SCHEDULED, ASSIGNED, ACCEPTED],
-          )
-        - Call auto_confirm_visit() on each result.
     """
     if visit.guardian_response != Visit.GuardianResponse.PENDING:
         return visit  # already responded, nothing to do
@@ -234,6 +248,61 @@ def auto_confirm_visit(visit: Visit) -> Visit:
     return visit
 
 
+def auto_confirm_expired_visits(batch_size: int | None = None, max_batches: int | None = None) -> dict:
+    """
+    Sweep: auto-confirms every visit whose guardian_response_deadline has passed.
+    Entry point for the scheduler (cron, Celery beat) and the
+    `auto_confirm_visits` management command.
+
+    Works in chunks, each in its own transaction:
+      1. SELECT ... FOR UPDATE SKIP LOCKED the next `batch_size` expired ids
+      2. one bulk UPDATE for the whole chunk
+    Rows locked by another worker are skipped, so several workers can drain
+    the same backlog in parallel without double-processing.
+    (SKIP LOCKED is a no-op on SQLite — fine for dev, single worker.)
+
+    Returns {"processed": int, "batches": int, "elapsed_seconds": float}.
+    """
+    batch_size = batch_size or getattr(settings, "VISIT_AUTO_CONFIRM_BATCH_SIZE", 500)
+    started = time.monotonic()
+    processed = 0
+    batches = 0
+
+    while max_batches is None or batches < max_batches:
+        now = timezone.now()
+        with transaction.atomic():
+            ids = list(
+                Visit.objects.select_for_update(skip_locked=True)
+                .filter(
+                    guardian_response=Visit.GuardianResponse.PENDING,
+                    guardian_response_deadline__lte=now,
+                    status__in=[
+                        Visit.Status.SCHEDULED,
+                        Visit.Status.ASSIGNED,
+                        Visit.Status.ACCEPTED,
+                    ],
+                )
+                .order_by("guardian_response_deadline")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+
+            processed += Visit.objects.filter(id__in=ids).update(
+                guardian_response=Visit.GuardianResponse.AUTO_CONFIRMED,
+                guardian_response_at=now,
+                updated_at=now,   # .update() skips auto_now
+            )
+        batches += 1
+
+    return {
+        "processed": processed,
+        "batches": batches,
+        "elapsed_seconds": round(time.monotonic() - started, 3),
+    }
+
+
+@transaction.atomic
 def assign_nurse(visit: Visit, nurse, assigned_by) -> VisitAssignment:
     """
     Admin assigns a nurse — SCHEDULED → ASSIGNED.
@@ -258,20 +327,33 @@ def assign_nurse(visit: Visit, nurse, assigned_by) -> VisitAssignment:
 
     transition(visit, Visit.Status.ASSIGNED, assigned_by)
 
-    return VisitAssignment.objects.create(
+    assignment = VisitAssignment.objects.create(
         visit=visit,
         nurse=nurse,
         assigned_by=assigned_by,
     )
 
+    visit.current_assignment = assignment
+    visit.current_nurse      = nurse
+    visit.save(update_fields=["current_assignment", "current_nurse", "updated_at"])
+
+    return assignment
 
+
+def _pending_assignment_for(visit: Visit, nurse) -> VisitAssignment | None:
+    """The nurse's current assignment if it is still awaiting their response."""
+    if visit.current_nurse_id != nurse.id:
+        return None
+    assignment = visit.current_assignment
+    if assignment.status != VisitAssignment.AssignmentStatus.PENDING:
+        return None
+    return assignment
+
+
+@transaction.atomic
 def accept_visit(visit: Visit, nurse) -> Visit:
     """Nurse accepts — ASSIGNED → ACCEPTED."""
-    assignment = VisitAssignment.objects.filter(
-        visit=visit,
-        nurse=nurse,
-        status=VisitAssignment.AssignmentStatus.PENDING,
-    ).first()
+    assignment = _pending_assignment_for(visit, nurse)
     if not assignment:
         raise PermissionDenied("You are not the assigned nurse for this visit.")
 
@@ -282,13 +364,10 @@ def accept_visit(visit: Visit, nurse) -> Visit:
     return transition(visit, Visit.Status.ACCEPTED, nurse)
 
 
+@transaction.atomic
 def reject_assignment(visit: Visit, nurse, reason: str = "") -> Visit:
     """Nurse rejects — back to SCHEDULED so admin can reassign."""
-    assignment = VisitAssignment.objects.filter(
-        visit=visit,
-        nurse=nurse,
-        status=VisitAssignment.AssignmentStatus.PENDING,
-    ).first()
+    assignment = _pending_assignment_for(visit, nurse)
     if not assignment:
         raise PermissionDenied("You are not the assigned nurse for this visit.")
 
@@ -297,27 +376,25 @@ def reject_assignment(visit: Visit, nurse, reason: str = "") -> Visit:
     assignment.rejected_at      = timezone.now()
     assignment.save(update_fields=["status", "rejection_reason", "rejected_at", "updated_at"])
 
-    return transition(visit, Visit.Status.SCHEDULED, nurse)
+    transition(visit, Visit.Status.SCHEDULED, nurse)
+
+    visit.current_assignment = None
+    visit.current_nurse      = None
+    visit.save(update_fields=["current_assignment", "current_nurse", "updated_at"])
+
+    return visit
 
 
 def start_visit(visit: Visit, nurse) -> Visit:
     """Nurse starts — ACCEPTED → STARTED."""
-    assignment = VisitAssignment.objects.filter(
-        visit=visit, nurse=nurse,
-        status=VisitAssignment.AssignmentStatus.ACCEPTED,
-    ).first()
-    if not assignment:
+    if not visit.is_accepted_nurse(nurse):
         raise PermissionDenied("You are not the accepted nurse for this visit.")
     return transition(visit, Visit.Status.STARTED, nurse)
 
 
 def complete_visit(visit: Visit, nurse) -> Visit:
     """Nurse completes — STARTED → COMPLETED."""
-    assignment = VisitAssignment.objects.filter(
-        visit=visit, nurse=nurse,
-        status=VisitAssignment.AssignmentStatus.ACCEPTED,
-    ).first()
-    if not assignment:
+    if not visit.is_accepted_nurse(nurse):
         raise PermissionDenied("You are not the accepted nurse for this visit.")
     return transition(visit, Visit.Status.COMPLETED, nurse)
 
@@ -327,9 +404,10 @@ def mark_report_submitted(visit: Visit, nurse) -> Visit:
     return transition(visit, Visit.Status.REPORT_SUBMITTED, nurse)
 
 
+@transaction.atomic
 def cancel_visit(visit: Visit, cancelled_by, reason: str = "") -> Visit:
     """Admin cancels. For guardian cancellation use cancel_by_guardian()."""
-    role = get_user_role_in_hospital(cancelled_by, visit.hospital)
+    role = get_user_role_in_hospital(cancelled_by, visit.hospital_id)
 
     if role == "hospital_admin":
         if not reason:
@@ -7,11 +7,22 @@ CHANGES:
   See visit_service.cancel_by_guardian() for that logic.
 """
 
+from django.db import transaction
 from django.utils import timezone
-from rest_framework.exceptions import ValidationError, PermissionDenied
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError, PermissionDenied
 
 from apps.visits.models.visit import Visit
-from apps.hospitals.models import HospitalMembership
+from apps.visits.models.visit_event import VisitEvent
+from common.permissions.access_context import get_access_context
+from apps.analytics.services.analytics_cache import invalidate_hospital_analytics
+
+
+class TransitionConflict(APIException):
+    """The visit's status changed between read and write — the caller should reload and retry."""
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "This visit was changed by another request. Reload it and try again."
+    default_code = "transition_conflict"
 
 
 VALID_TRANSITIONS = {
@@ -47,19 +58,22 @@ TRANSITION_PERMISSIONS = {
 
 
 def get_user_role_in_hospital(user, hospital) -> str | None:
-    membership = HospitalMembership.objects.filter(
-        user=user,
-        hospital=hospital,
-        is_active=True,
-    ).first()
+    """Accepts a Hospital or a hospital id. Served from the per-request access context."""
+    hospital_id = getattr(hospital, "pk", hospital)
+    role = get_access_context(user).role_in(hospital_id)
 
-    if membership:
-        return membership.role  
+    if role:
+        return role
 
     return "guardian"  
 
 
-def transition(visit: Visit, new_status: str, triggered_by) -> Visit:  
+def check_transition(visit: Visit, new_status: str, triggered_by) -> str:
+    """
+    Raises ValidationError / PermissionDenied if `triggered_by` may not move
+    `visit` to `new_status`; otherwise returns the role they act in.
+    Does not save — transition() and the bulk dispatch services both go through here.
+    """
     current = visit.status
 
     # 1. Is this transition valid at all?
@@ -71,7 +85,7 @@ def transition(visit: Visit, new_status: str, triggered_by) -> Visit:
         )
 
     # 2. Does this user have the right role to trigger this transition?
-    role = get_user_role_in_hospital(triggered_by, visit.hospital)
+    role = get_user_role_in_hospital(triggered_by, visit.hospital_id)
     allowed_roles = TRANSITION_PERMISSIONS.get((current, new_status), [])
 
     if role not in allowed_roles:
@@ -80,8 +94,60 @@ def transition(visit: Visit, new_status: str, triggered_by) -> Visit:
             f"Required: {allowed_roles}."
         )
 
-    # 3. Apply the transition
-    visit.status = new_status
-    visit.save(update_fields=["status", "updated_at"])
+    return role
+
+
+def build_event(visit: Visit, new_status: str, actor, role: str, occurred_at) -> VisitEvent:
+    """Unsaved event row for a transition of `visit` (still in its old status)."""
+    return VisitEvent(
+        visit_id=visit.id,
+        hospital_id=visit.hospital_id,
+        from_status=visit.status,
+        to_status=new_status,
+        actor=actor,
+        role=role,
+        occurred_at=occurred_at,
+    )
+
+
+def transition(visit: Visit, new_status: str, triggered_by) -> Visit:  
+    """
+    Optimistic concurrency: the write is a conditional
+        UPDATE visits SET status = new
+        WHERE id = ? AND status = <status we validated>
+                     AND current_assignment_id = <assignment we validated>
+    so of two concurrent requests validated against the same state only
+    one matches a row; the other gets TransitionConflict (409) instead of
+    silently overwriting. No row lock is held while validating.
+
+    Status alone is not enough: ASSIGNED → SCHEDULED → ASSIGNED (nurse
+    rejects, admin reassigns) returns to the same status with a different
+    assignment, and a request validated against the first one would still
+    match. Every reassignment creates a new assignment row, so the pair
+    identifies the state. Callers that change the pointer do it after
+    transition(), in the same transaction.
+
+    The VisitEvent row is written in the same transaction as the update,
+    and the hospital's cached analytics are invalidated when it commits.
+    """
+    role = check_transition(visit, new_status, triggered_by)
+
+    now = timezone.now()
+    with transaction.atomic(savepoint=False):
+        updated = Visit.objects.filter(
+            id=visit.id,
+            status=visit.status,
+            current_assignment_id=visit.current_assignment_id,
+        ).update(
+            status=new_status,
+            updated_at=now,   # .update() skips auto_now
+        )
+        if not updated:
+            raise TransitionConflict()
+        build_event(visit, new_status, triggered_by, role, now).save()
+        invalidate_hospital_analytics(visit.hospital_id)
+
+    visit.status     = new_status
+    visit.updated_at = now
 
     return visit
\ No newline at end of file
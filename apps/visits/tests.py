@@ -0,0 +1,411 @@
+import uuid
+from datetime import timedelta
+from unittest import mock, skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.dependents.models import Dependent, Guardianship
+from apps.hospitals.models import Hospital, HospitalMembership
+from apps.visits.models import Visit, VisitType, VisitAssignment, VisitEvent
+from apps.visits.serializers.scheduling import BULK_MAX_ITEMS
+from apps.visits.serializers.visit import VisitSerializer
+from apps.visits.services import visit_service
+from apps.visits.state_machine import TransitionConflict
+
+
+class VisitFixtureMixin:
+    """A hospital with an admin and two nurses, and a guardian with one dependent."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.hospital = Hospital.objects.create(
+            name="General", registration_number="VF-1", email="general@example.com",
+            status=Hospital.Status.ACTIVE,
+        )
+        cls.visit_type = VisitType.objects.create(hospital=cls.hospital, name="Checkup")
+        cls.dependent  = Dependent.objects.create(first_name="Dep", last_name="One")
+        cls.guardian = cls._user("guardian")
+        cls.admin    = cls._user("admin")
+        cls.nurse    = cls._user("nurse")
+        cls.nurse2   = cls._user("nurse2")
+        HospitalMembership.objects.create(
+            user=cls.admin, hospital=cls.hospital, role=HospitalMembership.Role.HOSPITAL_ADMIN,
+        )
+        for nurse in (cls.nurse, cls.nurse2):
+            HospitalMembership.objects.create(
+                user=nurse, hospital=cls.hospital, role=HospitalMembership.Role.NURSE,
+            )
+
+    @classmethod
+    def _user(cls, name):
+        return User.objects.create_user(
+            email=f"{name}@example.com", password="pw", first_name=name, last_name="Test",
+        )
+
+    def _fresh(self, user):
+        """A new instance, as DRF authenticates one per request (no cached access context)."""
+        return User.objects.get(pk=user.pk)
+
+    def _client(self, user):
+        client = APIClient()
+        client.force_authenticate(self._fresh(user))
+        return client
+
+    def _visit(self, **fields):
+        return Visit.objects.create(
+            hospital=self.hospital, dependent=self.dependent, visit_type=self.visit_type,
+            requested_by=self.guardian, address="1 Main St", **fields,
+        )
+
+
+class VisitListSerializerQueryCountTests(TestCase):
+    """VisitSerializer(many=True) must not query per visit for assigned_nurse."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.hospital = Hospital.objects.create(
+            name="General", registration_number="QC-1", email="general@example.com",
+        )
+        cls.visit_type = VisitType.objects.create(hospital=cls.hospital, name="Checkup")
+        cls.dependent  = Dependent.objects.create(first_name="Dep", last_name="One")
+        cls.guardian   = User.objects.create_user(
+            email="guardian@example.com", password="pw", first_name="G", last_name="One",
+        )
+        cls.admin = User.objects.create_user(
+            email="admin@example.com", password="pw", first_name="A", last_name="One",
+        )
+        cls.nurses = [
+            User.objects.create_user(
+                email=f"nurse{i}@example.com", password="pw", first_name="N", last_name=str(i),
+            )
+            for i in range(3)
+        ]
+
+    def _seed(self, n):
+        visits = Visit.objects.bulk_create([
+            Visit(
+                hospital=self.hospital, dependent=self.dependent, visit_type=self.visit_type,
+                requested_by=self.guardian, address="1 Main St",
+                status=Visit.Status.ASSIGNED,
+            )
+            for _ in range(n)
+        ])
+        # Every other visit has a current assignment, spread over several nurses
+        assigned = visits[::2]
+        assignments = VisitAssignment.objects.bulk_create([
+            VisitAssignment(
+                visit=visit, nurse=self.nurses[i % len(self.nurses)], assigned_by=self.admin,
+            )
+            for i, visit in enumerate(assigned)
+        ])
+        for visit, assignment in zip(assigned, assignments):
+            visit.current_assignment = assignment
+            visit.current_nurse      = assignment.nurse
+        Visit.objects.bulk_update(assigned, ["current_assignment", "current_nurse"])
+
+    def _serialize(self):
+        qs = Visit.objects.select_related("dependent", "visit_type", "hospital", "requested_by")
+        return VisitSerializer(qs, many=True).data
+
+    def test_constant_query_count(self):
+        for n in (1, 100, 1000):
+            with self.subTest(visits=n):
+                Visit.objects.all().delete()
+                self._seed(n)
+                # visits + current assignments + their nurses
+                with self.assertNumQueries(3):
+                    data = self._serialize()
+                self.assertEqual(len(data), n)
+                self.assertEqual(sum(1 for row in data if row["assigned_nurse"]), (n + 1) // 2)
+
+    def test_assigned_nurse_payload(self):
+        self._seed(1)
+        row = self._serialize()[0]
+        self.assertEqual(row["assigned_nurse"]["nurse_id"], str(self.nurses[0].id))
+        self.assertEqual(row["assigned_nurse"]["assignment_status"], VisitAssignment.AssignmentStatus.PENDING)
+
+
+class AutoConfirmSweepTests(VisitFixtureMixin, TestCase):
+
+    def setUp(self):
+        past, future = timezone.now() - timedelta(hours=1), timezone.now() + timedelta(hours=1)
+        pending = Visit.GuardianResponse.PENDING
+        self.expired = [
+            self._visit(status=Visit.Status.SCHEDULED, guardian_response=pending, guardian_response_deadline=past)
+            for _ in range(7)
+        ]
+        self.untouched = [
+            self._visit(status=Visit.Status.SCHEDULED, guardian_response=pending, guardian_response_deadline=future),
+            self._visit(
+                status=Visit.Status.SCHEDULED, guardian_response=Visit.GuardianResponse.CONFIRMED,
+                guardian_response_deadline=past,
+            ),
+            self._visit(status=Visit.Status.CANCELLED, guardian_response=pending, guardian_response_deadline=past),
+        ]
+
+    def _responses(self, visits):
+        return set(Visit.objects.filter(pk__in=[v.pk for v in visits]).values_list("guardian_response", flat=True))
+
+    def test_sweeps_every_expired_visit_in_batches(self):
+        result = visit_service.auto_confirm_expired_visits(batch_size=3)
+
+        self.assertEqual((result["processed"], result["batches"]), (7, 3))
+        self.assertEqual(self._responses(self.expired), {Visit.GuardianResponse.AUTO_CONFIRMED})
+        self.assertFalse(
+            Visit.objects.filter(pk__in=[v.pk for v in self.expired], guardian_response_at__isnull=True).exists()
+        )
+        self.assertNotIn(Visit.GuardianResponse.AUTO_CONFIRMED, self._responses(self.untouched))
+
+    def test_max_batches_leaves_the_rest_for_the_next_run(self):
+        result = visit_service.auto_confirm_expired_visits(batch_size=3, max_batches=1)
+        self.assertEqual((result["processed"], result["batches"]), (3, 1))
+
+        result = visit_service.auto_confirm_expired_visits(batch_size=3)
+        self.assertEqual((result["processed"], result["batches"]), (4, 2))
+
+    @skipUnless(connection.features.has_select_for_update_skip_locked, "needs SELECT ... SKIP LOCKED")
+    def test_batches_are_claimed_with_skip_locked(self):
+        with CaptureQueriesContext(connection) as ctx:
+            visit_service.auto_confirm_expired_visits(batch_size=3)
+        claims = [q["sql"] for q in ctx.captured_queries if "FOR UPDATE" in q["sql"]]
+        self.assertEqual(len(claims), 4)   # three full batches, then the empty one that ends the sweep
+        self.assertTrue(all("SKIP LOCKED" in sql for sql in claims))
+
+
+class BulkDispatchTests(VisitFixtureMixin, TestCase):
+
+    def _post(self, name, items, user=None):
+        return self._client(user or self.admin).post(reverse(name), {"items": items}, format="json")
+
+    def test_bulk_schedule_reports_each_item_in_order(self):
+        requested = self._visit()
+        already   = self._visit(status=Visit.Status.SCHEDULED)
+        missing   = uuid.uuid4()
+        at = (timezone.now() + timedelta(days=2)).isoformat()
+
+        response = self._post("visit-bulk-schedule", [
+            {"visit_id": str(requested.id), "scheduled_at": at},
+            {"visit_id": str(already.id),   "scheduled_at": at},
+            {"visit_id": str(missing),      "scheduled_at": at},
+            {"visit_id": str(requested.id), "scheduled_at": at},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual((body["succeeded"], body["failed"]), (1, 3))
+        self.assertEqual(
+            [(r["visit_id"], r["success"], r.get("error")) for r in body["results"]],
+            [
+                (str(requested.id), True,  None),
+                (str(already.id),   False, "Only requested visits can be scheduled."),
+                (str(missing),      False, "Visit not found."),
+                (str(requested.id), False, "Duplicate visit in this request."),
+            ],
+        )
+        self.assertEqual(body["results"][0]["visit"]["status"], Visit.Status.SCHEDULED)
+
+        requested.refresh_from_db()
+        self.assertEqual(requested.status, Visit.Status.SCHEDULED)
+        self.assertEqual(requested.guardian_response, Visit.GuardianResponse.PENDING)
+        self.assertEqual(
+            list(VisitEvent.objects.values_list("visit_id", "to_status")),
+            [(requested.id, Visit.Status.SCHEDULED)],
+        )
+
+    def test_bulk_assign_checks_nurse_membership_per_item(self):
+        outsider = self._user("outsider")
+        first, second, unscheduled = (
+            self._visit(status=Visit.Status.SCHEDULED),
+            self._visit(status=Visit.Status.SCHEDULED),
+            self._visit(),
+        )
+
+        response = self._post("visit-bulk-assign", [
+            {"visit_id": str(first.id),       "nurse_id": str(self.nurse.id)},
+            {"visit_id": str(second.id),      "nurse_id": str(outsider.id)},
+            {"visit_id": str(unscheduled.id), "nurse_id": str(self.nurse2.id)},
+        ])
+
+        body = response.json()
+        self.assertEqual((body["succeeded"], body["failed"]), (1, 2))
+        self.assertEqual([r["success"] for r in body["results"]], [True, False, False])
+        self.assertEqual(body["results"][1]["error"], "This nurse does not belong to this hospital.")
+
+        first.refresh_from_db()
+        self.assertEqual(first.status, Visit.Status.ASSIGNED)
+        self.assertEqual(first.current_nurse_id, self.nurse.id)
+        self.assertEqual(first.current_assignment.status, VisitAssignment.AssignmentStatus.PENDING)
+        second.refresh_from_db()
+        self.assertEqual((second.status, second.current_assignment_id), (Visit.Status.SCHEDULED, None))
+
+    def test_reassign_cancels_the_pending_assignment(self):
+        visit = self._visit(status=Visit.Status.SCHEDULED)
+        self._post("visit-bulk-assign", [{"visit_id": str(visit.id), "nurse_id": str(self.nurse.id)}])
+        Visit.objects.filter(pk=visit.pk).update(status=Visit.Status.SCHEDULED)
+
+        self._post("visit-bulk-assign", [{"visit_id": str(visit.id), "nurse_id": str(self.nurse2.id)}])
+
+        self.assertEqual(
+            dict(visit.assignments.values_list("nurse_id", "status")),
+            {self.nurse.id: VisitAssignment.AssignmentStatus.CANCELLED,
+             self.nurse2.id: VisitAssignment.AssignmentStatus.PENDING},
+        )
+
+    def test_non_admin_items_fail_individually(self):
+        visit = self._visit()
+        at = (timezone.now() + timedelta(days=2)).isoformat()
+        response = self._post(
+            "visit-bulk-schedule", [{"visit_id": str(visit.id), "scheduled_at": at}], user=self.nurse,
+        )
+        self.assertEqual(response.json()["failed"], 1)
+        visit.refresh_from_db()
+        self.assertEqual(visit.status, Visit.Status.REQUESTED)
+
+    def test_item_cap(self):
+        items = [{"visit_id": str(uuid.uuid4()), "nurse_id": str(self.nurse.id)} for _ in range(BULK_MAX_ITEMS)]
+        response = self._post("visit-bulk-assign", items)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["failed"], BULK_MAX_ITEMS)
+
+        items.append({"visit_id": str(uuid.uuid4()), "nurse_id": str(self.nurse.id)})
+        response = self._post("visit-bulk-assign", items)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("items", response.json())
+
+
+class TransitionConflictTests(VisitFixtureMixin, TestCase):
+    """Two writers that read the same visit: the later one gets a 409, not a silent overwrite."""
+
+    def _load(self, visit):
+        # What the lifecycle views fetch at the start of a request
+        return Visit.objects.select_related("hospital", "dependent", "current_assignment__nurse").get(pk=visit.pk)
+
+    def _assigned_visit(self, nurse):
+        visit = self._visit(status=Visit.Status.SCHEDULED)
+        visit_service.assign_nurse(self._load(visit), nurse, self._fresh(self.admin))
+        return visit
+
+    def test_second_writer_from_the_same_status_conflicts(self):
+        visit = self._visit(status=Visit.Status.SCHEDULED)
+        first, second = self._load(visit), self._load(visit)
+
+        visit_service.assign_nurse(first, self.nurse, self._fresh(self.admin))
+        with self.assertRaises(TransitionConflict):
+            visit_service.assign_nurse(second, self.nurse2, self._fresh(self.admin))
+
+        visit.refresh_from_db()
+        self.assertEqual(visit.current_nurse_id, self.nurse.id)
+        self.assertEqual(
+            dict(visit.assignments.values_list("nurse_id", "status")),
+            {self.nurse.id: VisitAssignment.AssignmentStatus.PENDING},
+        )
+
+    def test_reassignment_in_between_conflicts(self):
+        """ASSIGNED → SCHEDULED → ASSIGNED comes back to the same status with another assignment."""
+        visit = self._assigned_visit(self.nurse)
+        stale = self._load(visit)
+        first_assignment = stale.current_assignment
+
+        visit_service.reject_assignment(self._load(visit), self._fresh(self.nurse))
+        visit_service.assign_nurse(self._load(visit), self.nurse2, self._fresh(self.admin))
+
+        with self.assertRaises(TransitionConflict):
+            visit_service.accept_visit(stale, self._fresh(self.nurse))
+
+        visit.refresh_from_db()
+        self.assertEqual((visit.status, visit.current_nurse_id), (Visit.Status.ASSIGNED, self.nurse2.id))
+        first_assignment.refresh_from_db()
+        self.assertEqual(first_assignment.status, VisitAssignment.AssignmentStatus.REJECTED)
+        self.assertFalse(VisitEvent.objects.filter(visit=visit, to_status=Visit.Status.ACCEPTED).exists())
+
+    def test_conflict_is_a_409(self):
+        visit = self._assigned_visit(self.nurse)
+        stale = self._load(visit)
+        visit_service.reject_assignment(self._load(visit), self._fresh(self.nurse))
+        visit_service.assign_nurse(self._load(visit), self.nurse, self._fresh(self.admin))
+
+        with mock.patch("apps.visits.views.lifecycle.get_visit_or_404", return_value=stale):
+            response = self._client(self.nurse).post(reverse("visit-accept", args=[visit.id]))
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["detail"], TransitionConflict.default_detail)
+        visit.refresh_from_db()
+        self.assertEqual(visit.status, Visit.Status.ASSIGNED)
+
+
+class VisitEventLogTests(VisitFixtureMixin, TestCase):
+
+    def test_one_event_per_transition(self):
+        Guardianship.objects.create(user=self.guardian, dependent=self.dependent)
+        visit = visit_service.create_visit(
+            {"hospital": self.hospital, "dependent": self.dependent, "visit_type": self.visit_type,
+             "address": "1 Main St"},
+            self._fresh(self.guardian),
+        )
+        visit_service.schedule_visit(visit, timezone.now() + timedelta(days=3), self._fresh(self.admin))
+        visit_service.assign_nurse(visit, self.nurse, self._fresh(self.admin))
+        nurse = self._fresh(self.nurse)
+        visit = Visit.objects.select_related("current_assignment").get(pk=visit.pk)
+        for step in (visit_service.accept_visit, visit_service.start_visit, visit_service.complete_visit):
+            visit = step(visit, nurse)
+
+        self.assertEqual(
+            list(visit.events.values_list("from_status", "to_status", "actor_id", "role")),
+            [
+                ("",                     Visit.Status.REQUESTED, self.guardian.id, "guardian"),
+                (Visit.Status.REQUESTED, Visit.Status.SCHEDULED, self.admin.id,    "hospital_admin"),
+                (Visit.Status.SCHEDULED, Visit.Status.ASSIGNED,  self.admin.id,    "hospital_admin"),
+                (Visit.Status.ASSIGNED,  Visit.Status.ACCEPTED,  self.nurse.id,    "nurse"),
+                (Visit.Status.ACCEPTED,  Visit.Status.STARTED,   self.nurse.id,    "nurse"),
+                (Visit.Status.STARTED,   Visit.Status.COMPLETED, self.nurse.id,    "nurse"),
+            ],
+        )
+        self.assertEqual(set(visit.events.values_list("hospital_id", flat=True)), {self.hospital.id})
+
+    def test_rejected_transition_writes_no_event(self):
+        visit = self._visit(status=Visit.Status.SCHEDULED)
+        with self.assertRaises(PermissionDenied):
+            visit_service.assign_nurse(visit, self.nurse, self._fresh(self.nurse2))
+        self.assertFalse(visit.events.exists())
+
+
+class SparseFieldsJoinTests(VisitFixtureMixin, TestCase):
+    """?fields= decides the joins: a relation-free field set loads visits without any."""
+
+    def setUp(self):
+        self.visits = [self._visit() for _ in range(3)]
+
+    def _visit_queries(self, url, params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self._client(self.admin).get(url, params)
+        self.assertEqual(response.status_code, 200)
+        # The query that loads the visit rows (the feed's key query selects only id, created_at)
+        queries = [
+            q["sql"] for q in ctx.captured_queries
+            if q["sql"].startswith('SELECT "visits_visit"."id", "visits_visit"."created_at", ')
+        ]
+        self.assertEqual(len(queries), 1)
+        return response.json(), queries[0]
+
+    def test_list_without_relations_has_no_joins(self):
+        body, sql = self._visit_queries(reverse("visit-list-create"), {"fields": "id,status"})
+        self.assertEqual(len(body["results"]), 3)
+        self.assertEqual(set(body["results"][0]), {"id", "status"})
+        self.assertNotIn("JOIN", sql)
+
+        _, sql = self._visit_queries(reverse("visit-list-create"), {"fields": "id,hospital_name"})
+        self.assertIn('JOIN "hospitals_hospital"', sql)
+        self.assertNotIn('"dependents_dependent"', sql)
+
+    def test_detail_without_relations_has_no_joins(self):
+        url = reverse("visit-detail", args=[self.visits[0].id])
+        body, sql = self._visit_queries(url, {"fields": "id,status"})
+        self.assertEqual(body, {"id": str(self.visits[0].id), "status": Visit.Status.REQUESTED})
+        self.assertNotIn("JOIN", sql)
@@ -8,6 +8,8 @@ from apps.visits.views.visit import (
 from apps.visits.views.lifecycle import (
     ScheduleVisitView,
     AssignNurseView,
+    BulkScheduleVisitsView,
+    BulkAssignNursesView,
     AcceptVisitView,
     RejectAssignmentView,
     StartVisitView,
@@ -21,6 +23,9 @@ urlpatterns = [
     path("types/", VisitTypeListCreateView.as_view(), name="visit-type-list-create"),
 
     path("",                          VisitListCreateView.as_view(),         name="visit-list-create"),
+    path("bulk/schedule/",            BulkScheduleVisitsView.as_view(),      name="visit-bulk-schedule"),
+    path("bulk/assign/",              BulkAssignNursesView.as_view(),        name="visit-bulk-assign"),
+
     path("<uuid:visit_id>/",          VisitDetailView.as_view(),             name="visit-detail"),
     path("<uuid:visit_id>/assignments/", VisitAssignmentHistoryView.as_view(), name="visit-assignments"),
 
@@ -12,15 +12,20 @@ from apps.visits.serializers.scheduling import (
     AssignNurseSerializer,
     CancelVisitSerializer,
     RejectAssignmentSerializer,
+    BulkScheduleVisitsSerializer,
+    BulkAssignNursesSerializer,
+    BulkVisitResponseSerializer,
 )
-from apps.visits.services import visit_service
+from apps.visits.services import visit_service, bulk_service
 
 User = get_user_model()
 
 
 def get_visit_or_404(visit_id):
     try:
-        return Visit.objects.select_related("hospital", "dependent").get(id=visit_id)
+        return Visit.objects.select_related(
+            "hospital", "dependent", "current_assignment__nurse",
+        ).get(id=visit_id)
     except Visit.DoesNotExist:
         return None
 
@@ -74,6 +79,70 @@ class AssignNurseView(APIView):
         return Response(VisitSerializer(visit).data)
 
 
+def bulk_results_response(results):
+    """Serializes all successful visits in one list pass (batched nurse lookup)."""
+    visits = [r["visit"] for r in results if r["success"]]
+    visit_data = iter(VisitSerializer(visits, many=True).data)
+    payload = [
+        {**r, "visit": next(visit_data)} if r["success"] else r
+        for r in results
+    ]
+    return Response({
+        "succeeded": len(visits),
+        "failed": len(results) - len(visits),
+        "results": payload,
+    })
+
+
+class BulkScheduleVisitsView(APIView):
+    """
+    Morning dispatch: schedule many visits in one request.
+    Each item is validated on its own; valid ones are applied together.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        request=BulkScheduleVisitsSerializer,
+        responses={200: BulkVisitResponseSerializer},
+        summary="Schedule many visits (admin)",
+        tags=["Visit Lifecycle"],
+    )
+    def post(self, request):
+        serializer = BulkScheduleVisitsSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        results = bulk_service.bulk_schedule_visits(
+            items=serializer.validated_data["items"],
+            triggered_by=request.user,
+        )
+        return bulk_results_response(results)
+
+
+class BulkAssignNursesView(APIView):
+    """
+    Morning dispatch: assign nurses to many scheduled visits in one request.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        request=BulkAssignNursesSerializer,
+        responses={200: BulkVisitResponseSerializer},
+        summary="Assign nurses to many visits (admin)",
+        tags=["Visit Lifecycle"],
+    )
+    def post(self, request):
+        serializer = BulkAssignNursesSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        results = bulk_service.bulk_assign_nurses(
+            items=serializer.validated_data["items"],
+            assigned_by=request.user,
+        )
+        return bulk_results_response(results)
+
+
 class AcceptVisitView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -1,14 +1,34 @@
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiParameter, OpenApiTypes
 
 from apps.visits.models import Visit, VisitType
-from apps.visits.serializers.visit import VisitSerializer, CreateVisitSerializer, VisitTypeSerializer
-from apps.visits.services import visit_service
+from apps.visits.serializers.visit import (
+    VisitSerializer, CreateVisitSerializer, VisitTypeSerializer, visit_relations,
+)
+from apps.visits.services import visit_service, visit_feed
 from apps.hospitals.models import HospitalMembership
-from apps.dependents.models import Guardianship
+from common.pagination import cursor_page_schema
+from common.permissions.access_context import get_access_context
+
+
+SPARSE_PARAMETERS = [
+    OpenApiParameter(
+        name="fields",
+        description="Comma-separated fields to return, e.g. id,status,scheduled_at.",
+        required=False,
+        type=OpenApiTypes.STR,
+    ),
+    OpenApiParameter(
+        name="expand",
+        description="Nested fields to include (default: assigned_nurse; send it empty to omit).",
+        required=False,
+        type=OpenApiTypes.STR,
+    ),
+]
 
 
 class VisitListCreateView(APIView):
@@ -16,44 +36,54 @@ class VisitListCreateView(APIView):
     permission_classes = [IsAuthenticated]
 
     @extend_schema(
-        responses={200: VisitSerializer(many=True)},
-        summary="List visits (scoped to user's role)",
+        parameters=[
+            OpenApiParameter(
+                name="cursor",
+                description="Opaque cursor from the previous page's `next`.",
+                required=False,
+                type=OpenApiTypes.STR,
+            ),
+            OpenApiParameter(
+                name="page_size",
+                description=f"Visits per page (max {visit_feed.MAX_PAGE_SIZE}).",
+                required=False,
+                type=OpenApiTypes.INT,
+            ),
+            *SPARSE_PARAMETERS,
+        ],
+        responses={200: cursor_page_schema("PaginatedVisitList", VisitSerializer)},
+        summary="List visits (scoped to user's role, cursor-paginated)",
         tags=["Visits"],
     )
     def get(self, request):
-        user = request.user
-
         # - Guardian: sees visits for their dependents
         # - Nurse: sees visits assigned to them
         # - Admin/Medical Admin: sees all visits in their hospitals
+        # Scopes are resolved as a UNION in visit_feed — see module docstring.
 
-        memberships = HospitalMembership.objects.filter(
-            user=user, is_active=True
-        ).values_list("hospital_id", "role")
-
-        hospital_ids_as_admin = [
-            hid for hid, role in memberships
-            if role in [HospitalMembership.Role.HOSPITAL_ADMIN, HospitalMembership.Role.MEDICAL_ADMIN]
-        ]
-        hospital_ids_as_nurse = [
-            hid for hid, role in memberships
-            if role == HospitalMembership.Role.NURSE
-        ]
-
-        dependent_ids = Guardianship.objects.filter(
-            user=user, is_active=True
-        ).values_list("dependent_id", flat=True)
-
-        from django.db.models import Q
-        visits = Visit.objects.filter(
-            Q(dependent_id__in=dependent_ids) |               # as guardian
-            Q(assignments__nurse=user) |                      # as nurse (any assignment status — pending or accepted)|                # as nurse
-            Q(hospital_id__in=hospital_ids_as_admin)          # as admin
-        ).select_related(
-            "dependent", "visit_type", "hospital", "requested_by"
-        ).distinct()
-
-        return Response(VisitSerializer(visits, many=True).data)
+        try:
+            page_size = int(request.query_params.get("page_size", visit_feed.DEFAULT_PAGE_SIZE))
+        except ValueError:
+            raise ValidationError({"page_size": "Must be an integer."})
+
+        selected = VisitSerializer.select_fields(request, expand_default=["assigned_nurse"])
+        visits, next_cursor = visit_feed.get_visit_feed_page(
+            request.user,
+            cursor=request.query_params.get("cursor"),
+            page_size=page_size,
+            related=[r for r in visit_relations(selected) if r != "current_assignment__nurse"],
+        )
+
+        next_url = None
+        if next_cursor:
+            params = request.query_params.copy()
+            params["cursor"] = next_cursor
+            next_url = request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+
+        return Response({
+            "next": next_url,
+            "results": VisitSerializer(visits, many=True, context={"sparse_fields": selected}).data,
+        })
 
     @extend_schema(
         request=CreateVisitSerializer,
@@ -76,40 +106,39 @@ class VisitListCreateView(APIView):
 class VisitDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
-    def get_object(self, visit_id, user):
+    def get_object(self, visit_id, user, selected=None):
+        visits = Visit.objects.all()
+        relations = visit_relations(selected)
+        if relations:
+            # select_related() with no arguments would follow every non-null FK
+            visits = visits.select_related(*relations)
         try:
-            visit = Visit.objects.select_related(
-                "dependent", "visit_type", "hospital", "requested_by"
-            ).get(id=visit_id)
+            visit = visits.get(id=visit_id)
         except Visit.DoesNotExist:
             return None
 
-        memberships = HospitalMembership.objects.filter(
-            user=user, hospital=visit.hospital, is_active=True
-        ).exists()
-
-        is_guardian = Guardianship.objects.filter(
-            user=user, dependent=visit.dependent, is_active=True
-        ).exists()
+        ctx = get_access_context(user)
+        memberships = ctx.is_member_of(visit.hospital_id)
+        is_guardian = ctx.is_guardian_of(visit.dependent_id)
 
-        is_assigned_nurse = visit.assignments.filter(
-            nurse=user, status="accepted"
-        ).exists()
+        is_assigned_nurse = visit.is_accepted_nurse(user)
 
         if memberships or is_guardian or is_assigned_nurse:
             return visit
         return None
 
     @extend_schema(
+        parameters=SPARSE_PARAMETERS,
         responses={200: VisitSerializer},
         summary="Get visit detail",
         tags=["Visits"],
     )
     def get(self, request, visit_id):
-        visit = self.get_object(visit_id, request.user)
+        selected = VisitSerializer.select_fields(request, expand_default=["assigned_nurse"])
+        visit = self.get_object(visit_id, request.user, selected)
         if not visit:
             return Response({"detail": "Visit not found."}, status=status.HTTP_404_NOT_FOUND)
-        return Response(VisitSerializer(visit).data)
+        return Response(VisitSerializer(visit, context={"sparse_fields": selected}).data)
 
 
 class VisitTypeListCreateView(APIView):
@@ -152,12 +181,9 @@ class VisitTypeListCreateView(APIView):
 
         # Verify user is admin of this hospital
         hospital = serializer.validated_data["hospital"]
-        is_admin = HospitalMembership.objects.filter(
-            user=request.user,
-            hospital=hospital,
-            role=HospitalMembership.Role.HOSPITAL_ADMIN,
-            is_active=True,
-        ).exists()
+        is_admin = get_access_context(request.user).has_role(
+            hospital.id, HospitalMembership.Role.HOSPITAL_ADMIN,
+        )
         if not is_admin:
             return Response(
                 {"detail": "Only hospital admins can create visit types."},
@@ -196,12 +222,9 @@ class VisitAssignmentHistoryView(APIView):
             return Response({"detail": "Visit not found."}, status=status.HTTP_404_NOT_FOUND)
 
         # Same access check as VisitDetailView
-        is_member = HospitalMembership.objects.filter(
-            user=request.user, hospital=visit.hospital, is_active=True
-        ).exists()
-        is_guardian = Guardianship.objects.filter(
-            user=request.user, dependent=visit.dependent, is_active=True
-        ).exists()
+        ctx = get_access_context(request.user)
+        is_member = ctx.is_member_of(visit.hospital_id)
+        is_guardian = ctx.is_guardian_of(visit.dependent_id)
 
         if not is_member and not is_guardian:
             return Response({"detail": "Visit not found."}, status=status.HTTP_404_NOT_FOUND)
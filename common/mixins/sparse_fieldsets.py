@@ -0,0 +1,63 @@
+"""
+Sparse fieldsets for read serializers: ?fields= and ?expand=.
+
+    ?fields=id,status,submitted_at     only these fields
+    ?expand=sections,versions          add these nested fields
+    (both comma separated, combinable)
+
+Meta.expandable_fields lists the nested / expensive fields that are left out
+unless expanded or named in ?fields=. Views resolve the request once with
+select_fields(), pass the result as context["sparse_fields"] and use the same
+set to decide what to prefetch — a field that is not rendered is not loaded.
+
+Without context["sparse_fields"] a serializer renders every field, so
+internal callers (service responses, write endpoints) are unchanged.
+"""
+
+from rest_framework.exceptions import ValidationError
+
+
+def _csv(value) -> set:
+    return {part.strip() for part in (value or "").split(",") if part.strip()}
+
+
+class SparseFieldsetsMixin:
+
+    @classmethod
+    def select_fields(cls, request, expand_default=()) -> frozenset:
+        """
+        Field names to render for this request.
+        expand_default: expandable fields included when the client sends
+        neither ?fields= nor ?expand=.
+        Raises ValidationError (400) on unknown field names.
+        """
+        available  = list(cls.Meta.fields)
+        expandable = set(getattr(cls.Meta, "expandable_fields", ()))
+        fields = _csv(request.query_params.get("fields"))
+        expand = _csv(request.query_params.get("expand"))
+
+        unknown_fields = fields - set(available)
+        if unknown_fields:
+            raise ValidationError({
+                "fields": f"Unknown field(s): {', '.join(sorted(unknown_fields))}. "
+                          f"Available: {', '.join(available)}."
+            })
+        unknown_expand = expand - expandable
+        if unknown_expand:
+            raise ValidationError({
+                "expand": f"Cannot expand: {', '.join(sorted(unknown_expand))}. "
+                          f"Expandable: {', '.join(sorted(expandable))}."
+            })
+
+        if fields:
+            return frozenset(fields | expand | {"id"})
+        if "expand" not in request.query_params:
+            expand = set(expand_default)
+        return frozenset((set(available) - expandable) | expand)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selected = self.context.get("sparse_fields")
+        if selected is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in selected}
@@ -0,0 +1,42 @@
+"""
+Keyset (cursor) pagination shared by the list endpoints.
+
+Pages are ordered by (timestamp, id) and the cursor is the pair of the
+last row on the page, base64-encoded (encode_cursor / decode_cursor).
+Paginated lists respond with {"next": <url or null>, "results": [...]};
+cursor_page_schema() documents that shape for drf-spectacular.
+"""
+
+import base64
+import uuid
+from datetime import datetime
+
+from drf_spectacular.utils import inline_serializer
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+
+def encode_cursor(timestamp, row_id) -> str:
+    raw = f"{timestamp.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Returns (timestamp, id). Raises ValidationError (400) on a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        timestamp, row_id = raw.split("|")
+        return datetime.fromisoformat(timestamp), uuid.UUID(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValidationError({"cursor": "Invalid cursor."})
+
+
+def cursor_page_schema(name: str, serializer):
+    """OpenAPI response for one page: {"next", "results": [serializer, ...]}."""
+    return inline_serializer(
+        name=name,
+        fields={
+            "next": serializers.URLField(allow_null=True, help_text="URL of the next page, null on the last one."),
+            "results": serializer(many=True),
+        },
+    )
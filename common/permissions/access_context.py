@@ -0,0 +1,174 @@
+"""
+Per-request authorization context.
+
+Loads all of a user's active hospital memberships and guardianships once
+(two queries) and answers every "what role does this user have here?" /
+"is this user a guardian of that dependent?" question from memory.
+
+Two cache layers:
+- Per request: the context is cached on the user instance. DRF authenticates
+  a fresh user object on every request, so this lives exactly as long as the
+  request — and services that only receive `user` (transition(),
+  visit_service) share it with the permission classes that ran before them.
+- Across requests: the loaded roles/guardianships are stored in the Django
+  cache under the user's current version. Any save/delete of one of the
+  user's HospitalMembership or Guardianship rows bumps the version
+  (signals in apps.hospitals / apps.dependents), so the next lookup misses
+  and reloads — no stale authorization after a membership change.
+  Only used with a shared cache backend (CACHE_URL → redis, memcached, db):
+  a version bump in locmem reaches only the process that made it, so with
+  a per-process cache every request loads the context from the database.
+
+Usage:
+    ctx = get_access_context(request.user)
+    ctx.role_in(hospital_id)            # "hospital_admin" | "medical_admin" | "nurse" | None
+    ctx.has_role(hospital_id, *roles)
+    ctx.is_guardian_of(dependent_id)
+"""
+
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from apps.hospitals.models import HospitalMembership
+from apps.dependents.models import Guardianship
+
+
+_CACHE_ATTR = "_access_context"
+
+
+def _version_key(user_id) -> str:
+    return f"access_ctx:ver:{user_id}"
+
+
+def _data_key(user_id, version) -> str:
+    return f"access_ctx:{user_id}:{version}"
+
+
+def _current_version(user_id) -> int:
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock, not 0: if the version key is evicted, a fresh
+        # version can never collide with data cached under an older one.
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key, time.time_ns())
+    return version
+
+
+def _bump_version(user_id) -> None:
+    key = _version_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def _cache_is_shared() -> bool:
+    """False for the per-process locmem backend, whose invalidations other workers never see."""
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], LocMemCache)
+
+
+def _as_uuid(value):
+    """Ids arrive as UUIDs (URL converters, FK attrs) or strings (query params)."""
+    if isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(str(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class AccessContext:
+
+    def __init__(self, roles_by_hospital: dict, dependent_ids: frozenset):
+        self._roles_by_hospital = roles_by_hospital
+        self._dependent_ids = dependent_ids
+
+    @classmethod
+    def load(cls, user) -> "AccessContext":
+        if not getattr(user, "is_authenticated", False):
+            return cls({}, frozenset())
+        if not _cache_is_shared():
+            return cls.load_from_db(user)
+
+        key = _data_key(user.pk, _current_version(user.pk))
+        cached = cache.get(key)
+        if cached is not None:
+            return cls(*cached)
+
+        ctx = cls.load_from_db(user)
+        cache.set(
+            key,
+            (ctx._roles_by_hospital, ctx._dependent_ids),
+            getattr(settings, "ACCESS_CONTEXT_CACHE_TIMEOUT", 300),
+        )
+        return ctx
+
+    @classmethod
+    def load_from_db(cls, user) -> "AccessContext":
+        roles_by_hospital = dict(
+            HospitalMembership.objects.filter(
+                user=user, is_active=True,
+            ).values_list("hospital_id", "role")
+        )
+        dependent_ids = frozenset(
+            Guardianship.objects.filter(
+                user=user, is_active=True,
+            ).values_list("dependent_id", flat=True)
+        )
+        return cls(roles_by_hospital, dependent_ids)
+
+    def role_in(self, hospital_id) -> str | None:
+        return self._roles_by_hospital.get(_as_uuid(hospital_id))
+
+    def has_role(self, hospital_id, *roles) -> bool:
+        return self.role_in(hospital_id) in roles
+
+    def is_member_of(self, hospital_id) -> bool:
+        return self.role_in(hospital_id) is not None
+
+    def is_guardian_of(self, dependent_id) -> bool:
+        return _as_uuid(dependent_id) in self._dependent_ids
+
+    def hospital_ids(self, *roles) -> set:
+        """Hospitals where the user holds any of `roles` (any role if none given)."""
+        return {
+            hid for hid, role in self._roles_by_hospital.items()
+            if not roles or role in roles
+        }
+
+    @property
+    def dependent_ids(self) -> frozenset:
+        return self._dependent_ids
+
+
+def get_access_context(user) -> AccessContext:
+    ctx = getattr(user, _CACHE_ATTR, None)
+    if ctx is None:
+        ctx = AccessContext.load(user)
+        try:
+            setattr(user, _CACHE_ATTR, ctx)
+        except AttributeError:
+            pass  # AnonymousUser-like objects without __dict__
+    return ctx
+
+
+def clear_access_context(user) -> None:
+    """Drop the cached context, e.g. after this user's own memberships changed mid-request."""
+    if user is not None and hasattr(user, _CACHE_ATTR):
+        delattr(user, _CACHE_ATTR)
+
+
+def invalidate_access_context(user_id) -> None:
+    """
+    Makes every process reload this user's roles/guardianships on next lookup.
+    Bumped now and again on commit, so a request that reloads between the
+    write and the commit cannot pin the pre-commit state under the new version.
+    """
+    _bump_version(user_id)
+    transaction.on_commit(lambda: _bump_version(user_id))
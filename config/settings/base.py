@@ -104,6 +104,19 @@ DATABASES = {
     # and returns the dict Django expects
 }
 
+# Cache
+# locmem is per-process — point CACHE_URL at a shared backend (e.g. redis://)
+# when running more than one worker so invalidations reach every process.
+# On locmem neither the access context nor analytics results are cached
+# across requests (see common.permissions.access_context and
+# apps.analytics.services.analytics_cache).
+
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://"),
+}
+
+ACCESS_CONTEXT_CACHE_TIMEOUT = 300   # seconds a user's roles/guardianships stay cached
+
 # Custom User Model
 
 AUTH_USER_MODEL = "accounts.User"
@@ -176,4 +189,29 @@ SIMPLE_JWT = {
 VISIT_MIN_ADVANCE_HOURS = 48         # guardian must set preferred_at at least 48h from now
 VISIT_SCHEDULE_WITHIN_HOURS = 12     # admin must schedule within 12h of visit creation
 VISIT_CONFIRMATION_HOURS = 24        # guardian has up to 24h to confirm scheduled time
-VISIT_CONFIRMATION_BUFFER_HOURS = 24  # admin cannot schedule a visit less than 24h from now
\ No newline at end of file
+VISIT_CONFIRMATION_BUFFER_HOURS = 24  # admin cannot schedule a visit less than 24h from now
+VISIT_AUTO_CONFIRM_BATCH_SIZE = 500  # rows locked + updated per chunk by the auto-confirm sweep
+
+# ---------------------------------------------------------------------------
+# Report History
+# ---------------------------------------------------------------------------
+
+REPORT_VERSION_KEYFRAME_INTERVAL = 10   # every Nth ReportVersion stores the full sections snapshot
+REPORT_VERSIONS_PREFETCH_LIMIT = 10     # latest versions embedded in report responses (full history: /versions/)
+REPORT_REVIEW_LEASE_MINUTES = 15        # how long a review-queue claim holds a report for one reviewer
+
+# ---------------------------------------------------------------------------
+# Health Trends
+# ---------------------------------------------------------------------------
+
+HEALTH_TRENDS_DEFAULT_POINTS = 500      # points returned when the client sends no max_points
+HEALTH_TRENDS_MAX_POINTS = 2000         # upper bound for max_points
+HEALTH_TRENDS_LTTB_INPUT_LIMIT = 10000  # longer raw series are bucketed in SQL before downsampling
+
+# ---------------------------------------------------------------------------
+# Analytics
+# ---------------------------------------------------------------------------
+
+ANALYTICS_ROLLUP_OVERLAP_MINUTES = 5    # each refresh re-reads changes this far before the last watermark
+ANALYTICS_CACHE_TIMEOUT = 600           # seconds a cached analytics result lives (writes invalidate it sooner)
+ANALYTICS_CACHE_LOCK_TIMEOUT = 30       # max seconds a miss waits for another process computing the same result